@@ -1,58 +1,179 @@
 # /// script
-# dependencies = [
-#   "sympy",
-# ]
+# dependencies = []
 # ///
 
 import argparse
-import pprint
-import sympy
+import functools
 
-parser = argparse.ArgumentParser(
-    description="""
+
+# The prime factorization of an integer is found by trial division, which is fast for periods and avoids importing a computer algebra system
+# Returns the prime factors of the integer in increasing order along with their multiplicities
+@functools.lru_cache(maxsize=None)
+def prime_factorization(n):
+    factorization = []
+    factor = 2
+    while factor * factor <= n:
+        multiplicity = 0
+        while n % factor == 0:
+            n //= factor
+            multiplicity += 1
+        if multiplicity > 0:
+            factorization.append((factor, multiplicity))
+        factor += 1 if factor == 2 else 2
+    if n > 1:
+        factorization.append((n, 1))
+    return tuple(factorization)
+
+
+def prime_factors(n):
+    return [prime for prime, _ in prime_factorization(n)]
+
+
+# The divisors of an integer are every product of its prime factors up to their multiplicities
+# Returns the divisors in decreasing order
+def divisors(n):
+    n_divisors = [1]
+    for prime, multiplicity in prime_factorization(n):
+        n_divisors = [
+            divisor * prime**exponent
+            for divisor in n_divisors
+            for exponent in range(multiplicity + 1)
+        ]
+    return sorted(n_divisors, reverse=True)
+
+
+# A harmonic period supersequence of n steps from n down to 1 by dividing by one prime factor at a time,
+# so the divisors of n form a lattice in which every supersequence is a path from n to 1
+# Restricted to the divisors within [low, high], a supersequence starts from a divisor that no multiple within the range is a divisor of n for,
+# steps down by one prime factor at a time, and ends at a divisor that no prime factor can be divided out of without leaving the range
+# Every divisor in between two divisors of a supersequence is within the range as well, so no supersequence within the range skips a divisor
+def harmonic_period_supersequence_starts(n, low=1, high=None):
+    high = n if high is None else min(high, n)
+    return [
+        divisor
+        for divisor in divisors(n)
+        if low <= divisor <= high
+        and all(
+            divisor * prime > high or n % (divisor * prime) != 0
+            for prime in prime_factors(n)
+        )
+    ]
+
+
+def harmonic_period_supersequence_steps(divisor, low, primes):
+    # The next divisors of a supersequence from a divisor, in order of the prime factor divided out
+    return [
+        divisor // prime
+        for prime in primes
+        if divisor % prime == 0 and divisor // prime >= low
+    ]
+
+
+# The number of supersequences from a divisor is the sum of the numbers of supersequences from each of its next divisors,
+# which is memoized over the lattice of divisors so that the supersequences are counted without materializing them
+@functools.lru_cache(maxsize=None)
+def count_harmonic_period_supersequences_from(divisor, low, primes):
+    steps = harmonic_period_supersequence_steps(divisor, low, primes)
+    if len(steps) == 0:
+        return 1
+    return sum(
+        count_harmonic_period_supersequences_from(step, low, primes) for step in steps
+    )
+
+
+def count_harmonic_period_supersequences(n, low=1, high=None):
+    primes = tuple(prime_factors(n))
+    return sum(
+        count_harmonic_period_supersequences_from(start, low, primes)
+        for start in harmonic_period_supersequence_starts(n, low, high)
+    )
+
+
+# The number of harmonic period sequences from a divisor, where each step divides by any divisor rather than a prime factor,
+# is the sum of the numbers of sequences from each of its proper divisors, which is memoized as well
+@functools.lru_cache(maxsize=None)
+def count_harmonic_period_sequences(n):
+    if n == 1:
+        return 1
+    return sum(count_harmonic_period_sequences(divisor) for divisor in divisors(n)[1:])
+
+
+# The supersequences are generated lazily with a depth-first search over the lattice of divisors
+# A single sequence is extended and shortened in place, and only copied when it is complete, so memory stays proportional to its length
+# The order is the same as dividing by the prime factors in increasing order at every step
+def harmonic_period_supersequences(n, low=1, high=None):
+    primes = tuple(prime_factors(n))
+    for start in harmonic_period_supersequence_starts(n, low, high):
+        sequence = [start]
+        pending_steps = [iter(harmonic_period_supersequence_steps(start, low, primes))]
+        is_complete = True
+        while len(pending_steps) > 0:
+            step = next(pending_steps[-1], None)
+            if step is None:
+                if is_complete:
+                    yield list(sequence)
+                is_complete = False
+                sequence.pop()
+                pending_steps.pop()
+                continue
+            sequence.append(step)
+            pending_steps.append(
+                iter(harmonic_period_supersequence_steps(step, low, primes))
+            )
+            is_complete = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="""
 Compute the harmonic period supersequences of an integer
 
 Ex: uv run harmonic_period_sequences.py 20
 """,
-    epilog="""
+        epilog="""
 A harmonic period sequence is defined as a sequence of numbers where each number can be divisible by an integer to obtain the next number in the sequence.
 A harmonic period supersequence is defined as a sequence where other harmonic period sequences are captured within.
 For example: the harmonic period sequences of 4 are [4, 2, 1] and [4, 1].
 However, note that the sequence [4, 1], is a subsequence of the supersequence [4, 2, 1].
 By some notion of "dual", the harmonic period sequence is sort of like the dual of a prime factorization tree, where each "path" in a prime factorization tree, corresponds to a harmonic period sequence.
 """,
-)
-
-parser.add_argument(
-    "n", type=int, help="integer to find the harmonic period supersequeces of"
-)
-
-args = parser.parse_args()
-n = args.n
-
-harmonic_period_supersequences = []
-
-
-# The sequences are created by iterating through an integer's prime factors
-# and appending the integer/primefactor value to the sequence
-# This process is done recursively, so that every sequence (as an integer can
-# have multiple prime factors) can be captured
-def generate_harmonic_period_supersequences(current_sequence):
-    current_n = current_sequence[-1]
-    if current_n == 1:
-        harmonic_period_supersequences.append(current_sequence)
-    else:
-        current_n_primefactors = sympy.primefactors(current_n)
-        for next_n in current_n_primefactors:
-            next_sequence = current_sequence + [current_n // next_n]
-            generate_harmonic_period_supersequences(next_sequence)
+    )
 
+    parser.add_argument(
+        "n", type=int, help="integer to find the harmonic period supersequeces of"
+    )
+    parser.add_argument(
+        "--low",
+        type=int,
+        default=1,
+        help="only keep the elements of the supersequences that are at least low.",
+    )
+    parser.add_argument(
+        "--high",
+        type=int,
+        help="only keep the elements of the supersequences that are at most high.",
+    )
+    parser.add_argument(
+        "--count",
+        action="store_true",
+        help="only count the supersequences without listing them.",
+    )
 
-generate_harmonic_period_supersequences([n])
+    args = parser.parse_args()
+    n = args.n
 
-print("Harmonic Period Supersequences of " + str(n) + ":")
-pprint.pprint(harmonic_period_supersequences)
+    # Supersequences are printed as they are generated, as there can be too many to hold at once
+    if not args.count:
+        print("Harmonic Period Supersequences of " + str(n) + ":")
+        for sequence in harmonic_period_supersequences(n, args.low, args.high):
+            print(sequence)
+    print(
+        "Number of Harmonic Period Supersequences of "
+        + str(n)
+        + ": "
+        + str(count_harmonic_period_supersequences(n, args.low, args.high))
+    )
 
-n_divisors = list(reversed(sympy.divisors(n)))
-print("Divisors of " + str(n) + ": ")
-print(n_divisors)
+    n_divisors = divisors(n)
+    print("Divisors of " + str(n) + ": ")
+    print(n_divisors)
@@ -5,803 +5,5591 @@
 # ///
 
 import argparse
+import ast
+import bisect
+import concurrent.futures
+import contextlib
+import copy
 import csv
+import functools
+import hashlib
+import heapq
+import importlib.metadata
+import io
+import itertools
+import json
 import math
+import os
+import random
+import re
 import sys
+import threading
+import time
 
 import tomllib
-from ortools.sat.python import cp_model
 
 
-def schedule(schedule_input):
-    # TODO: Describe input in detail for each field in doc
-    # i.e. possible values, default values
+class ScheduleInputError(Exception):
+    # Raised when a schedule input is not valid, with every error found in the input as a message
+    def __init__(self, errors):
+        super().__init__("\n".join(errors))
+        self.errors = errors
 
-    # Populate periodic key if not specified
-    if "periodic" not in schedule_input.keys():
-        schedule_input["periodic"] = True
 
-    # Populate num_machines_weight key if not specified
-    if "num_machines_weight" not in schedule_input.keys():
-        schedule_input["num_machines_weight"] = 0
+# Keys of the jobs and of their predecessors that are times, and so must be integers when given
+JOB_TIME_KEYS = [
+    "period",
+    "min_period",
+    "start_time",
+    "completion_time",
+    "release_time",
+    "deadline",
+]
+PREDECESSOR_TIME_KEYS = ["time_lag", "slack_time"]
 
-    # Populate machines with a single machine if not specified
-    if "machines" not in schedule_input.keys():
-        schedule_input["machines"] = {"machine": {}}
 
-    # Check that at least one job is specified
-    if "jobs" not in schedule_input.keys() or len(schedule_input["jobs"]) == 0:
-        print(
-            f"No jobs specified!",
-            file=sys.stderr,
+def is_input_integer(value):
+    # TOML booleans are parsed as bool, which is a subclass of int, but are not times
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def check_input_tables(schedule_input):
+    # Check that the tables of the input are tables before their defaults are populated, so that a malformed input is reported by its key path
+    # The times of the jobs are checked to be integers as well, as the model can only be built from integer times
+    # Raises ScheduleInputError if any of them is not a table or an integer
+    if not isinstance(schedule_input, dict):
+        raise ScheduleInputError(["Schedule input is not a table!"])
+    table_errors = []
+    for key in ["machines", "jobs", "solver"]:
+        if key in schedule_input.keys() and not isinstance(schedule_input[key], dict):
+            table_errors.append(f"{key} is not a table!")
+    if isinstance(schedule_input.get("solver"), dict) and not isinstance(
+        schedule_input["solver"].get("parameters", {}), dict
+    ):
+        table_errors.append("solver.parameters is not a table!")
+    if isinstance(schedule_input.get("machines"), dict):
+        for machine_name, machine in schedule_input["machines"].items():
+            if not isinstance(machine, dict):
+                table_errors.append(f"machines.{machine_name} is not a table!")
+    if isinstance(schedule_input.get("jobs"), dict):
+        for job_name, job in schedule_input["jobs"].items():
+            if not isinstance(job, dict):
+                table_errors.append(f"jobs.{job_name} is not a table!")
+                continue
+            # Processing times may also be a single integer for every machine
+            if "processing_times" in job.keys() and not isinstance(
+                job["processing_times"], (int, dict)
+            ):
+                table_errors.append(
+                    f"jobs.{job_name}.processing_times is not a table or an integer!"
+                )
+            if isinstance(job.get("processing_times"), dict):
+                for machine_name, processing_time in job["processing_times"].items():
+                    if not is_input_integer(processing_time):
+                        table_errors.append(
+                            f"jobs.{job_name}.processing_times.{machine_name} is not an integer!"
+                        )
+            for key in JOB_TIME_KEYS:
+                if job.get(key) is not None and not is_input_integer(job[key]):
+                    table_errors.append(f"jobs.{job_name}.{key} is not an integer!")
+            if "predecessors" not in job.keys():
+                continue
+            if not isinstance(job["predecessors"], dict):
+                table_errors.append(f"jobs.{job_name}.predecessors is not a table!")
+                continue
+            for pred_job_name, pred_characteristics in job["predecessors"].items():
+                if not isinstance(pred_characteristics, dict):
+                    table_errors.append(
+                        f"jobs.{job_name}.predecessors.{pred_job_name} is not a table!"
+                    )
+                    continue
+                for key in PREDECESSOR_TIME_KEYS:
+                    if pred_characteristics.get(
+                        key
+                    ) is not None and not is_input_integer(pred_characteristics[key]):
+                        table_errors.append(
+                            f"jobs.{job_name}.predecessors.{pred_job_name}.{key} is not an integer!"
+                        )
+    if len(table_errors) > 0:
+        raise ScheduleInputError(table_errors)
+
+
+def is_schedule_fully_specified(jobs):
+    # A job is fully specified if its start time or completion time and its machine are known
+    return all(
+        [
+            (job["start_time"] is not None or job["completion_time"] is not None)
+            and job["machine"] is not None
+            for job in jobs.values()
+        ]
+    )
+
+
+def find_predecessor_instance(
+    predecessor_job,
+    predecessor_completion_time,
+    predecessor_instance_start_idx,
+    successor_time,
+    min_offset,
+    max_offset,
+):
+    # Find the earliest predecessor instance that completes within [successor_time - max_offset, successor_time - min_offset]
+    # As the predecessor is strictly periodic, its completion times are sorted by instance and the instance can be computed directly
+    # A max offset of None means the window is unbounded below
+    instance_idx = predecessor_instance_start_idx
+    if max_offset is not None:
+        instance_idx = max(
+            instance_idx,
+            -(
+                -(successor_time - max_offset - predecessor_completion_time)
+                // predecessor_job["period"]
+            ),
         )
-        sys.exit()
+    if instance_idx >= predecessor_job["instances"]:
+        return None
+    if (
+        predecessor_completion_time + instance_idx * predecessor_job["period"]
+        > successor_time - min_offset
+    ):
+        return None
+    return instance_idx
 
-    # Parse in periodic, num_machines_weight, machines, and jobs from schedule input
-    is_schedule_periodic = schedule_input["periodic"]
-    num_machines_weight = schedule_input["num_machines_weight"]
-    machines = schedule_input["machines"]
-    jobs = schedule_input["jobs"]
 
-    # Set default values and variables to solve for machines
-    for machine in machines.values():
-        if "speed" not in machine.keys():
-            machine["speed"] = 1
-        if "setup_time" not in machine.keys():
-            machine["setup_time"] = 0
-        if "teardown_time" not in machine.keys():
-            machine["teardown_time"] = 0
-        if "machine_weight" not in machine.keys():
-            machine["machine_weight"] = 0
-        # Variable to check for job overlap
-        machine["interval_vars"] = []
-        # Variable to keep track if the machine has any jobs assigned to it
-        machine["is_utilized_var"] = None
+def predecessor_relations(pred_characteristics):
+    # Each relation requires a predecessor instance completing within an offset window before the successor instance
+    # Returns the specified relations as (relation name, successor time key, min offset, max offset),
+    # where a max offset of None leaves the window unbounded below
+    start_time_wrt = pred_characteristics["start_time_wrt"]
+    completion_time_wrt = pred_characteristics["completion_time_wrt"]
+    time_lag = pred_characteristics["time_lag"]
+    slack_time = pred_characteristics["slack_time"]
 
-    for job in jobs.values():
-        # Create processing times based on input processing times and machine input
-        if "processing_times" not in job.keys():
-            job["processing_times"] = 1
-        # If input processing times is integer, apply that processing time to all machines
-        if isinstance(job["processing_times"], int):
-            processing_time = job["processing_times"]
-            job["processing_times"] = {
-                machine_name: processing_time for machine_name in machines.keys()
-            }
+    relations = []
+    if start_time_wrt is not None:
+        relations.append(
+            ("start time wrt", "start_time", start_time_wrt, start_time_wrt)
+        )
+    if completion_time_wrt is not None:
+        relations.append(
+            (
+                "completion time wrt",
+                "completion_time",
+                completion_time_wrt,
+                completion_time_wrt,
+            )
+        )
+    if time_lag is not None and slack_time is not None:
+        relations.append(("time lag + slack time", "start_time", time_lag, slack_time))
+    if time_lag is not None:
+        relations.append(("time lag", "start_time", max(time_lag, 0), None))
+    if slack_time is not None:
+        relations.append(("slack time", "start_time", 0, slack_time))
+    return relations
 
-        if "period" not in job.keys():
-            job["period"] = None
-        if "start_time" not in job.keys():
-            job["start_time"] = None
-        if "completion_time" not in job.keys():
-            job["completion_time"] = None
-        if "machine" not in job.keys():
-            job["machine"] = None
-        if "same_machine_jobs" not in job.keys():
-            job["same_machine_jobs"] = []
-        # If a string specified, convert to list
-        elif isinstance(job["same_machine_jobs"], str):
-            job["same_machine_jobs"] = [job["same_machine_jobs"]]
-        if "different_machine_jobs" not in job.keys():
-            job["different_machine_jobs"] = []
-        # If a string specified, convert to list
-        elif isinstance(job["different_machine_jobs"], str):
-            job["different_machine_jobs"] = [job["different_machine_jobs"]]
-        if "release_time" not in job.keys():
-            job["release_time"] = None
-        if "deadline" not in job.keys():
-            job["deadline"] = None
-        if "completion_time_weight" not in job.keys():
-            job["completion_time_weight"] = 0
-        if "flow_time_weight" not in job.keys():
-            job["flow_time_weight"] = 0
-        if "earliness_weight" not in job.keys():
-            job["earliness_weight"] = 0
 
-        if "predecessors" not in job.keys():
-            job["predecessors"] = {}
-        for pred_job_name, pred_characteristics in job["predecessors"].items():
-            if "start_time_wrt" not in pred_characteristics.keys():
-                pred_characteristics["start_time_wrt"] = None
-            if "completion_time_wrt" not in pred_characteristics.keys():
-                pred_characteristics["completion_time_wrt"] = None
-            if "time_lag" not in pred_characteristics.keys():
-                pred_characteristics["time_lag"] = None
-            if "slack_time" not in pred_characteristics.keys():
-                pred_characteristics["slack_time"] = None
-            if "completion_time_wrt_weight" not in pred_characteristics.keys():
-                pred_characteristics["completion_time_wrt_weight"] = 0
-            if "flow_time_wrt_weight" not in pred_characteristics.keys():
-                pred_characteristics["flow_time_wrt_weight"] = 0
-            if "earliness_wrt_weight" not in pred_characteristics.keys():
-                pred_characteristics["earliness_wrt_weight"] = 0
-            # Variables to solve for
-            pred_characteristics["completion_time_wrt_var"] = None
-            pred_characteristics["flow_time_wrt_var"] = None
-            pred_characteristics["earliness_wrt_var"] = None
+def completion_time_wrt_offset(successor_job, predecessor_job):
+    # The completion time wrt of a relation without a specified one is the offset from the latest predecessor instance completing
+    # at or before the first successor instance completes, which is within [0, predecessor's period - 1]
+    # For jobs with the same period this is the difference of their completion times, which the model requires to be at least the successor's processing time
+    return (
+        successor_job["completion_time"] - predecessor_job["completion_time"]
+    ) % predecessor_job["period"]
 
-        # Variables to solve for
-        job |= {
-            "start_time_var": None,
-            "machine_vars": {},
-            "processing_time_var": None,
-            "start+processing_time_var": None,
-            "completion_time_var": None,
-        }
 
-    # Flag to exit after checking input
-    input_error = False
+def verify_schedule(jobs, machines, is_schedule_periodic):
+    # Verify a fully specified schedule without building a constraint model
+    # The checks mirror the constraints of the model in schedule() over the instances of the hyper-period
+    # Returns a list describing every violated constraint, the solved fields of each job are filled in as the solver would
+    violations = []
 
-    # Ensure that a job can run on the machine specified
+    # Index of the first instance to check, see schedule() for the rationale of checking the previous period
+    instance_start_idx = -1 if is_schedule_periodic else 0
+
+    # Recover the start time, completion time, and processing time of each job within its period
     for job_name, job in jobs.items():
-        if job["machine"] is not None:
-            # If the machine is specified, make sure the machine exists
-            if job["machine"] not in machines.keys():
-                print(
-                    f"Job {job_name} is specified to run on machine {job['machine']} but that machine is not specified!",
-                    file=sys.stderr,
-                )
-                input_error = True
+        period = job["period"]
+        processing_time = job["processing_times"][job["machine"]]
+        job["processing_time"] = processing_time
 
-            # If the machine is specified, key off the machine in the processing times
-            if job["machine"] not in job["processing_times"].keys():
-                print(
-                    f"Job {job_name} is specified to run on machine {job['machine']} for which a processing time is not specified!",
-                    file=sys.stderr,
+        if job["start_time"] is not None:
+            start_time = job["start_time"] % period
+            completion_time = (start_time + processing_time) % period
+            if job["completion_time"] is not None:
+                specified_completion_time = (
+                    job["completion_time"] % period
+                    if job["completion_time"] % period != 0
+                    else period
                 )
-                input_error = True
-        # If the machine is not specified
+                if specified_completion_time != completion_time:
+                    violations.append(
+                        f"Job {job_name} is specified to complete at {specified_completion_time} but starts at {start_time} with processing time {processing_time}!"
+                    )
         else:
-            # If there is only one machine and if there is a processing time associated with it, then job must run on that machine
-            if len(machines) == 1:
-                machine_name = list(machines.keys())[0]
-                if machine_name in job["processing_times"].keys():
-                    job["machine"] = machine_name
-                else:
-                    print(
-                        f"Job {job_name} is not specified to run on the sole machine {machine_name}!",
-                        file=sys.stderr,
+            completion_time = (
+                job["completion_time"] % period
+                if job["completion_time"] % period != 0
+                else period
+            )
+            start_time = (completion_time - processing_time) % period
+
+        # The completion time is defined within [1, job's period] as the modulo of the start time plus the processing time
+        if completion_time == 0 or completion_time == period:
+            violations.append(
+                f"Job {job_name} completes on its period boundary which the completion time within [1, {period - 1}] cannot represent!"
+            )
+        if start_time + processing_time > 2 * period - 1:
+            violations.append(
+                f"Job {job_name} with processing time {processing_time} overruns more than one period {period}!"
+            )
+
+        job["start_time"] = start_time
+        job["completion_time"] = completion_time
+
+        if job["release_time"] is not None:
+            if start_time < job["release_time"] % period:
+                violations.append(
+                    f"Job {job_name} starts at {start_time} before its release time {job['release_time'] % period} in every instance!"
+                )
+        if job["deadline"] is not None:
+            deadline = (
+                job["deadline"] % period if job["deadline"] % period != 0 else period
+            )
+            if completion_time > deadline:
+                violations.append(
+                    f"Job {job_name} completes at {completion_time} after its deadline {deadline} in every instance!"
+                )
+
+        job["flow_time"] = (
+            start_time + processing_time - job["release_time"]
+            if job["release_time"] is not None
+            else None
+        )
+        job["earliness"] = (
+            job["deadline"] - completion_time if job["deadline"] is not None else None
+        )
+
+    # Check that job instances do not overlap on a machine with a sorted sweep
+    # The jobs on a pool are checked by assigning them to the machines of the pool instead
+    for machine_name, machine in machines.items():
+        if machine["capacity"] > 1:
+            continue
+        # Gather the intervals of every job instance on the machine, accounting for setup time and teardown time
+        intervals = []
+        for job_name, job in jobs.items():
+            if job["machine"] != machine_name:
+                continue
+            for instance_idx in range(instance_start_idx, job["instances"]):
+                interval_start = (
+                    job["start_time"]
+                    + instance_idx * job["period"]
+                    - machine["setup_time"]
+                )
+                interval_end = (
+                    job["start_time"]
+                    + job["processing_time"]
+                    + instance_idx * job["period"]
+                    + machine["teardown_time"]
+                )
+                if interval_start < interval_end:
+                    intervals.append(
+                        (interval_start, interval_end, job_name, instance_idx)
                     )
-                    input_error = True
-            # If there is only one machine/processing time pair specified, then job must run on that machine if machine exists
-            if len(job["processing_times"]) == 1:
-                processing_machine = list(job["processing_times"].keys())[0]
-                if processing_machine in machines.keys():
-                    job["machine"] = processing_machine
-                else:
-                    print(
-                        f"Job {job_name} is specified to run on machine {processing_machine} but that machine is not specified!",
-                        file=sys.stderr,
+        intervals.sort()
+
+        # Keep track of the interval that ends last so far, any interval starting before it overlaps with it
+        latest_interval = None
+        for interval in intervals:
+            if latest_interval is not None and interval[0] < latest_interval[1]:
+                violations.append(
+                    f"Job {interval[2]} instance {interval[3]} overlaps with job {latest_interval[2]} instance {latest_interval[3]} on machine {machine_name}!"
+                )
+            if latest_interval is None or interval[1] > latest_interval[1]:
+                latest_interval = interval
+
+    for machine_name in assign_pool_machines(jobs, machines, is_schedule_periodic):
+        violations.append(
+            f"Jobs on machine pool {machine_name} cannot be assigned to its {machines[machine_name]['capacity']} machines without overlapping!"
+        )
+
+    # Check the same/different machine job constraints
+    for job_name, job in jobs.items():
+        for same_machine_job_name in job["same_machine_jobs"]:
+            if jobs[same_machine_job_name]["machine"] != job["machine"]:
+                violations.append(
+                    f"Job {job_name} runs on machine {job['machine']} but job {same_machine_job_name} runs on machine {jobs[same_machine_job_name]['machine']}!"
+                )
+        for different_machine_job_name in job["different_machine_jobs"]:
+            if jobs[different_machine_job_name]["machine"] == job["machine"]:
+                violations.append(
+                    f"Job {job_name} runs on the same machine {job['machine']} as job {different_machine_job_name}!"
+                )
+
+    # Check the precedence relations for every successor instance, see schedule() for the rationale of each relation
+    for successor_job_name, successor_job in jobs.items():
+        for predecessor_job_name, pred_characteristics in successor_job[
+            "predecessors"
+        ].items():
+            predecessor_job = jobs[predecessor_job_name]
+            completion_time_wrt = pred_characteristics["completion_time_wrt"]
+
+            for (
+                relation_name,
+                successor_time_key,
+                min_offset,
+                max_offset,
+            ) in predecessor_relations(pred_characteristics):
+                for successor_instance_idx in range(successor_job["instances"]):
+                    successor_time = (
+                        successor_job[successor_time_key]
+                        + successor_instance_idx * successor_job["period"]
+                    )
+                    if (
+                        find_predecessor_instance(
+                            predecessor_job,
+                            predecessor_job["completion_time"],
+                            instance_start_idx,
+                            successor_time,
+                            min_offset,
+                            max_offset,
+                        )
+                        is None
+                    ):
+                        violations.append(
+                            f"Job {successor_job_name} instance {successor_instance_idx} has no instance of predecessor {predecessor_job_name} satisfying its {relation_name}!"
+                        )
+
+            # Compute the completion time wrt as the model does when it is not specified
+            if completion_time_wrt is None:
+                completion_time_wrt = completion_time_wrt_offset(
+                    successor_job, predecessor_job
+                )
+                if predecessor_job["period"] == successor_job["period"]:
+                    completion_offset = (
+                        successor_job["completion_time"]
+                        - predecessor_job["completion_time"]
+                    )
+                    if completion_offset < successor_job["processing_time"]:
+                        violations.append(
+                            f"Job {successor_job_name} completes {completion_offset} after predecessor {predecessor_job_name} completes which is less than its processing time {successor_job['processing_time']}!"
+                        )
+                elif successor_job["processing_time"] >= predecessor_job["period"]:
+                    violations.append(
+                        f"Job {successor_job_name} has processing time {successor_job['processing_time']} which is not less than the period of predecessor {predecessor_job_name}!"
                     )
-                    input_error = True
+            pred_characteristics["completion_time_wrt"] = completion_time_wrt
+
+    return violations
+
+
+def insert_folded_interval(starts, ends, interval_start, interval_end):
+    # Insert an interval into sorted disjoint intervals, merging it with the intervals it overlaps or touches
+    first_idx = bisect.bisect_left(ends, interval_start)
+    last_idx = bisect.bisect_right(starts, interval_end)
+    if first_idx < last_idx:
+        interval_start = min(interval_start, starts[first_idx])
+        interval_end = max(interval_end, ends[last_idx - 1])
+    starts[first_idx:last_idx] = [interval_start]
+    ends[first_idx:last_idx] = [interval_end]
+
+
+def timeline_folded_intervals(timeline, period):
+    # The intervals of the jobs on the timeline of a machine folded modulo the gcd of their period and the given period,
+    # where the intervals of all the jobs of the same gcd are merged together, as the job only needs to be checked against them once
+    # Only the intervals of the jobs placed since the intervals were last folded for the period are folded, so every job is only folded once for each period
+    # Returns the folded intervals as sorted disjoint intervals along with their gcd, the least gcd, and the lcm of the gcds
+    if period not in timeline["folded_intervals"].keys():
+        timeline["folded_intervals"][period] = {
+            "folds": [],
+            "min_gcd": None,
+            "lcm_gcd": 1,
+            "num_folded_intervals": 0,
+        }
+    folded_intervals = timeline["folded_intervals"][period]
+    if folded_intervals["num_folded_intervals"] < len(timeline["intervals"]):
+        for interval_period, interval_start, occupied_time in timeline["intervals"][
+            folded_intervals["num_folded_intervals"] :
+        ]:
+            gcd = math.gcd(period, interval_period)
+            for fold_gcd, starts, ends in folded_intervals["folds"]:
+                if fold_gcd == gcd:
+                    break
+            else:
+                starts = []
+                ends = []
+                folded_intervals["folds"].append((gcd, starts, ends))
+                folded_intervals["min_gcd"] = min(
+                    folded_intervals["min_gcd"] or gcd, gcd
+                )
+                folded_intervals["lcm_gcd"] = math.lcm(folded_intervals["lcm_gcd"], gcd)
+            insert_folded_interval(
+                starts, ends, interval_start % gcd, interval_start % gcd + occupied_time
+            )
+        folded_intervals["num_folded_intervals"] = len(timeline["intervals"])
+    return (
+        folded_intervals["folds"],
+        folded_intervals["min_gcd"],
+        folded_intervals["lcm_gcd"],
+    )
+
+
+def timeline_place(timeline, period, interval_start, occupied_time):
+    # Occupy the timeline of a machine from the interval start for the occupied time every period
+    timeline["intervals"].append((period, interval_start % period, occupied_time))
+
+
+def timeline_add_folded_load(timeline, period, occupied_time, weight):
+    # Add the weight of a job of the period occupying the timeline of a machine for the occupied time to the folded load seen by the jobs of each period
+    # A job occupies the fraction of the time of the machine modulo the gcd of its period with the period of another job that the other job cannot start in,
+    # see timeline_first_fit(), so the folded load seen by the jobs of a period is the sum of these fractions
+    for folded_period in timeline["folded_loads"].keys():
+        timeline["folded_loads"][folded_period] += (
+            weight * occupied_time / math.gcd(period, folded_period)
+        )
+
+
+def timeline_folded_load(timeline, period, occupied_time):
+    # The folded load of the timeline of a machine once a job of the period occupying it for the occupied time is placed on it,
+    # as seen by the jobs of the machine that are not placed yet, see timeline_add_folded_load()
+    # The folded load seen by the jobs of each period is weighed by the share of these jobs pending on the machine,
+    # so the jobs are placed on the machines least in the way of the jobs still to be placed
+    return sum(
+        pending_weight
+        * (
+            timeline["folded_loads"][folded_period]
+            + occupied_time / math.gcd(period, folded_period)
+        )
+        for folded_period, pending_weight in timeline["pending_weights"].items()
+    )
+
+
+def timeline_first_fit(timeline, period, occupied_time, earliest_start, latest_start):
+    # Find the first interval start within [earliest_start, latest_start] at which a job of the period occupying the machine for the occupied time
+    # does not overlap any job on the timeline of the machine in the hyper-period
+    # As in add_gcd_no_overlap(), the instances of two jobs never overlap if their intervals do not overlap modulo the gcd of their periods,
+    # so the jobs on the timeline are folded modulo the gcd with the period of the job, see timeline_folded_intervals()
+    # A folded interval and the interval of the job overlap modulo the gcd if they overlap with the interval of the job shifted by -gcd, 0, or gcd,
+    # and the interval of the job can start no earlier than the end of an interval it overlaps, so the search skips from interval to interval
+    # Only the last interval starting before the end of the interval of the job can overlap it, as every interval before it ends before it starts
+    # Whether the job fits only depends on its interval start modulo each gcd, so the range is cut to the lcm of the gcds
+    # Returns None if the job fits nowhere within the range
+    if occupied_time == 0:
+        return earliest_start if earliest_start <= latest_start else None
+    timeline_folds, min_gcd, lcm_gcd = timeline_folded_intervals(timeline, period)
+    if min_gcd is not None and occupied_time >= min_gcd:
+        return None
+    latest_start = min(latest_start, earliest_start + lcm_gcd - 1)
+
+    # The folds are checked in turn, starting over at the fold of the last overlap, until the job fits in all of them at the same interval start
+    num_folds = len(timeline_folds)
+    fold_idx = 0
+    num_fitting_folds = 0
+    interval_start = earliest_start
+    while interval_start <= latest_start:
+        if num_fitting_folds == num_folds:
+            return interval_start
+        gcd, starts, ends = timeline_folds[fold_idx]
+        folded_start = interval_start % gcd
+        folded_end = folded_start + occupied_time
+        interval_idx = bisect.bisect_left(starts, folded_end) - 1
+        if interval_idx >= 0 and ends[interval_idx] > folded_start:
+            # The job does not fit in the gaps shorter than its occupied time either, so the search skips past them at once
+            last_interval_idx = len(starts) - 1
+            while (
+                interval_idx < last_interval_idx
+                and starts[interval_idx + 1] < ends[interval_idx] + occupied_time
+            ):
+                interval_idx += 1
+            interval_start += ends[interval_idx] - folded_start
+            num_fitting_folds = 0
+            continue
+        # Only the last interval can be past the gcd, as the intervals start within the gcd, so only it can overlap the interval of the job shifted by gcd,
+        # and the interval of the job shifted by -gcd can only overlap an interval if it is past the gcd itself
+        if ends[-1] > folded_start + gcd:
+            interval_start += ends[-1] - gcd - folded_start
+            num_fitting_folds = 0
+            continue
+        if folded_end > gcd:
+            interval_idx = bisect.bisect_left(starts, folded_end - gcd) - 1
+            if interval_idx >= 0 and ends[interval_idx] > folded_start - gcd:
+                interval_start += ends[interval_idx] + gcd - folded_start
+                num_fitting_folds = 0
+                continue
+        num_fitting_folds += 1
+        fold_idx = (fold_idx + 1) % num_folds
+    return None
+
+
+def greedy_schedule_priority_order(jobs):
+    # Order the jobs topologically over their predecessors, so that every predecessor is placed before its successors
+    # Among the jobs whose predecessors are placed, jobs of shorter periods go first as with rate-monotonic priorities
+    # and jobs of earlier deadlines go first among jobs of the same period as with earliest deadline first priorities
+    # Jobs on a cycle of predecessors are ordered by priority alone once no other job is left
+    priorities = {
+        job_name: (
+            job["period"],
+            (
+                job["deadline"] % job["period"]
+                if job["deadline"] is not None
+                else job["period"]
+            ),
+            job_idx,
+        )
+        for job_idx, (job_name, job) in enumerate(jobs.items())
+    }
+    successors = {job_name: [] for job_name in jobs.keys()}
+    num_unordered_predecessors = {}
+    for job_name, job in jobs.items():
+        pred_job_names = [
+            pred_job_name
+            for pred_job_name in job["predecessors"].keys()
+            if pred_job_name != job_name
+        ]
+        for pred_job_name in pred_job_names:
+            successors[pred_job_name].append(job_name)
+        num_unordered_predecessors[job_name] = len(pred_job_names)
+
+    ready_jobs = [
+        (priorities[job_name], job_name)
+        for job_name, num_predecessors in num_unordered_predecessors.items()
+        if num_predecessors == 0
+    ]
+    heapq.heapify(ready_jobs)
+    remaining_jobs = sorted(
+        (priority, job_name) for job_name, priority in priorities.items()
+    )
+    ordered_job_names = set()
+    order = []
+    while len(order) < len(jobs):
+        if len(ready_jobs) == 0:
+            while remaining_jobs[0][1] in ordered_job_names:
+                remaining_jobs.pop(0)
+            heapq.heappush(ready_jobs, remaining_jobs.pop(0))
+        _, job_name = heapq.heappop(ready_jobs)
+        if job_name in ordered_job_names:
+            continue
+        ordered_job_names.add(job_name)
+        order.append(job_name)
+        for successor_job_name in successors[job_name]:
+            num_unordered_predecessors[successor_job_name] -= 1
+            if num_unordered_predecessors[successor_job_name] == 0:
+                heapq.heappush(
+                    ready_jobs, (priorities[successor_job_name], successor_job_name)
+                )
+    return order
+
+
+def greedy_predecessor_window(
+    job, jobs, placements, processing_time, is_schedule_periodic
+):
+    # Bound the start time of a job by the precedence relations with its placed predecessors, relative to the first completion of each predecessor
+    # A window past the period of the job is satisfied by the predecessor instance of the previous period for periodic schedules
+    # This honors the relations exactly for predecessors of the same period and is a heuristic otherwise, see verify_schedule() for the exact check
+    # Returns the earliest and latest start time, where the latest start time is None if unbounded
+    earliest_start_time = 0
+    latest_start_time = None
+    for pred_job_name, pred_characteristics in job["predecessors"].items():
+        if pred_job_name not in placements.keys():
+            continue
+        pred_job = jobs[pred_job_name]
+        pred_start_time, pred_machine_name, _ = placements[pred_job_name]
+        pred_completion_time = (
+            pred_start_time + pred_job["processing_times"][pred_machine_name]
+        ) % pred_job["period"]
+
+        relation_earliest_start_time = 0
+        relation_latest_start_time = None
+        for _, successor_time_key, min_offset, max_offset in predecessor_relations(
+            pred_characteristics
+        ):
+            time_offset = (
+                processing_time if successor_time_key == "completion_time" else 0
+            )
+            relation_earliest_start_time = max(
+                relation_earliest_start_time,
+                pred_completion_time + min_offset - time_offset,
+            )
+            if max_offset is not None:
+                relation_latest_start_time = min(
+                    (
+                        relation_latest_start_time
+                        if relation_latest_start_time is not None
+                        else pred_completion_time + max_offset - time_offset
+                    ),
+                    pred_completion_time + max_offset - time_offset,
+                )
+        if is_schedule_periodic and relation_earliest_start_time >= job["period"]:
+            relation_earliest_start_time -= pred_job["period"]
+            if relation_latest_start_time is not None:
+                relation_latest_start_time -= pred_job["period"]
+        earliest_start_time = max(earliest_start_time, relation_earliest_start_time)
+        if relation_latest_start_time is not None:
+            latest_start_time = (
+                min(latest_start_time, relation_latest_start_time)
+                if latest_start_time is not None
+                else relation_latest_start_time
+            )
+
+        # A successor of the same period completes after its predecessor within the period by at least its processing time, see verify_schedule()
+        if (
+            pred_characteristics["completion_time_wrt"] is None
+            and pred_job["period"] == job["period"]
+        ):
+            earliest_start_time = max(earliest_start_time, pred_completion_time)
+            latest_start_time = (
+                min(latest_start_time, job["period"] - 1 - processing_time)
+                if latest_start_time is not None
+                else job["period"] - 1 - processing_time
+            )
+
+    return earliest_start_time, latest_start_time
+
+
+def greedy_start_window(
+    job,
+    jobs,
+    placements,
+    processing_time,
+    is_schedule_periodic,
+    use_time_windows=True,
+    use_predecessors=True,
+):
+    # The range of start times of a job within its period, which is its specified start time if any
+    # The range is limited by its release time and deadline and by its precedence relations with placed predecessors if requested
+    # The latest start time is before the end of the period for non-periodic schedules, as their jobs do not wrap around
+    period = job["period"]
+    if job["start_time"] is not None:
+        return job["start_time"] % period, job["start_time"] % period
+    if job["completion_time"] is not None:
+        start_time = (job["completion_time"] - processing_time) % period
+        return start_time, start_time
+    earliest_start_time = 0
+    latest_start_time = (
+        period - 1 if is_schedule_periodic else period - 1 - processing_time
+    )
+    if use_time_windows and job["release_time"] is not None:
+        earliest_start_time = job["release_time"] % period
+    # Since completion time is defined as [1, job's period] the deadline is as well
+    if use_time_windows and job["deadline"] is not None:
+        deadline = job["deadline"] % period if job["deadline"] % period != 0 else period
+        latest_start_time = min(latest_start_time, deadline - processing_time)
+    if use_predecessors:
+        pred_earliest_start_time, pred_latest_start_time = greedy_predecessor_window(
+            job, jobs, placements, processing_time, is_schedule_periodic
+        )
+        earliest_start_time = max(earliest_start_time, pred_earliest_start_time)
+        if pred_latest_start_time is not None:
+            latest_start_time = min(latest_start_time, pred_latest_start_time)
+    # A job of a periodic schedule cannot complete on its period boundary, so jobs packed from the start of the period leave the last job no way to complete at the end of it
+    # Unrestricted jobs are packed from the second time unit instead, which leaves the first one to a job wrapping around the period boundary
+    if (
+        is_schedule_periodic
+        and earliest_start_time == 0
+        and latest_start_time == period - 1
+    ):
+        return 1, period
+    return earliest_start_time, latest_start_time
+
+
+def construct_greedy_schedule(jobs, machines, is_schedule_periodic, hints=None):
+    # Construct a schedule greedily without a constraint model, to output on its own or to hint the solver with a complete schedule
+    # Jobs are placed one by one in priority order, see greedy_schedule_priority_order(), at the first start time on the timeline
+    # of each machine they can run on that satisfies their release time, deadline, and precedence relations with placed predecessors,
+    # taking the machine with the least folded load they fit on, see timeline_folded_load() and timeline_first_fit()
+    # Jobs with a specified start time and machine, and jobs with hints, are placed first as specified or hinted
+    # A job that fits nowhere is placed ignoring its release time, deadline, and precedence relations, and otherwise overlapping other jobs,
+    # so that every job is placed, and the violated constraints are found by verify_schedule()
+    # Returns the start time and machine of every job by name, where jobs on a pool run on the pool
+    if hints is None:
+        hints = {}
+    timelines = {
+        (machine_name, pool_machine_idx): {
+            "intervals": [],
+            "folded_intervals": {},
+            "pending_weights": {},
+            "folded_loads": {},
+        }
+        for machine_name, machine in machines.items()
+        for pool_machine_idx in range(machine["capacity"])
+    }
+    # Placements of the jobs by name as their start time, machine, and the index of the machine within its pool
+    placements = {}
+
+    # Every job that is not placed yet weighs on the timelines of the machines it can run on, split evenly between them, see timeline_folded_load()
+    job_timelines = {
+        job_name: [
+            (machine_name, pool_machine_idx)
+            for machine_name in (
+                [job["machine"]]
+                if job["machine"] is not None
+                else job["processing_times"].keys()
+            )
+            if machine_name in machines.keys()
+            and machine_name in job["processing_times"].keys()
+            for pool_machine_idx in range(machines[machine_name]["capacity"])
+        ]
+        for job_name, job in jobs.items()
+    }
+
+    def job_occupied_time(job_name, machine_name):
+        machine = machines[machine_name]
+        return (
+            machine["setup_time"]
+            + jobs[job_name]["processing_times"][machine_name]
+            + machine["teardown_time"]
+        )
+
+    # The weights of the jobs are summed up per period before they are folded, as the folded load is linear in them
+    pending_occupied_times = {timeline_key: {} for timeline_key in timelines.keys()}
+    for job_name, job in jobs.items():
+        period = job["period"]
+        for timeline_key in job_timelines[job_name]:
+            weight = 1 / len(job_timelines[job_name])
+            pending_weights = timelines[timeline_key]["pending_weights"]
+            pending_weights[period] = pending_weights.get(period, 0) + weight
+            occupied_times = pending_occupied_times[timeline_key]
+            occupied_times[period] = occupied_times.get(
+                period, 0
+            ) + weight * job_occupied_time(job_name, timeline_key[0])
+    for timeline_key, timeline in timelines.items():
+        timeline["folded_loads"] = dict.fromkeys(timeline["pending_weights"].keys(), 0)
+        for period, pending_occupied_time in pending_occupied_times[
+            timeline_key
+        ].items():
+            timeline_add_folded_load(timeline, period, pending_occupied_time, 1)
+
+    # Jobs that must run on the same machine are grouped together with a union-find as in assign_pool_machines(),
+    # and every job of a group runs on the machine of the first job of the group placed, among the machines every job of the group can run on
+    groups = {job_name: job_name for job_name in jobs.keys()}
+
+    def find(job_name):
+        while groups[job_name] != job_name:
+            groups[job_name] = groups[groups[job_name]]
+            job_name = groups[job_name]
+        return job_name
+
+    for job_name, job in jobs.items():
+        for other_job_name in job["same_machine_jobs"]:
+            groups[find(job_name)] = find(other_job_name)
+    group_machine_names = {}
+    for job_name, job in jobs.items():
+        group_name = find(job_name)
+        group_machine_names[group_name] = group_machine_names.get(
+            group_name, set(job["processing_times"].keys())
+        ) & set(job["processing_times"].keys())
+    group_machines = {}
+
+    # A placed job stops weighing on the machines it can run on and occupies the machine it is placed on in full,
+    # and once no job of a period is pending on a machine anymore, its folded load is no longer kept up to date
+    def place(job_name, start_time, machine_name, pool_machine_idx):
+        period = jobs[job_name]["period"]
+        pending_weight = 1 / max(len(job_timelines[job_name]), 1)
+        placed_weight = 1
+        for timeline_key in job_timelines[job_name]:
+            pending_weights = timelines[timeline_key]["pending_weights"]
+            pending_weights[period] -= pending_weight
+            if pending_weights[period] < 1e-9:
+                del pending_weights[period]
+                del timelines[timeline_key]["folded_loads"][period]
+            if timeline_key == (machine_name, pool_machine_idx):
+                placed_weight -= pending_weight
+            else:
+                timeline_add_folded_load(
+                    timelines[timeline_key],
+                    period,
+                    job_occupied_time(job_name, timeline_key[0]),
+                    -pending_weight,
+                )
+        if placed_weight > 1e-9:
+            timeline_add_folded_load(
+                timelines[(machine_name, pool_machine_idx)],
+                period,
+                job_occupied_time(job_name, machine_name),
+                placed_weight,
+            )
+        machine = machines[machine_name]
+        occupied_time = (
+            machine["setup_time"]
+            + jobs[job_name]["processing_times"][machine_name]
+            + machine["teardown_time"]
+        )
+        if occupied_time > 0:
+            timeline_place(
+                timelines[(machine_name, pool_machine_idx)],
+                jobs[job_name]["period"],
+                start_time - machine["setup_time"],
+                occupied_time,
+            )
+        placements[job_name] = (
+            start_time % jobs[job_name]["period"],
+            machine_name,
+            pool_machine_idx,
+        )
+        group_machines.setdefault(find(job_name), (machine_name, pool_machine_idx))
+
+    for job_name, job in jobs.items():
+        if job["machine"] is None or job["machine"] not in job["processing_times"]:
+            continue
+        if job["start_time"] is not None:
+            place(job_name, job["start_time"] % job["period"], job["machine"], 0)
+        elif job["completion_time"] is not None:
+            place(
+                job_name,
+                (job["completion_time"] - job["processing_times"][job["machine"]])
+                % job["period"],
+                job["machine"],
+                0,
+            )
+    for job_name, (start_time, machine_name) in hints.items():
+        if job_name not in placements.keys():
+            place(job_name, start_time % jobs[job_name]["period"], machine_name, 0)
+
+    # Relations to other jobs on different machines go both ways
+    different_machine_job_names = {job_name: set() for job_name in jobs.keys()}
+    for job_name, job in jobs.items():
+        for other_job_name in job["different_machine_jobs"]:
+            different_machine_job_names[job_name].add(other_job_name)
+            different_machine_job_names[other_job_name].add(job_name)
+
+    for job_name in greedy_schedule_priority_order(jobs):
+        if job_name in placements.keys():
+            continue
+        job = jobs[job_name]
+        period = job["period"]
+
+        # Machines of the pools the job can run on, restricted by the group of jobs it must share a machine with
+        # and by the placed jobs it must not share a machine with
+        candidate_machines = job_timelines[job_name]
+        group_name = find(job_name)
+        different_machines = {
+            placements[other_job_name][1:]
+            for other_job_name in different_machine_job_names[job_name]
+            if other_job_name in placements.keys()
+        }
+        candidate_machines = [
+            candidate_machine
+            for candidate_machine in candidate_machines
+            if (
+                candidate_machine == group_machines[group_name]
+                if group_name in group_machines.keys()
+                else candidate_machine[0] in group_machine_names[group_name]
+            )
+            and candidate_machine not in different_machines
+        ] or candidate_machines
+        if len(candidate_machines) == 0:
+            continue
+
+        # Place the job on the machine with the least folded load it fits on, see timeline_folded_load(), at the earliest start time it fits at,
+        # first within the time windows of the job and the windows of its precedence relations, then within its time windows alone, and then anywhere in its period
+        # The machines are tried in the order of their folded load, so the search stops at the first machine the job fits on past the machines of the same folded load
+        # The range of start times only depends on the machine through the processing time, so it is computed once per processing time,
+        # and the machines of a processing time are skipped if its range is the same as in the previous search, in which the job fit on none of them
+        candidate_machines = sorted(
+            (
+                (
+                    timeline_folded_load(
+                        timelines[(machine_name, pool_machine_idx)],
+                        period,
+                        job_occupied_time(job_name, machine_name),
+                    )
+                    if len(candidate_machines) > 1
+                    else 0
+                ),
+                candidate_machine_idx,
+                machine_name,
+                pool_machine_idx,
+            )
+            for candidate_machine_idx, (machine_name, pool_machine_idx) in enumerate(
+                candidate_machines
+            )
+        )
+        # The best placement is kept as its start time, machine and folded load of the machine
+        best_placement = None
+        previous_start_windows = {}
+        for use_time_windows, use_predecessors in [
+            (True, True),
+            (True, False),
+            (False, False),
+        ]:
+            start_windows = {}
+            for folded_load, _, machine_name, pool_machine_idx in candidate_machines:
+                if best_placement is not None and folded_load > best_placement[3]:
+                    break
+                machine = machines[machine_name]
+                processing_time = job["processing_times"][machine_name]
+                occupied_time = (
+                    machine["setup_time"] + processing_time + machine["teardown_time"]
+                )
+                if processing_time not in start_windows.keys():
+                    start_windows[processing_time] = greedy_start_window(
+                        job,
+                        jobs,
+                        placements,
+                        processing_time,
+                        is_schedule_periodic,
+                        use_time_windows,
+                        use_predecessors,
+                    )
+                earliest_start_time, latest_start_time = start_windows[processing_time]
+                if (
+                    previous_start_windows.get(processing_time)
+                    == start_windows[processing_time]
+                ):
+                    continue
+
+                # Keep searching past a start time whose completion time falls on the period boundary
+                start_time = earliest_start_time
+                while start_time is not None:
+                    interval_start = timeline_first_fit(
+                        timelines[(machine_name, pool_machine_idx)],
+                        period,
+                        occupied_time,
+                        start_time - machine["setup_time"],
+                        latest_start_time - machine["setup_time"],
+                    )
+                    start_time = (
+                        interval_start + machine["setup_time"]
+                        if interval_start is not None
+                        else None
+                    )
+                    if (
+                        start_time is None
+                        or (start_time + processing_time) % period != 0
+                    ):
+                        break
+                    start_time += 1
+                if start_time is not None and (
+                    best_placement is None or start_time < best_placement[0]
+                ):
+                    best_placement = (
+                        start_time,
+                        machine_name,
+                        pool_machine_idx,
+                        folded_load,
+                    )
+            if best_placement is not None:
+                break
+            previous_start_windows = start_windows
+
+        # Overlap other jobs at the start of the time window of the job on the machine of the least folded load if it fits nowhere
+        if best_placement is None:
+            folded_load, _, machine_name, pool_machine_idx = candidate_machines[0]
+            earliest_start_time, _ = greedy_start_window(
+                job,
+                jobs,
+                placements,
+                job["processing_times"][machine_name],
+                is_schedule_periodic,
+            )
+            best_placement = (
+                min(earliest_start_time, period - 1),
+                machine_name,
+                pool_machine_idx,
+                folded_load,
+            )
+        place(job_name, *best_placement[:3])
+
+    return {
+        job_name: (start_time, machine_name)
+        for job_name, (start_time, machine_name, _) in placements.items()
+    }
+
+
+def pool_machine_names(machine_name, machine):
+    # A machine with a capacity of more than one is a pool of identical machines, named after the pool and their number within it
+    # Returns the names of the machines of a pool, which are none for a machine that is not a pool or whose capacity is not valid
+    capacity = machine.get("capacity", 1)
+    if not isinstance(capacity, int) or capacity <= 1:
+        return []
+    return [
+        f"{machine_name}_{pool_machine_idx}"
+        for pool_machine_idx in range(1, capacity + 1)
+    ]
+
+
+def assign_pool_machines(jobs, machines, is_schedule_periodic, num_pool_machines=None):
+    # Assign the jobs on each machine pool to the machines of the pool from their start times, i.e. color the graph of jobs whose instances overlap
+    # Jobs that must run on the same machine are grouped together and groups conflict if their instances overlap or if they must run on different machines
+    # Groups are assigned the first machine that no conflicting group has in order of start time, which needs no more machines than jobs overlap
+    # when each job has a single instance, and otherwise by a small constraint model over the conflicts if that needs too many machines
+    # num_pool_machines limits the number of machines of each pool that can be assigned, which defaults to its capacity
+    # Returns the names of the pools whose jobs cannot be assigned, which keep the pool as their machine
+    unassigned_pool_names = []
+
+    # Index of the first instance to check, see schedule() for the rationale of checking the previous period
+    instance_start_idx = -1 if is_schedule_periodic else 0
+
+    for machine_name, machine in machines.items():
+        if machine["capacity"] == 1:
+            continue
+        pool_job_names = [
+            job_name for job_name, job in jobs.items() if job["machine"] == machine_name
+        ]
+        if len(pool_job_names) == 0:
+            continue
+        max_pool_machines = (
+            machine["capacity"]
+            if num_pool_machines is None
+            else num_pool_machines[machine_name]
+        )
+
+        # Jobs that must run on the same machine are grouped together with a union-find, each job on its own is a group as well
+        groups = {job_name: job_name for job_name in pool_job_names}
+
+        def find(job_name):
+            while groups[job_name] != job_name:
+                groups[job_name] = groups[groups[job_name]]
+                job_name = groups[job_name]
+            return job_name
+
+        for job_name in pool_job_names:
+            for same_machine_job_name in jobs[job_name]["same_machine_jobs"]:
+                if same_machine_job_name in groups.keys():
+                    groups[find(job_name)] = find(same_machine_job_name)
+
+        # Gather the intervals of every job instance on the pool, accounting for setup time and teardown time as in verify_schedule()
+        intervals = []
+        for job_name in pool_job_names:
+            job = jobs[job_name]
+            for instance_idx in range(instance_start_idx, job["instances"]):
+                interval_start = (
+                    job["start_time"]
+                    + instance_idx * job["period"]
+                    - machine["setup_time"]
+                )
+                interval_end = (
+                    job["start_time"]
+                    + job["processing_time"]
+                    + instance_idx * job["period"]
+                    + machine["teardown_time"]
+                )
+                if interval_start < interval_end:
+                    intervals.append((interval_start, interval_end, find(job_name)))
+        intervals.sort()
+
+        # Keep track of the intervals that have not ended yet, any interval starting before one of them ends overlaps with it
+        conflicts = {find(job_name): set() for job_name in pool_job_names}
+        active_intervals = []
+        for interval_start, interval_end, group in intervals:
+            active_intervals = [
+                active_interval
+                for active_interval in active_intervals
+                if active_interval[0] > interval_start
+            ]
+            for _, active_group in active_intervals:
+                conflicts[group].add(active_group)
+                conflicts[active_group].add(group)
+            active_intervals.append((interval_end, group))
+        for job_name in pool_job_names:
+            for different_machine_job_name in jobs[job_name]["different_machine_jobs"]:
+                if different_machine_job_name in groups.keys():
+                    conflicts[find(job_name)].add(find(different_machine_job_name))
+                    conflicts[find(different_machine_job_name)].add(find(job_name))
+
+        # Jobs of a group that overlap with each other cannot share a machine
+        if any(
+            group in group_conflicts for group, group_conflicts in conflicts.items()
+        ):
+            unassigned_pool_names.append(machine_name)
+            continue
+
+        # Assign groups in order of their first instance
+        group_order = list(dict.fromkeys(group for _, _, group in intervals))
+        assignment = {}
+        for group in group_order:
+            assigned_idxs = {
+                assignment[other_group]
+                for other_group in conflicts[group]
+                if other_group in assignment.keys()
+            }
+            pool_machine_idx = next(
+                (
+                    pool_machine_idx
+                    for pool_machine_idx in range(max_pool_machines)
+                    if pool_machine_idx not in assigned_idxs
+                ),
+                None,
+            )
+            if pool_machine_idx is None:
+                assignment = color_pool_conflicts(
+                    group_order, conflicts, max_pool_machines
+                )
+                break
+            assignment[group] = pool_machine_idx
+
+        if assignment is None:
+            unassigned_pool_names.append(machine_name)
+            continue
+        for job_name in pool_job_names:
+            jobs[job_name]["machine"] = machine["pool_machines"][
+                assignment[find(job_name)]
+            ]
+
+    return unassigned_pool_names
+
+
+def color_pool_conflicts(groups, conflicts, max_pool_machines):
+    # Assign every group of jobs on a pool to one of max_pool_machines machines such that conflicting groups do not share a machine
+    # Solved by a constraint model with a boolean variable for every group and machine, which is small compared to the schedule
+    # Returns the index of the machine of each group, or None if there is no such assignment or none is found within the time limit
+    from ortools.sat.python import cp_model
+
+    model = cp_model.CpModel()
+    group_machine_vars = {
+        group: [
+            model.new_bool_var(f"group_{group}_machine_{pool_machine_idx}")
+            for pool_machine_idx in range(max_pool_machines)
+        ]
+        for group in groups
+    }
+    for group in groups:
+        model.add_exactly_one(group_machine_vars[group])
+        for other_group in conflicts[group]:
+            for machine_var, other_machine_var in zip(
+                group_machine_vars[group], group_machine_vars[other_group]
+            ):
+                model.add_bool_or([~machine_var, ~other_machine_var])
+    # The machines of a pool are interchangeable, so the first group can be assigned the first machine
+    model.add(group_machine_vars[groups[0]][0] == True)
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = 10
+    status_name = solver.status_name(solver.Solve(model))
+    if status_name != "OPTIMAL" and status_name != "FEASIBLE":
+        return None
+    return {
+        group: next(
+            pool_machine_idx
+            for pool_machine_idx, machine_var in enumerate(machine_vars)
+            if solver.value(machine_var)
+        )
+        for group, machine_vars in group_machine_vars.items()
+    }
+
+
+def start_time_windows(job, processing_time):
+    # Compute the start times within [0, job's period - 1] that respect the job's release time, deadline,
+    # and specified start time or completion time when it runs with a processing time
+    # The completion time is the start time plus the processing time modulo the period and is defined within [1, job's period],
+    # so a job either completes within its period or wraps around to complete in the next period, but never on the period boundary
+    # Returns a list of disjoint [first start time, last start time] windows, the first without and the second with wrapping around
+    period = job["period"]
+    release_time = (
+        job["release_time"] % period if job["release_time"] is not None else 0
+    )
+    deadline = (
+        (job["deadline"] % period if job["deadline"] % period != 0 else period)
+        if job["deadline"] is not None
+        else period
+    )
+    windows = [
+        [
+            max(release_time, 1 - processing_time),
+            min(deadline - processing_time, period - processing_time - 1),
+        ],
+        [
+            max(release_time, period - processing_time + 1),
+            min(
+                period - 1,
+                period + deadline - processing_time,
+                2 * period - 1 - processing_time,
+            ),
+        ],
+    ]
+
+    # Narrow the windows down to the specified start time or completion time
+    if job["start_time"] is not None:
+        for window in windows:
+            window[0] = max(window[0], job["start_time"] % period)
+            window[1] = min(window[1], job["start_time"] % period)
+    if job["completion_time"] is not None:
+        completion_time = (
+            job["completion_time"] % period
+            if job["completion_time"] % period != 0
+            else period
+        )
+        for window, wrap_time in zip(windows, [0, period]):
+            window[0] = max(window[0], completion_time - processing_time + wrap_time)
+            window[1] = min(window[1], completion_time - processing_time + wrap_time)
+
+    return [tuple(window) for window in windows if window[0] <= window[1]]
+
+
+def tighten_time_domains(jobs, machines, is_schedule_periodic):
+    # Propagate bounds on the start time and completion time of every job through its start time windows and its precedence relations
+    # Every bound follows from the constraints of the model in schedule(), so the variables can be created with the tightened domains
+    # Returns the start time windows of each job by the machines it can run on, where a job without any windows left cannot be scheduled
+    predecessor_instance_start_idx = -1 if is_schedule_periodic else 0
+
+    # Start from the start time windows of each job on every machine it can run on
+    # In a periodic schedule a job must not overlap with its own next instance
+    machine_windows = {}
+    bounds = {}
+    for job_name, job in jobs.items():
+        machine_windows[job_name] = {}
+        for machine_name, processing_time in job["processing_times"].items():
+            if machine_name not in machines.keys() or (
+                job["machine"] is not None and job["machine"] != machine_name
+            ):
+                continue
+            machine = machines[machine_name]
+            if (
+                is_schedule_periodic
+                and machine["setup_time"] + processing_time + machine["teardown_time"]
+                > job["period"]
+            ):
+                continue
+            machine_windows[job_name][machine_name] = start_time_windows(
+                job, processing_time
+            )
+        bounds[job_name] = {
+            "start_time": [0, job["period"] - 1],
+            "completion_time": [1, job["period"]],
+        }
+
+    # Bounds are propagated in rounds until they no longer change
+    # Precedence cycles can shrink bounds by little every round, so the number of rounds is capped as stopping early is still sound
+    for _ in range(len(jobs) + 1):
+        is_changed = False
+
+        # Narrow the start time windows down to the bounds of the start time and the completion time, then bound both by the windows
+        for job_name, job in jobs.items():
+            period = job["period"]
+            start_bounds = bounds[job_name]["start_time"]
+            completion_bounds = bounds[job_name]["completion_time"]
+            start_times = []
+            completion_times = []
+            for machine_name, windows in machine_windows[job_name].items():
+                processing_time = job["processing_times"][machine_name]
+                narrowed_windows = []
+                for first_start_time, last_start_time in windows:
+                    # Windows of a job that wraps around complete in the next period
+                    wrap_time = (
+                        period if first_start_time + processing_time > period else 0
+                    )
+                    first_start_time = max(
+                        first_start_time,
+                        start_bounds[0],
+                        completion_bounds[0] - processing_time + wrap_time,
+                    )
+                    last_start_time = min(
+                        last_start_time,
+                        start_bounds[1],
+                        completion_bounds[1] - processing_time + wrap_time,
+                    )
+                    if first_start_time <= last_start_time:
+                        narrowed_windows.append((first_start_time, last_start_time))
+                        start_times += [first_start_time, last_start_time]
+                        completion_times += [
+                            first_start_time + processing_time - wrap_time,
+                            last_start_time + processing_time - wrap_time,
+                        ]
+                machine_windows[job_name][machine_name] = narrowed_windows
+            if len(start_times) == 0:
+                return machine_windows
+            for key, times in [
+                ("start_time", start_times),
+                ("completion_time", completion_times),
+            ]:
+                if bounds[job_name][key] != [min(times), max(times)]:
+                    bounds[job_name][key] = [min(times), max(times)]
+                    is_changed = True
+
+        # Every successor instance needs a predecessor instance completing within the offset window before it,
+        # which bounds the successor time from the predecessor completion time and vice versa, see screen_schedule()
+        for successor_job_name, successor_job in jobs.items():
+            for predecessor_job_name, pred_characteristics in successor_job[
+                "predecessors"
+            ].items():
+                predecessor_job = jobs[predecessor_job_name]
+                completion_bounds = bounds[predecessor_job_name]["completion_time"]
+                # Relations as (successor time key, min offset, max offset, index of the first predecessor instance)
+                relations = [
+                    (
+                        successor_time_key,
+                        min_offset,
+                        max_offset,
+                        predecessor_instance_start_idx,
+                    )
+                    for _, successor_time_key, min_offset, max_offset in predecessor_relations(
+                        pred_characteristics
+                    )
+                ]
+
+                # If the completion time wrt is not specified for jobs with the same period, it is the difference of their completion times
+                # within the same period, which must be at least the processing time of the successor
+                if (
+                    pred_characteristics["completion_time_wrt"] is None
+                    and predecessor_job["period"] == successor_job["period"]
+                    and len(machine_windows[successor_job_name]) > 0
+                ):
+                    relations.append(
+                        (
+                            "completion_time",
+                            min(
+                                successor_job["processing_times"][machine_name]
+                                for machine_name in machine_windows[
+                                    successor_job_name
+                                ].keys()
+                            ),
+                            None,
+                            0,
+                        )
+                    )
+
+                for (
+                    successor_time_key,
+                    min_offset,
+                    max_offset,
+                    instance_start_idx,
+                ) in relations:
+                    successor_bounds = bounds[successor_job_name][successor_time_key]
+                    tightened_bounds = [
+                        (
+                            successor_bounds,
+                            0,
+                            completion_bounds[0]
+                            + instance_start_idx * predecessor_job["period"]
+                            + min_offset,
+                        ),
+                        (
+                            completion_bounds,
+                            1,
+                            successor_bounds[1]
+                            - min_offset
+                            - instance_start_idx * predecessor_job["period"],
+                        ),
+                    ]
+                    if max_offset is not None:
+                        tightened_bounds += [
+                            (
+                                successor_bounds,
+                                1,
+                                completion_bounds[1]
+                                - predecessor_job["period"]
+                                + successor_job["period"]
+                                + max_offset,
+                            ),
+                            (
+                                completion_bounds,
+                                0,
+                                successor_bounds[0]
+                                - successor_job["period"]
+                                - max_offset
+                                + predecessor_job["period"],
+                            ),
+                        ]
+                    # Raise lower bounds and lower upper bounds in place
+                    for time_bounds, bound_idx, bound in tightened_bounds:
+                        if (bound_idx == 0 and bound > time_bounds[0]) or (
+                            bound_idx == 1 and bound < time_bounds[1]
+                        ):
+                            time_bounds[bound_idx] = bound
+                            is_changed = True
+                    for job_name, time_bounds in [
+                        (successor_job_name, successor_bounds),
+                        (predecessor_job_name, completion_bounds),
+                    ]:
+                        if time_bounds[0] > time_bounds[1]:
+                            machine_windows[job_name] = {}
+                            return machine_windows
+
+        if not is_changed:
+            break
+
+    return machine_windows
+
+
+def time_domain_intervals(job, windows):
+    # Compute the intervals of the start time, completion time, and start time plus processing time of a job
+    # from its start time windows by the machines it can run on
+    intervals = {"start_time": [], "completion_time": [], "start+processing_time": []}
+    for machine_name, machine_windows in windows.items():
+        processing_time = job["processing_times"][machine_name]
+        for first_start_time, last_start_time in machine_windows:
+            wrap_time = (
+                job["period"]
+                if first_start_time + processing_time > job["period"]
+                else 0
+            )
+            intervals["start_time"].append([first_start_time, last_start_time])
+            intervals["completion_time"].append(
+                [
+                    first_start_time + processing_time - wrap_time,
+                    last_start_time + processing_time - wrap_time,
+                ]
+            )
+            intervals["start+processing_time"].append(
+                [first_start_time + processing_time, last_start_time + processing_time]
+            )
+    return intervals
+
+
+def interval_union_size(intervals):
+    # Count the values in the union of possibly overlapping [first, last] intervals
+    size = 0
+    last_counted = None
+    for first, last in sorted(intervals):
+        if last_counted is not None:
+            first = max(first, last_counted + 1)
+        if first <= last:
+            size += last - first + 1
+            last_counted = last
+    return size
+
+
+def screen_schedule(jobs, machines, is_schedule_periodic):
+    # Check necessary conditions for the schedule to be feasible without building a constraint model
+    # Every condition follows from the constraints of the model in schedule(), so an input that fails one is infeasible,
+    # while an input that passes all of them may still be infeasible
+    # Returns a list of reasons the input is infeasible and a list of warnings on machines that jobs cannot run on
+    infeasibilities = []
+    warnings = []
+    hyper_period = math.lcm(*[job["period"] for job in jobs.values()])
+
+    # Index of the first predecessor instance, see schedule() for the rationale of checking the previous period
+    predecessor_instance_start_idx = -1 if is_schedule_periodic else 0
+
+    # Find the machines each job can run on, along with the time it occupies the machine and the windows it can start in
+    eligible_machines = {}
+    for job_name, job in jobs.items():
+        eligible_machines[job_name] = {}
+        for machine_name, processing_time in job["processing_times"].items():
+            if machine_name not in machines.keys() or (
+                job["machine"] is not None and job["machine"] != machine_name
+            ):
+                continue
+            machine = machines[machine_name]
+            occupied_time = (
+                machine["setup_time"] + processing_time + machine["teardown_time"]
+            )
+            # In a periodic schedule a job must not overlap with its own next instance
+            if is_schedule_periodic and occupied_time > job["period"]:
+                warnings.append(
+                    f"Job {job_name} cannot run on machine {machine_name} as it occupies the machine for {occupied_time} which is more than its period {job['period']}!"
+                )
+                continue
+            windows = start_time_windows(job, processing_time)
+            if len(windows) == 0:
+                warnings.append(
+                    f"Job {job_name} cannot run on machine {machine_name} as its processing time {processing_time} does not fit within its release time, deadline, and specified start time or completion time!"
+                )
+                continue
+            eligible_machines[job_name][machine_name] = {
+                "processing_time": processing_time,
+                "occupied_time": occupied_time,
+                "windows": windows,
+            }
+        if len(eligible_machines[job_name]) == 0:
+            infeasibilities.append(f"Job {job_name} cannot run on any machine!")
+
+    # Jobs that cannot run on any machine make the remaining conditions moot
+    if len(infeasibilities) > 0:
+        return infeasibilities, warnings
+
+    # In a periodic schedule the instances of jobs on a machine cannot occupy it for more than the hyper-period
+    if is_schedule_periodic:
+        # Jobs that must run on the same machine are grouped together with a union-find, each job on its own is a group as well
+        groups = {job_name: job_name for job_name in jobs.keys()}
+
+        def find(job_name):
+            while groups[job_name] != job_name:
+                groups[job_name] = groups[groups[job_name]]
+                job_name = groups[job_name]
+            return job_name
+
+        for job_name, job in jobs.items():
+            for same_machine_job_name in job["same_machine_jobs"]:
+                groups[find(job_name)] = find(same_machine_job_name)
+
+        group_job_names = {}
+        for job_name in jobs.keys():
+            group_job_names.setdefault(find(job_name), []).append(job_name)
+
+        # Each group needs a common machine that its instances occupy for at most the hyper-period
+        # This also covers a single job with a single eligible machine
+        machine_forced_utilization = {machine_name: 0 for machine_name in machines}
+        for job_names in group_job_names.values():
+            common_machine_names = [
+                machine_name
+                for machine_name in machines.keys()
+                if all(
+                    machine_name in eligible_machines[job_name].keys()
+                    for job_name in job_names
+                )
+            ]
+            utilizations = {
+                machine_name: sum(
+                    eligible_machines[job_name][machine_name]["occupied_time"]
+                    * jobs[job_name]["instances"]
+                    for job_name in job_names
+                )
+                for machine_name in common_machine_names
+            }
+            if len(job_names) > 1 and len(common_machine_names) == 0:
+                infeasibilities.append(
+                    f"Jobs {job_names} must run on the same machine but have no machine in common!"
+                )
+            elif all(
+                utilization > hyper_period for utilization in utilizations.values()
+            ):
+                infeasibilities.append(
+                    f"Jobs {job_names} need at least {min(utilizations.values()) / hyper_period:.0%} of the machine they run on!"
+                )
+            # Groups with only one possible machine add up on that machine
+            elif len(common_machine_names) == 1:
+                machine_forced_utilization[common_machine_names[0]] += utilizations[
+                    common_machine_names[0]
+                ]
+
+        # The jobs on a pool are spread over its machines
+        for machine_name, utilization in machine_forced_utilization.items():
+            if utilization > machines[machine_name]["capacity"] * hyper_period:
+                infeasibilities.append(
+                    f"Jobs that can only run on machine {machine_name} need {utilization / hyper_period:.0%} of it!"
+                )
+
+        # All jobs together cannot occupy more than the hyper-period of every machine that any job can run on,
+        # even with each job on the machine it occupies for the least time, counting every machine of a pool
+        min_utilization = sum(
+            min(
+                eligible_machine["occupied_time"]
+                for eligible_machine in eligible_machines[job_name].values()
+            )
+            * job["instances"]
+            for job_name, job in jobs.items()
+        )
+        num_eligible_machines = sum(
+            machines[machine_name]["capacity"]
+            for machine_name in {
+                machine_name
+                for job_name in jobs.keys()
+                for machine_name in eligible_machines[job_name].keys()
+            }
+        )
+        if min_utilization > num_eligible_machines * hyper_period:
+            infeasibilities.append(
+                f"Jobs need at least {min_utilization / hyper_period:.2f} machines but can only run on {num_eligible_machines} machines!"
+            )
+
+    # Bound the start time and the completion time of each job from its start time windows
+    time_bounds = {}
+    for job_name, job in jobs.items():
+        start_times = []
+        completion_times = []
+        for eligible_machine in eligible_machines[job_name].values():
+            for first_start_time, last_start_time in eligible_machine["windows"]:
+                start_times += [first_start_time, last_start_time]
+                completion_times += [
+                    (start_time + eligible_machine["processing_time"] - 1)
+                    % job["period"]
+                    + 1
+                    for start_time in [first_start_time, last_start_time]
+                ]
+        time_bounds[job_name] = {
+            "start_time": (min(start_times), max(start_times)),
+            "completion_time": (min(completion_times), max(completion_times)),
+        }
+
+    # Every successor instance needs a predecessor instance completing within the offset window before it
+    # The first successor instance needs a predecessor instance completing early enough, starting from the first predecessor instance,
+    # and the last successor instance needs a predecessor instance completing late enough, up to the last predecessor instance
+    for successor_job_name, successor_job in jobs.items():
+        for predecessor_job_name, pred_characteristics in successor_job[
+            "predecessors"
+        ].items():
+            predecessor_job = jobs[predecessor_job_name]
+            first_completion_time, last_completion_time = time_bounds[
+                predecessor_job_name
+            ]["completion_time"]
+            for (
+                relation_name,
+                successor_time_key,
+                min_offset,
+                max_offset,
+            ) in predecessor_relations(pred_characteristics):
+                first_successor_time, last_successor_time = time_bounds[
+                    successor_job_name
+                ][successor_time_key]
+                if max_offset is not None and min_offset > max_offset:
+                    infeasibilities.append(
+                        f"Job {successor_job_name} has a {relation_name} with predecessor {predecessor_job_name} whose window is empty!"
+                    )
+                elif (
+                    first_completion_time
+                    + predecessor_instance_start_idx * predecessor_job["period"]
+                    + min_offset
+                    > last_successor_time
+                ):
+                    infeasibilities.append(
+                        f"Job {successor_job_name} has a {relation_name} with predecessor {predecessor_job_name} of {min_offset} which its {successor_time_key.replace('_', ' ')} of at most {last_successor_time} cannot satisfy!"
+                    )
+                elif (
+                    max_offset is not None
+                    and first_successor_time - successor_job["period"] - max_offset
+                    > last_completion_time - predecessor_job["period"]
+                ):
+                    infeasibilities.append(
+                        f"Job {successor_job_name} has a {relation_name} with predecessor {predecessor_job_name} of {max_offset} which its {successor_time_key.replace('_', ' ')} of at least {first_successor_time} cannot satisfy!"
+                    )
+
+    return infeasibilities, warnings
+
+
+def longest_divisor_within(n, min_divisor, max_divisor):
+    # Find the longest divisor of n within [min_divisor, max_divisor], or None if there is none
+    # Divisors are scanned from the longest, or their cofactors from the least if there are fewer of them, e.g. when n is not much longer than the range
+    min_cofactor = -(-n // max_divisor)
+    max_cofactor = n // min_divisor
+    if max_cofactor - min_cofactor < max_divisor - min_divisor:
+        return next(
+            (
+                n // cofactor
+                for cofactor in range(min_cofactor, max_cofactor + 1)
+                if n % cofactor == 0
+            ),
+            None,
+        )
+    return next(
+        (
+            divisor
+            for divisor in range(max_divisor, min_divisor - 1, -1)
+            if n % divisor == 0
+        ),
+        None,
+    )
+
+
+def multiples_within_range(base, period_range, max_multiple):
+    # Generate the multiples of base and of a period within the range in increasing order up to max_multiple, without repeats
+    # The multiples of each period are merged with a heap, which only holds the next multiple of each period
+    if period_range is None:
+        if base <= max_multiple:
+            yield base
+        return
+    steps = {
+        math.lcm(base, period) for period in range(period_range[0], period_range[1] + 1)
+    }
+    next_multiples = [(step, step) for step in steps if step <= max_multiple]
+    heapq.heapify(next_multiples)
+    last_multiple = None
+    while len(next_multiples) > 0:
+        multiple, step = next_multiples[0]
+        if multiple + step <= max_multiple:
+            heapq.heapreplace(next_multiples, (multiple + step, step))
+        else:
+            heapq.heappop(next_multiples)
+        if multiple != last_multiple:
+            last_multiple = multiple
+            yield multiple
+
+
+def harmonize_periods(jobs, machines, is_harmonic, max_hyper_period_candidates=100_000):
+    # Choose a period for every job with a min period within [min period, period] that minimizes the hyper-period
+    # The jobs must not need more time than all machines together in the hyper-period, even on the machine each occupies for the least time,
+    # and every job keeps its release time, deadline, and the time it occupies a machine within its period
+    # If is_harmonic is set, every period also divides every longer period, i.e. all periods lie on one harmonic period sequence of the hyper-period,
+    # see harmonic_period_sequences.py
+    # Every job has at least as long a period that divides the lcm of the periods chosen for a hyper-period, which needs no more time of the machines,
+    # so the least hyper-period is an lcm of one period from the range of every job, and candidates are checked in increasing order up to the hyper-period of the specified periods
+    # Each job is given the longest of its periods that divides the candidate, which needs the least time of the machines
+    # Returns the chosen period of every job with a period, or None if there are no such periods for a hyper-period up to the one of the specified periods
+    num_machines = sum(machine["capacity"] for machine in machines.values())
+
+    # Range of periods and least time occupying a machine of each job
+    period_ranges = {}
+    occupied_times = {}
+    for job_name, job in jobs.items():
+        if job["period"] is None:
+            continue
+        occupied_times[job_name] = min(
+            [
+                machines[machine_name]["setup_time"]
+                + processing_time
+                + machines[machine_name]["teardown_time"]
+                for machine_name, processing_time in job["processing_times"].items()
+                if machine_name in machines.keys()
+                and (job["machine"] is None or job["machine"] == machine_name)
+            ],
+            default=0,
+        )
+        min_period = job["period"]
+        if job.get("min_period") is not None:
+            min_period = max(
+                job["min_period"],
+                occupied_times[job_name],
+                job["deadline"] if job["deadline"] is not None else 0,
+                job["release_time"] + 1 if job["release_time"] is not None else 0,
+            )
+        period_ranges[job_name] = (min(min_period, job["period"]), job["period"])
+
+    fixed_periods = [
+        max_period
+        for min_period, max_period in period_ranges.values()
+        if min_period == max_period
+    ]
+    fixed_hyper_period = math.lcm(*fixed_periods)
+    specified_hyper_period = math.lcm(
+        *[max_period for _, max_period in period_ranges.values()]
+    )
+
+    def utilization(periods, hyper_period):
+        # Time the jobs need of the machines in the hyper-period
+        return sum(
+            occupied_times[job_name] * (hyper_period // period)
+            for job_name, period in periods.items()
+        )
+
+    # The jobs need the least time of the machines when every job runs with its longest period,
+    # so no periods fit if the specified periods do not
+    if (
+        utilization(
+            {
+                job_name: max_period
+                for job_name, (_, max_period) in period_ranges.items()
+            },
+            specified_hyper_period,
+        )
+        > num_machines * specified_hyper_period
+    ):
+        return None
+
+    # Every candidate is a multiple of the lcm of the fixed periods and of a period within the range of one job,
+    # which is the range whose multiples are the sparsest, so that the fewest candidates are generated
+    # As there can be as many candidates as the hyper-period of the specified periods, at most max_hyper_period_candidates are checked,
+    # followed by the hyper-period of the specified periods, which the specified periods always fit in unless they must be harmonic
+    variable_ranges = {
+        period_range
+        for period_range in period_ranges.values()
+        if period_range[0] < period_range[1]
+    }
+    candidate_range = min(
+        variable_ranges,
+        key=lambda period_range: sum(
+            1 / math.lcm(fixed_hyper_period, period)
+            for period in range(period_range[0], period_range[1] + 1)
+        ),
+        default=None,
+    )
+    candidates = itertools.islice(
+        multiples_within_range(
+            fixed_hyper_period, candidate_range, specified_hyper_period
+        ),
+        max_hyper_period_candidates,
+    )
+
+    for hyper_period in itertools.chain(candidates, [specified_hyper_period]):
+        # Longest period of each job that divides the candidate, found once for each range
+        range_periods = {}
+        periods = {}
+        for job_name, period_range in period_ranges.items():
+            if period_range not in range_periods.keys():
+                range_periods[period_range] = longest_divisor_within(
+                    hyper_period, *period_range
+                )
+            period = range_periods[period_range]
+            if period is None:
+                break
+            periods[job_name] = period
+        if len(periods) < len(period_ranges):
+            continue
+
+        if is_harmonic:
+            # Longest period of each job on each harmonic period sequence of the candidate, keeping the sequence that needs the least time
+            # Only the periods within the ranges of the jobs matter, so only the sequences of those periods are generated
+            from harmonic_period_sequences import harmonic_period_supersequences
+
+            harmonic_periods = None
+            for sequence in harmonic_period_supersequences(
+                hyper_period,
+                min(min_period for min_period, _ in period_ranges.values()),
+                max(max_period for _, max_period in period_ranges.values()),
+            ):
+                sequence_periods = {}
+                for job_name, (min_period, max_period) in period_ranges.items():
+                    period = max(
+                        [
+                            period
+                            for period in sequence
+                            if min_period <= period <= max_period
+                        ],
+                        default=None,
+                    )
+                    if period is None:
+                        break
+                    sequence_periods[job_name] = period
+                if len(sequence_periods) == len(period_ranges) and (
+                    harmonic_periods is None
+                    or utilization(sequence_periods, hyper_period)
+                    < utilization(harmonic_periods, hyper_period)
+                ):
+                    harmonic_periods = sequence_periods
+            if harmonic_periods is None:
+                continue
+            periods = harmonic_periods
+
+        if utilization(periods, hyper_period) <= num_machines * hyper_period:
+            return periods
+
+    return None
+
+
+def candidate_predecessor_instances(
+    predecessor_job,
+    predecessor_completion_bounds,
+    predecessor_instance_start_idx,
+    successor_job,
+    successor_time_bounds,
+    successor_instance_idx,
+    min_offset,
+    max_offset,
+):
+    # Find the predecessor instances that can complete within [successor time - max_offset, successor time - min_offset]
+    # of a successor instance, given bounds on the completion time of the predecessor and the successor time within their periods
+    # Instance i of the predecessor completes within its bounds plus i times its period, and likewise for the successor instance,
+    # so the candidate instances form a range that is computed directly instead of checking every instance
+    successor_time_offset = successor_instance_idx * successor_job["period"]
+    last_instance_idx = (
+        successor_time_bounds[1]
+        + successor_time_offset
+        - min_offset
+        - predecessor_completion_bounds[0]
+    ) // predecessor_job["period"]
+    first_instance_idx = predecessor_instance_start_idx
+    if max_offset is not None:
+        first_instance_idx = max(
+            first_instance_idx,
+            -(
+                -(
+                    successor_time_bounds[0]
+                    + successor_time_offset
+                    - max_offset
+                    - predecessor_completion_bounds[1]
+                )
+                // predecessor_job["period"]
+            ),
+        )
+    return range(
+        first_instance_idx, min(last_instance_idx, predecessor_job["instances"] - 1) + 1
+    )
+
+
+def add_indexed_precedence(
+    model,
+    successor_job_name,
+    successor_job,
+    successor_time_var,
+    predecessor_job_name,
+    predecessor_job,
+    predecessor_instance_start_idx,
+    min_offset,
+    max_offset,
+    relation_name,
+    enforcement_literals,
+):
+    # Require every successor instance to have a predecessor instance that completes within
+    # [successor time - max_offset, successor time - min_offset], where a max offset of None leaves the window unbounded below
+    # As both jobs are strictly periodic, the completion time of predecessor instance i is its completion time plus i times its period,
+    # so the predecessor instance can be selected with an integer index variable instead of a boolean variable for every instance pair
+    # The relation is only enforced if all enforcement literals are true
+    if max_offset is None:
+        # Without a lower bound on the window, if any predecessor instance satisfies the relation then the first one does
+        # and if the first successor instance is satisfied then so are the following ones
+        model.add(
+            predecessor_job["completion_time_var"]
+            + predecessor_instance_start_idx * predecessor_job["period"]
+            + min_offset
+            <= successor_time_var
+        ).only_enforce_if(enforcement_literals)
+        return
+
+    for successor_instance_idx in range(successor_job["instances"]):
+        # Index of the predecessor instance that satisfies the relation for the successor instance
+        predecessor_instance_idx_var = model.new_int_var(
+            predecessor_instance_start_idx,
+            predecessor_job["instances"] - 1,
+            f"successor_{successor_job_name}_instance_{successor_instance_idx}_predecessor_{predecessor_job_name}_{relation_name}_instance",
+        )
+        predecessor_completion_time = (
+            predecessor_job["completion_time_var"]
+            + predecessor_instance_idx_var * predecessor_job["period"]
+        )
+        successor_time = (
+            successor_time_var + successor_instance_idx * successor_job["period"]
+        )
+        if min_offset == max_offset:
+            model.add(
+                predecessor_completion_time + min_offset == successor_time
+            ).only_enforce_if(enforcement_literals)
+        else:
+            model.add(
+                predecessor_completion_time + min_offset <= successor_time
+            ).only_enforce_if(enforcement_literals)
+            model.add(
+                predecessor_completion_time + max_offset >= successor_time
+            ).only_enforce_if(enforcement_literals)
+
+
+def add_gcd_no_overlap(model, jobs, machines, machine_enforcement_literals):
+    # Ensure periodic jobs do not overlap on the same machine without creating an interval for every job instance
+    # The instances of job i occupy a machine for setup time + processing time + teardown time every period T_i
+    # Instances of jobs i and j can only start at offsets from each other that are congruent modulo gcd(T_i, T_j),
+    # so they never overlap if the offset of job j from job i modulo the gcd leaves room for job i before job j
+    # and for job j before the next instance of job i
+    # The constraints on a machine are only enforced if all of its enforcement literals are true
+    # Machine pools keep their intervals, as jobs on a pool only conflict once more of them overlap than the pool has machines
+    job_items = list(jobs.items())
+    for job_idx, (job_name, job) in enumerate(job_items):
+        # A job must not overlap with its own next instance
+        for machine_name, processing_time in job["processing_times"].items():
+            machine = machines[machine_name]
+            if machine["capacity"] > 1:
+                continue
+            occupied_time = (
+                machine["setup_time"] + processing_time + machine["teardown_time"]
+            )
+            if occupied_time > job["period"]:
+                model.add(job["machine_vars"][machine_name] == False).only_enforce_if(
+                    machine_enforcement_literals[machine_name]
+                )
+
+        for other_job_name, other_job in job_items[job_idx + 1 :]:
+            common_machine_names = [
+                machine_name
+                for machine_name in job["processing_times"].keys()
+                if machine_name in other_job["processing_times"].keys()
+                and machines[machine_name]["capacity"] == 1
+            ]
+            if len(common_machine_names) == 0:
+                continue
+
+            # Offset of the start of the other job from the start of the job modulo the gcd of their periods
+            # The job's period is added to keep the dividend positive, which does not change the modulo as it is a multiple of the gcd
+            gcd_period = math.gcd(job["period"], other_job["period"])
+            dividend_offset_var = model.new_int_var(
+                1,
+                job["period"] + other_job["period"] - 1,
+                f"job_{job_name}_job_{other_job_name}_dividend_offset",
+            )
+            model.add(
+                dividend_offset_var
+                == other_job["start_time_var"] - job["start_time_var"] + job["period"]
+            )
+            offset_var = model.new_int_var(
+                0, gcd_period - 1, f"job_{job_name}_job_{other_job_name}_offset"
+            )
+            model.add_modulo_equality(offset_var, dividend_offset_var, gcd_period)
+
+            for machine_name in common_machine_names:
+                machine = machines[machine_name]
+                occupied_time = (
+                    machine["setup_time"]
+                    + job["processing_times"][machine_name]
+                    + machine["teardown_time"]
+                )
+                other_occupied_time = (
+                    machine["setup_time"]
+                    + other_job["processing_times"][machine_name]
+                    + machine["teardown_time"]
+                )
+                both_on_machine = [
+                    job["machine_vars"][machine_name],
+                    other_job["machine_vars"][machine_name],
+                ]
+                # If the jobs do not fit within the gcd, then they cannot share the machine
+                if occupied_time + other_occupied_time > gcd_period:
+                    model.add_bool_or(
+                        [~machine_var for machine_var in both_on_machine]
+                    ).only_enforce_if(machine_enforcement_literals[machine_name])
+                else:
+                    model.add(offset_var >= occupied_time).only_enforce_if(
+                        both_on_machine + machine_enforcement_literals[machine_name]
+                    )
+                    model.add(
+                        offset_var <= gcd_period - other_occupied_time
+                    ).only_enforce_if(
+                        both_on_machine + machine_enforcement_literals[machine_name]
+                    )
+
+
+def diagnosis_literals_for(model, diagnosis_literals, name):
+    # Guard a group of constraints from the input, named after its toml key, with an assumption literal when diagnosing infeasibility
+    # Returns the enforcement literals of the group, which are empty if infeasibility is not diagnosed
+    if diagnosis_literals is None:
+        return []
+    if name not in diagnosis_literals.keys():
+        diagnosis_literals[name] = model.new_bool_var(f"assume_{name}")
+    return [diagnosis_literals[name]]
+
+
+def diagnose_infeasibility(model, solver, diagnosis_literals, minimize):
+    # Recover the groups of constraints whose assumptions are sufficient for the infeasibility of the last solve
+    # If minimize is set, each group of the conflict is dropped in turn and only kept if the others are not infeasible without it
+    # Returns the names of the conflicting groups
+    literal_names = {
+        literal.index: name for name, literal in diagnosis_literals.items()
+    }
+    conflict = [
+        literal_names[literal_idx]
+        for literal_idx in solver.sufficient_assumptions_for_infeasibility()
+    ]
+    if not minimize:
+        return conflict
+
+    # Only the feasibility of the remaining groups matters while minimizing
+    model.clear_objective()
+    for name in list(conflict):
+        if name not in conflict:
+            continue
+        remaining_names = [
+            conflict_name for conflict_name in conflict if conflict_name != name
+        ]
+        model.clear_assumptions()
+        model.add_assumptions(
+            [diagnosis_literals[remaining_name] for remaining_name in remaining_names]
+        )
+        solver.Solve(model)
+        # If the remaining groups are still infeasible, then continue with the conflict among them
+        if solver.status_name() == "INFEASIBLE":
+            sufficient_names = {
+                literal_names[literal_idx]
+                for literal_idx in solver.sufficient_assumptions_for_infeasibility()
+            }
+            conflict = [
+                remaining_name
+                for remaining_name in remaining_names
+                if remaining_name in sufficient_names
+            ]
+    return conflict
+
+
+def is_job_unchanged(job, previous_job):
+    # A job is unchanged if the characteristics that constrain its start time and machine are the same as in the previous schedule
+    # The previous schedule stores its values as strings, so compare against the string representation of each value
+    for key in [
+        "period",
+        "processing_times",
+        "release_time",
+        "deadline",
+        "same_machine_jobs",
+        "different_machine_jobs",
+    ]:
+        value = "" if job[key] is None else str(job[key])
+        if previous_job.get(key) != value:
+            return False
+
+    # Only compare the specified precedence relations, as the completion time wrt is output with its solved value
+    try:
+        previous_predecessors = ast.literal_eval(previous_job.get("predecessors", ""))
+    except (ValueError, SyntaxError):
+        return False
+    if not isinstance(previous_predecessors, dict) or set(
+        previous_predecessors.keys()
+    ) != set(job["predecessors"].keys()):
+        return False
+    for predecessor_job_name, pred_characteristics in job["predecessors"].items():
+        for key in ["start_time_wrt", "time_lag", "slack_time"]:
+            if previous_predecessors[predecessor_job_name].get(
+                key
+            ) != pred_characteristics.get(key):
+                return False
+
+    return True
+
+
+def identical_machine_classes(jobs, machines):
+    # Find classes of interchangeable machines, i.e. machines with the same characteristics on which every job has the same processing time
+    # Machines that a job is specified to run on are not interchangeable
+    specified_machine_names = {
+        job["machine"] for job in jobs.values() if job["machine"] is not None
+    }
+    machine_classes = {}
+    for machine_name, machine in machines.items():
+        if machine_name in specified_machine_names:
+            continue
+        machine_key = (
+            machine["speed"],
+            machine["setup_time"],
+            machine["teardown_time"],
+            machine["machine_weight"],
+            machine["capacity"],
+            tuple(job["processing_times"].get(machine_name) for job in jobs.values()),
+        )
+        machine_classes.setdefault(machine_key, []).append(machine_name)
+    return [
+        machine_class
+        for machine_class in machine_classes.values()
+        if len(machine_class) > 1
+    ]
+
+
+def identical_job_classes(jobs):
+    # Find classes of interchangeable jobs, i.e. jobs with the same characteristics that no other job refers to
+    # Jobs whose start time, completion time, or machine is specified are not interchangeable
+    referenced_job_names = set()
+    for job in jobs.values():
+        referenced_job_names |= set(job["predecessors"].keys())
+        referenced_job_names |= set(job["same_machine_jobs"])
+        referenced_job_names |= set(job["different_machine_jobs"])
+
+    job_classes = {}
+    for job_name, job in jobs.items():
+        if (
+            job_name in referenced_job_names
+            or job["start_time"] is not None
+            or job["completion_time"] is not None
+            or job["machine"] is not None
+        ):
+            continue
+        job_key = json.dumps(
+            without_variables(
+                {
+                    "period": job["period"],
+                    "processing_times": job["processing_times"],
+                    "release_time": job["release_time"],
+                    "deadline": job["deadline"],
+                    "completion_time_weight": job["completion_time_weight"],
+                    "flow_time_weight": job["flow_time_weight"],
+                    "earliness_weight": job["earliness_weight"],
+                    "predecessors": job["predecessors"],
+                    "same_machine_jobs": sorted(job["same_machine_jobs"]),
+                    "different_machine_jobs": sorted(job["different_machine_jobs"]),
+                }
+            ),
+            sort_keys=True,
+        )
+        job_classes.setdefault(job_key, []).append(job_name)
+    return [job_class for job_class in job_classes.values() if len(job_class) > 1]
+
+
+def add_symmetry_breaking(model, jobs, machines, machine_classes, job_classes):
+    # Only keep one of the schedules that are equivalent up to permuting identical machines or identical jobs
+    # Identical machines are used in order, and the first job assigned to a machine comes after the first job assigned to the previous machine
+    # Identical jobs start in order, which is compatible with the former as permuting machines does not change start times
+    for machine_class in machine_classes:
+        eligible_jobs = [
+            (job_name, job)
+            for job_name, job in jobs.items()
+            if machine_class[0] in job["processing_times"].keys()
+        ]
+        for machine_name, next_machine_name in zip(machine_class, machine_class[1:]):
+            model.add(
+                machines[machine_name]["is_utilized_var"]
+                >= machines[next_machine_name]["is_utilized_var"]
+            )
+
+            # Whether any job before a job in order is assigned to the machine
+            is_machine_used_before_var = model.new_constant(0)
+            for job_name, job in eligible_jobs:
+                model.add(
+                    job["machine_vars"][next_machine_name] <= is_machine_used_before_var
+                )
+                next_is_machine_used_before_var = model.new_bool_var(
+                    f"is_machine_{machine_name}_used_before_job_{job_name}"
+                )
+                model.add(
+                    next_is_machine_used_before_var
+                    <= is_machine_used_before_var + job["machine_vars"][machine_name]
+                )
+                is_machine_used_before_var = next_is_machine_used_before_var
+
+    for job_class in job_classes:
+        for job_name, next_job_name in zip(job_class, job_class[1:]):
+            model.add(
+                jobs[job_name]["start_time_var"]
+                <= jobs[next_job_name]["start_time_var"]
+            )
+
+
+def previous_schedule_hints(jobs, machines, previous_schedule, fix_unchanged_jobs):
+    # Recover the start time and machine of each job from a previous schedule output
+    # Jobs whose start time and machine are both specified need no hint
+    # If fix_unchanged_jobs is set, unchanged jobs have their start time and machine specified instead of hinted
+    # A job that ran on a machine of a pool is hinted to run on the pool
+    # Returns the hints by job name and the reasons for rejected hints
+    previous_jobs = {
+        previous_job["job"]: previous_job for previous_job in previous_schedule
+    }
+    pool_names = {
+        pool_machine_name: machine_name
+        for machine_name, machine in machines.items()
+        for pool_machine_name in machine["pool_machines"]
+    }
+    hints = {}
+    rejected_hints = []
+    for job_name, job in jobs.items():
+        if job["start_time"] is not None and job["machine"] is not None:
+            continue
+
+        if job_name not in previous_jobs.keys():
+            rejected_hints.append(f"Job {job_name} is not in the previous schedule!")
+            continue
+        previous_job = previous_jobs[job_name]
+
+        try:
+            start_time = int(previous_job["start_time"]) % job["period"]
+        except (KeyError, ValueError):
+            rejected_hints.append(
+                f"Job {job_name} does not have an integer start time in the previous schedule!"
+            )
+            continue
+
+        machine_name = pool_names.get(
+            previous_job.get("machine"), previous_job.get("machine")
+        )
+        if machine_name not in machines.keys():
+            rejected_hints.append(
+                f"Job {job_name} ran on machine {machine_name} in the previous schedule but that machine is not specified!"
+            )
+            continue
+        if machine_name not in job["processing_times"].keys():
+            rejected_hints.append(
+                f"Job {job_name} ran on machine {machine_name} in the previous schedule for which a processing time is not specified!"
+            )
+            continue
+        if job["machine"] is not None and job["machine"] != machine_name:
+            rejected_hints.append(
+                f"Job {job_name} ran on machine {machine_name} in the previous schedule but is specified to run on machine {job['machine']}!"
+            )
+            continue
+
+        if fix_unchanged_jobs and is_job_unchanged(job, previous_job):
+            if job["start_time"] is None and job["completion_time"] is None:
+                job["start_time"] = start_time
+            job["machine"] = machine_name
+            job["fixed_from_previous_schedule"] = True
+        hints[job_name] = (start_time, machine_name)
+
+    return hints, rejected_hints
+
+
+def remove_job_variables(jobs):
+    # Get rid of variables in our job dictionaries before output
+    for job_name, job in jobs.items():
+        job.pop("start_time_var", None)
+        job.pop("completion_time_var", None)
+        job.pop("machine_vars", None)
+        job.pop("processing_time_var", None)
+        job.pop("start+processing_time_var", None)
+        job.pop("flow_time_var", None)
+        job.pop("earliness_var", None)
+        for pred_characteristics in job["predecessors"].values():
+            pred_characteristics.pop("completion_time_wrt_var", None)
+            pred_characteristics.pop("dividend_completion_time_wrt_var", None)
+            pred_characteristics.pop("flow_time_wrt_var", None)
+            pred_characteristics.pop("earliness_wrt_var", None)
+
+        # Prepend the job name value under the job key for readability
+        jobs[job_name] = {"job": job_name} | jobs[job_name]
+
+    return jobs
+
+
+def default_cache_dir():
+    # Follow the XDG base directory specification for the cache
+    return os.path.join(
+        os.environ.get(
+            "XDG_CACHE_HOME", os.path.expanduser(os.path.join("~", ".cache"))
+        ),
+        "optimal-job-scheduling",
+    )
+
+
+def without_variables(value):
+    # Recursively copy a value, leaving out the variables of the model which are keyed by *_var or *_vars
+    if isinstance(value, dict):
+        return {
+            key: without_variables(item)
+            for key, item in value.items()
+            if not (key.endswith("_var") or key.endswith("_vars"))
+        }
+    if isinstance(value, list):
+        return [without_variables(item) for item in value]
+    return value
+
+
+def schedule_cache_key(schedule_input, previous_schedule, fix_unchanged_jobs):
+    # Hash the input with its defaults populated, including the solver parameters,
+    # along with everything else that influences the result of the solve
+    key_input = {
+        "schedule_input": without_variables(schedule_input),
+        "previous_schedule": previous_schedule,
+        "fix_unchanged_jobs": fix_unchanged_jobs,
+        "ortools": importlib.metadata.version("ortools"),
+    }
+    return hashlib.sha256(
+        json.dumps(key_input, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def read_schedule_cache(cache_dir, cache_key):
+    cache_path = os.path.join(cache_dir, f"{cache_key}.json")
+    try:
+        with open(cache_path) as cache_file:
+            cache_entry = json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+    # Mark the entry as recently used for the least recently used eviction
+    os.utime(cache_path)
+    return cache_entry
+
+
+def write_schedule_cache(cache_dir, cache_key, cache_entry, cache_max_size):
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # Write to a temporary file first so that concurrent readers never see a partial entry
+    cache_path = os.path.join(cache_dir, f"{cache_key}.json")
+    temporary_cache_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temporary_cache_path, "w") as cache_file:
+        json.dump(cache_entry, cache_file)
+    os.replace(temporary_cache_path, cache_path)
+
+    # Evict the least recently used entries until the cache fits within its max size
+    cache_entries = []
+    for cache_entry_name in os.listdir(cache_dir):
+        if not cache_entry_name.endswith(".json"):
+            continue
+        try:
+            cache_entry_stat = os.stat(os.path.join(cache_dir, cache_entry_name))
+        except OSError:
+            continue
+        cache_entries.append(
+            (cache_entry_stat.st_mtime, cache_entry_stat.st_size, cache_entry_name)
+        )
+    cache_size = sum(cache_entry_size for _, cache_entry_size, _ in cache_entries)
+    for _, cache_entry_size, cache_entry_name in sorted(cache_entries):
+        if cache_size <= cache_max_size:
+            break
+        try:
+            os.remove(os.path.join(cache_dir, cache_entry_name))
+        except OSError:
+            continue
+        cache_size -= cache_entry_size
+
+
+def phase_start(model=None):
+    # Mark the start of a phase by the time and the size of the model so far
+    if model is None:
+        return (time.perf_counter(), 0, 0)
+    return (
+        time.perf_counter(),
+        len(model.proto.variables),
+        len(model.proto.constraints),
+    )
+
+
+def model_additions(model, start):
+    # Count the variables and constraints added to the model since the start of a phase
+    # Boolean variables are the integer variables with the domain [0, 1]
+    variables = model.proto.variables[start[1] :]
+    bool_vars = sum(1 for variable in variables if list(variable.domain) == [0, 1])
+    constraints = model.proto.constraints[start[2] :]
+    intervals = sum(1 for constraint in constraints if constraint.HasField("interval"))
+    return {
+        "int_vars": len(variables) - bool_vars,
+        "bool_vars": bool_vars,
+        "intervals": intervals,
+        "constraints": len(constraints) - intervals,
+    }
+
+
+def record_phase(stats, phase_name, start, model=None):
+    # Record the wall time of a phase and, once the model is being built, its additions to the model
+    if stats is not None:
+        phase = {"phase": phase_name, "time": time.perf_counter() - start[0]}
+        if model is not None:
+            phase |= model_additions(model, start)
+        stats.setdefault("phases", []).append(phase)
+    return phase_start(model)
+
+
+def record_predecessor_relation(
+    stats, successor_job_name, predecessor_job_name, relation_name, start, model
+):
+    # Record the wall time and model additions of a precedence relation between two jobs if it was specified
+    if stats is not None:
+        additions = model_additions(model, start)
+        if any(count > 0 for count in additions.values()):
+            stats.setdefault("predecessor_relations", []).append(
+                {
+                    "successor": successor_job_name,
+                    "predecessor": predecessor_job_name,
+                    "relation": relation_name,
+                    "time": time.perf_counter() - start[0],
+                }
+                | additions
+            )
+    return phase_start(model)
+
+
+def solution_progress_callback(
+    cp_model,
+    stats,
+    jobs=None,
+    on_solution=None,
+    stall_time=None,
+    machines=None,
+    is_schedule_periodic=True,
+):
+    # Create a solution callback that records the wall time, objective, and bound of every solution found
+    # If on_solution is given, it is called with a copy of the schedule of every solution found and its progress as soon as the solution is found,
+    # unless the jobs on a machine pool cannot be assigned to its machines, see retrieve_solution()
+    # If stall_time is given, the search stops once no better solution has been found for stall_time seconds since the last one
+    # OR-Tools is passed in as it is only imported once a model is built
+    class SolutionProgressCallback(cp_model.CpSolverSolutionCallback):
+        def __init__(self):
+            super().__init__()
+            self.num_solutions = 0
+            self.stall_timer = None
+
+        def on_solution_callback(self):
+            self.num_solutions += 1
+            progress = {
+                "solution": self.num_solutions,
+                "wall_time": self.wall_time,
+                "objective": self.objective_value,
+                "best_objective_bound": self.best_objective_bound,
+            }
+            if stats is not None:
+                stats.setdefault("solutions", []).append(
+                    {
+                        "wall_time": progress["wall_time"],
+                        "objective": progress["objective"],
+                        "best_objective_bound": progress["best_objective_bound"],
+                    }
+                )
+            if (
+                on_solution is not None
+                and len(retrieve_solution(self, jobs, machines, is_schedule_periodic))
+                == 0
+            ):
+                on_solution(solution_snapshot(jobs), progress)
+
+            # Restart the stall timer, which stops the search from another thread once it runs out
+            if stall_time is not None:
+                self.stop_stall_timer()
+                self.stall_timer = threading.Timer(stall_time, self.stop_search)
+                self.stall_timer.daemon = True
+                self.stall_timer.start()
+
+        def stop_stall_timer(self):
+            # A stall timer left running would stop the next solve with this callback
+            if self.stall_timer is not None:
+                self.stall_timer.cancel()
+                self.stall_timer = None
+
+    return SolutionProgressCallback()
+
+
+def solve(model, solver, solution_callback):
+    # Solve the model and return the status, stopping the stall timer of the solution callback once the solve is done
+    solver.Solve(model, solution_callback)
+    if solution_callback is not None:
+        solution_callback.stop_stall_timer()
+    return solver.status_name()
+
+
+def presolve_time(solver_log):
+    # Recover the presolve time from the search log as the time between starting presolve and starting search
+    # With interleave_search, as in solver_parameters.toml, the search is logged as a deterministic search
+    presolve_start_time = None
+    for line in solver_log:
+        for log_line in line.splitlines():
+            presolve_match = re.match(r"^Starting presolve at (\S+)s", log_line)
+            search_match = re.match(
+                r"^Starting (deterministic )?search at (\S+)s", log_line
+            )
+            if presolve_match is not None:
+                presolve_start_time = float(presolve_match.group(1))
+            elif search_match is not None and presolve_start_time is not None:
+                return float(search_match.group(2)) - presolve_start_time
+    return None
+
+
+def retrieve_solution(solver, jobs, machines=None, is_schedule_periodic=True):
+    # Fill in the solved fields of each job from the last solution of the solver, or from the current solution of a solution callback
+    # If machines are given, the jobs on each machine pool are assigned to as many of its machines as are utilized, see assign_pool_machines()
+    # Returns the names of the pools whose jobs cannot be assigned to their machines
+    for job_name, job in jobs.items():
+        job["start_time"] = solver.value(job["start_time_var"])
+        job["completion_time"] = solver.value(job["completion_time_var"])
+        # Recover the machine, the job is assigned on
+        for machine_name, machine_var in job["machine_vars"].items():
+            if solver.value(machine_var) == True:
+                job["machine"] = machine_name
+        job["processing_time"] = solver.value(job["processing_time_var"])
+        job["flow_time"] = (
+            solver.value(job["flow_time_var"])
+            if job["flow_time_var"] is not None
+            else None
+        )
+        job["earliness"] = (
+            solver.value(job["earliness_var"])
+            if job["earliness_var"] is not None
+            else None
+        )
+        for pred_characteristics in job["predecessors"].values():
+            pred_characteristics["completion_time_wrt"] = (
+                solver.value(pred_characteristics["completion_time_wrt_var"])
+                if pred_characteristics["completion_time_wrt_var"] is not None
+                else None
+            )
+
+    if machines is None:
+        return []
+    return assign_pool_machines(
+        jobs,
+        machines,
+        is_schedule_periodic,
+        {
+            machine_name: solver.value(machine["utilized_machines_var"])
+            for machine_name, machine in machines.items()
+            if machine["capacity"] > 1
+        },
+    )
+
+
+def solution_snapshot(jobs):
+    # Copy the schedule of the solved fields of each job, formatted as the output of schedule()
+    return {
+        job_name: {"job": job_name} | without_variables(job)
+        for job_name, job in jobs.items()
+    }
+
+
+def hint_solution(model, solver):
+    # Hint every variable with its value in the last solution of the solver, so that the next solve starts from it
+    model.clear_hints()
+    for variable_idx, value in enumerate(solver.response_proto.solution):
+        model.proto.solution_hint.vars.append(variable_idx)
+        model.proto.solution_hint.values.append(value)
+
+
+def solve_lexicographic(
+    model, solver, objective_names, objective_exprs, solution_callback, stages
+):
+    # Minimize each objective in order of priority, bounding it by the best value found before minimizing the next one
+    # Every solve after the first is hinted with the solution of the previous solve
+    # The name, status, value, and wall time of each solve are appended to stages
+    # Returns the status of the last solve and the constraints bounding the objectives, so that they can be cleared
+    bound_constraints = []
+    for objective_idx, (objective_name, objective_expr) in enumerate(
+        zip(objective_names, objective_exprs)
+    ):
+        model.minimize(objective_expr)
+        status_name = solve(model, solver, solution_callback)
+        is_feasible = status_name == "OPTIMAL" or status_name == "FEASIBLE"
+        stages.append(
+            {
+                "objective": objective_name,
+                "status": status_name,
+                "value": solver.objective_value if is_feasible else None,
+                "wall_time": solver.wall_time,
+            }
+        )
+        if not is_feasible or objective_idx == len(objective_exprs) - 1:
+            return status_name, bound_constraints
+
+        bound_constraints.append(
+            model.add(objective_expr <= round(solver.objective_value))
+        )
+        hint_solution(model, solver)
+
+
+def solve_pareto_front(
+    model,
+    solver,
+    objective_names,
+    objective_exprs,
+    max_points,
+    solution_callback,
+    stages,
+    on_point,
+):
+    # Enumerate the Pareto front of two objectives with the epsilon-constraint method
+    # Each point minimizes the second objective and then the first objective, with the first objective bounded below its value in the previous point,
+    # starting from the point with the least second objective and ending with the point with the least first objective
+    # Every point is hinted with the solution of the previous point, and on_point is called with the values of both objectives once it is solved
+    # Returns the status of the front, which is only optimal if every point is optimal and the front is complete
+    first_expr, second_expr = objective_exprs
+    is_front_optimal = True
+    for point_idx in range(max_points):
+        status_name, bound_constraints = solve_lexicographic(
+            model,
+            solver,
+            objective_names[::-1],
+            [second_expr, first_expr],
+            solution_callback,
+            stages,
+        )
+        # The front ends once the first objective cannot be improved any further
+        if status_name != "OPTIMAL" and status_name != "FEASIBLE":
+            if point_idx == 0:
+                return status_name
+            return (
+                "OPTIMAL"
+                if is_front_optimal and status_name == "INFEASIBLE"
+                else "FEASIBLE"
+            )
+        is_front_optimal = is_front_optimal and all(
+            stage["status"] == "OPTIMAL" for stage in stages[-2:]
+        )
+
+        first_value = round(solver.objective_value)
+        on_point(first_value, round(solver.value(second_expr)))
+
+        # Release the bound on the second objective and require the first objective to improve on this point
+        for bound_constraint in bound_constraints:
+            bound_constraint.proto.Clear()
+        hint_solution(model, solver)
+        model.add(first_expr <= first_value - 1)
+
+    # Too many points to enumerate the whole front
+    return "FEASIBLE"
+
+
+def write_schedule(jobs, schedule_file):
+    # Output solution formatted as csv
+    job_characteristics = list(jobs.values())[0].keys()
+    writer = csv.DictWriter(schedule_file, fieldnames=job_characteristics)
+    writer.writeheader()
+    writer.writerows(jobs.values())
+
+
+def schedule(
+    schedule_input,
+    verify_only=False,
+    stats=None,
+    previous_schedule=None,
+    fix_unchanged_jobs=False,
+    cache_dir=None,
+    refresh_cache=False,
+    cache_max_size=100_000_000,
+    cache_nondeterministic=False,
+    diagnose=False,
+    minimize_diagnosis=False,
+    pareto_front=None,
+    on_solution=None,
+    model_state=None,
+):
+    # TODO: Describe input in detail for each field in doc
+    # i.e. possible values, default values
+
+    # If model_state is given, the model is only built and stored in it to be solved with solve_model_state(), see Scheduler
+    # Every group of constraints from the input is then guarded by a literal as when diagnosing, so that it can be toggled between solves
+    # Raises ScheduleInputError if the input is not valid
+
+    start = phase_start()
+
+    check_input_tables(schedule_input)
+
+    # Keep a copy of an input with machine pools to solve again with their machines modeled separately, see solve_model_state()
+    pool_input = (
+        copy.deepcopy(schedule_input)
+        if any(
+            isinstance(machine, dict) and machine.get("capacity", 1) != 1
+            for machine in schedule_input.get("machines", {}).values()
+        )
+        else None
+    )
+
+    # Populate periodic key if not specified
+    if "periodic" not in schedule_input.keys():
+        schedule_input["periodic"] = True
+
+    # Populate num_machines_weight key if not specified
+    if "num_machines_weight" not in schedule_input.keys():
+        schedule_input["num_machines_weight"] = 0
+
+    # Populate precedence_encoding key if not specified
+    # "pairs" uses a boolean variable for every pair of successor and predecessor instances
+    # "index" uses an integer variable selecting the predecessor instance for every successor instance
+    if "precedence_encoding" not in schedule_input.keys():
+        schedule_input["precedence_encoding"] = "pairs"
+
+    # Populate no_overlap_encoding key if not specified
+    # "intervals" creates an interval for every job instance on every machine in the hyper-period
+    # "gcd" constrains the start times of every pair of jobs modulo the gcd of their periods
+    if "no_overlap_encoding" not in schedule_input.keys():
+        schedule_input["no_overlap_encoding"] = "intervals"
+
+    # Populate symmetry_breaking key if not specified
+    # Symmetries between identical machines and identical jobs are broken unless disabled
+    if "symmetry_breaking" not in schedule_input.keys():
+        schedule_input["symmetry_breaking"] = True
+
+    # Populate objective_mode key if not specified
+    # "weighted" minimizes the weighted sum of all objectives
+    # "lexicographic" minimizes the objectives one after the other in order of priority, keeping the optimum of each
+    # "pareto" enumerates the Pareto front of two objectives
+    if "objective_mode" not in schedule_input.keys():
+        schedule_input["objective_mode"] = "weighted"
+
+    # Populate objectives key if not specified
+    # The objectives in order of priority for the lexicographic and pareto objective modes, each keeps its weights
+    if "objectives" not in schedule_input.keys():
+        schedule_input["objectives"] = []
+
+    # Populate max_pareto_points key if not specified
+    if "max_pareto_points" not in schedule_input.keys():
+        schedule_input["max_pareto_points"] = 100
+
+    # Populate stop_gap key if not specified
+    # Stop solving once the gap between the objective and its best bound is below this percentage of the objective
+    if "stop_gap" not in schedule_input.keys():
+        schedule_input["stop_gap"] = None
+
+    # Populate stop_stall_time key if not specified
+    # Stop solving once no better solution has been found for this many seconds since the last one
+    if "stop_stall_time" not in schedule_input.keys():
+        schedule_input["stop_stall_time"] = None
+
+    # Populate period_harmonization key if not specified
+    # "none" keeps the period of every job
+    # "lcm" chooses the period of every job with a min period to minimize the hyper-period, see harmonize_periods()
+    # "harmonic" chooses harmonic periods, i.e. every period divides every longer period, to minimize the hyper-period
+    if "period_harmonization" not in schedule_input.keys():
+        schedule_input["period_harmonization"] = "none"
+
+    # Populate domain_tightening key if not specified
+    # The domains of the start time and completion time variables are tightened by propagating bounds unless disabled
+    if "domain_tightening" not in schedule_input.keys():
+        schedule_input["domain_tightening"] = True
+
+    # Populate screening key if not specified
+    # Necessary conditions for feasibility are checked before building the model unless disabled
+    if "screening" not in schedule_input.keys():
+        schedule_input["screening"] = True
+
+    # Populate greedy_schedule key if not specified
+    # "none" leaves the solver to find a first schedule
+    # "hint" hints the solver with a schedule constructed greedily, see construct_greedy_schedule()
+    # "only" outputs the schedule constructed greedily without solving
+    if "greedy_schedule" not in schedule_input.keys():
+        schedule_input["greedy_schedule"] = "none"
+
+    # Populate machines with a single machine if not specified
+    if "machines" not in schedule_input.keys():
+        schedule_input["machines"] = {"machine": {}}
+
+    # Check that at least one job is specified
+    if "jobs" not in schedule_input.keys() or len(schedule_input["jobs"]) == 0:
+        raise ScheduleInputError(["No jobs specified!"])
+
+    # Parse in periodic, num_machines_weight, objective_mode, objectives, max_pareto_points, stop_gap, stop_stall_time, precedence_encoding, no_overlap_encoding, symmetry_breaking, period_harmonization, domain_tightening, screening, greedy_schedule, machines, and jobs from schedule input
+    is_schedule_periodic = schedule_input["periodic"]
+    num_machines_weight = schedule_input["num_machines_weight"]
+    objective_mode = schedule_input["objective_mode"]
+    objectives = schedule_input["objectives"]
+    max_pareto_points = schedule_input["max_pareto_points"]
+    stop_gap = schedule_input["stop_gap"]
+    stop_stall_time = schedule_input["stop_stall_time"]
+    precedence_encoding = schedule_input["precedence_encoding"]
+    no_overlap_encoding = schedule_input["no_overlap_encoding"]
+    symmetry_breaking = schedule_input["symmetry_breaking"]
+    period_harmonization = schedule_input["period_harmonization"]
+    domain_tightening = schedule_input["domain_tightening"]
+    screening = schedule_input["screening"]
+    greedy_schedule = schedule_input["greedy_schedule"]
+    machines = schedule_input["machines"]
+    jobs = schedule_input["jobs"]
+
+    # Set default values and variables to solve for machines
+    for machine_name, machine in machines.items():
+        if "speed" not in machine.keys():
+            machine["speed"] = 1
+        if "setup_time" not in machine.keys():
+            machine["setup_time"] = 0
+        if "teardown_time" not in machine.keys():
+            machine["teardown_time"] = 0
+        if "machine_weight" not in machine.keys():
+            machine["machine_weight"] = 0
+        # A machine with a capacity of more than one is a pool of identical machines, see pool_machine_names()
+        if "capacity" not in machine.keys():
+            machine["capacity"] = 1
+        machine["pool_machines"] = pool_machine_names(machine_name, machine)
+        # Variable to check for job overlap
+        machine["interval_vars"] = []
+        # Variable to check for job overlap within groups of same machine jobs on a pool, by job name
+        machine["job_interval_vars"] = {}
+        # Variable to keep track if the machine has any jobs assigned to it
+        machine["is_utilized_var"] = None
+        # Variable to keep track of the number of machines of a pool that are utilized, which is the capacity its intervals are limited to
+        machine["utilized_machines_var"] = None
+
+    # The min period of a job is only populated if any job specifies one, so that the output has the same columns as without period harmonization
+    has_min_periods = any("min_period" in job.keys() for job in jobs.values())
+
+    for job in jobs.values():
+        # Create processing times based on input processing times and machine input
+        if "processing_times" not in job.keys():
+            job["processing_times"] = 1
+        # If input processing times is integer, apply that processing time to all machines
+        if isinstance(job["processing_times"], int):
+            processing_time = job["processing_times"]
+            job["processing_times"] = {
+                machine_name: processing_time for machine_name in machines.keys()
+            }
+
+        if "period" not in job.keys():
+            job["period"] = None
+        # The job may run with a period as short as its min period when periods are harmonized
+        if has_min_periods and "min_period" not in job.keys():
+            job["min_period"] = None
+        if "start_time" not in job.keys():
+            job["start_time"] = None
+        if "completion_time" not in job.keys():
+            job["completion_time"] = None
+        if "machine" not in job.keys():
+            job["machine"] = None
+        if "same_machine_jobs" not in job.keys():
+            job["same_machine_jobs"] = []
+        # If a string specified, convert to list
+        elif isinstance(job["same_machine_jobs"], str):
+            job["same_machine_jobs"] = [job["same_machine_jobs"]]
+        if "different_machine_jobs" not in job.keys():
+            job["different_machine_jobs"] = []
+        # If a string specified, convert to list
+        elif isinstance(job["different_machine_jobs"], str):
+            job["different_machine_jobs"] = [job["different_machine_jobs"]]
+        if "release_time" not in job.keys():
+            job["release_time"] = None
+        if "deadline" not in job.keys():
+            job["deadline"] = None
+        if "completion_time_weight" not in job.keys():
+            job["completion_time_weight"] = 0
+        if "flow_time_weight" not in job.keys():
+            job["flow_time_weight"] = 0
+        if "earliness_weight" not in job.keys():
+            job["earliness_weight"] = 0
+
+        if "predecessors" not in job.keys():
+            job["predecessors"] = {}
+        for pred_job_name, pred_characteristics in job["predecessors"].items():
+            if "start_time_wrt" not in pred_characteristics.keys():
+                pred_characteristics["start_time_wrt"] = None
+            if "completion_time_wrt" not in pred_characteristics.keys():
+                pred_characteristics["completion_time_wrt"] = None
+            if "time_lag" not in pred_characteristics.keys():
+                pred_characteristics["time_lag"] = None
+            if "slack_time" not in pred_characteristics.keys():
+                pred_characteristics["slack_time"] = None
+            if "completion_time_wrt_weight" not in pred_characteristics.keys():
+                pred_characteristics["completion_time_wrt_weight"] = 0
+            if "flow_time_wrt_weight" not in pred_characteristics.keys():
+                pred_characteristics["flow_time_wrt_weight"] = 0
+            if "earliness_wrt_weight" not in pred_characteristics.keys():
+                pred_characteristics["earliness_wrt_weight"] = 0
+            # Variables to solve for
+            pred_characteristics["completion_time_wrt_var"] = None
+            pred_characteristics["flow_time_wrt_var"] = None
+            pred_characteristics["earliness_wrt_var"] = None
+
+        # Variables to solve for
+        job |= {
+            "start_time_var": None,
+            "machine_vars": {},
+            "processing_time_var": None,
+            "start+processing_time_var": None,
+            "completion_time_var": None,
+        }
+
+    start = record_phase(stats, "defaults", start)
+
+    # Read solver parameters if they exist
+    if "solver" not in schedule_input.keys():
+        solver_parameters = {}
+    elif "parameters" not in schedule_input["solver"].keys():
+        solver_parameters = {}
+    else:
+        solver_parameters = schedule_input["solver"]["parameters"]
+
+    # Errors found while checking the input, which are raised together once the input is checked
+    input_errors = []
+
+    # Ensure that the objective mode is known and that its objectives are
+    objective_names = [
+        "completion_time",
+        "flow_time",
+        "earliness",
+        "completion_time_wrt",
+        "num_machines",
+        "machine_weight",
+    ]
+    if objective_mode not in ["weighted", "lexicographic", "pareto"]:
+        input_errors.append(
+            f"Objective mode {objective_mode} is not one of weighted, lexicographic, or pareto!"
+        )
+    elif objective_mode != "weighted":
+        for objective_name in objectives:
+            if objective_name not in objective_names:
+                input_errors.append(
+                    f"Objective {objective_name} is not one of {', '.join(objective_names)}!"
+                )
+        if len(objectives) == 0 or len(set(objectives)) != len(objectives):
+            input_errors.append(
+                f"The {objective_mode} objective mode needs distinct objectives in order of priority!"
+            )
+        elif objective_mode == "pareto" and len(objectives) != 2:
+            input_errors.append(
+                "The pareto objective mode needs exactly two objectives!"
+            )
+
+    # Ensure that the stop conditions are positive
+    if stop_gap is not None and stop_gap < 0:
+        input_errors.append(f"Stop gap {stop_gap} is negative!")
+    if stop_stall_time is not None and stop_stall_time <= 0:
+        input_errors.append(f"Stop stall time {stop_stall_time} is not positive!")
+
+    # Ensure that the precedence encoding is known
+    if precedence_encoding not in ["pairs", "index"]:
+        input_errors.append(
+            f"Precedence encoding {precedence_encoding} is not one of pairs or index!"
+        )
+
+    # Ensure that the no overlap encoding is known and applicable
+    if no_overlap_encoding not in ["intervals", "gcd"]:
+        input_errors.append(
+            f"No overlap encoding {no_overlap_encoding} is not one of intervals or gcd!"
+        )
+    elif no_overlap_encoding == "gcd" and not is_schedule_periodic:
+        input_errors.append(
+            f"The gcd no overlap encoding is only applicable to periodic schedules!"
+        )
+
+    # Ensure that the period harmonization is known and applicable
+    if period_harmonization not in ["none", "lcm", "harmonic"]:
+        input_errors.append(
+            f"Period harmonization {period_harmonization} is not one of none, lcm, or harmonic!"
+        )
+    elif period_harmonization != "none" and not is_schedule_periodic:
+        input_errors.append(
+            "Period harmonization is only applicable to periodic schedules!"
+        )
+
+    # Ensure that the greedy schedule is known
+    if greedy_schedule not in ["none", "hint", "only"]:
+        input_errors.append(
+            f"Greedy schedule {greedy_schedule} is not one of none, hint, or only!"
+        )
+
+    # Ensure that the capacity of each machine is a positive integer and that the machines of a pool are not named as other machines
+    for machine_name, machine in machines.items():
+        if not isinstance(machine["capacity"], int) or machine["capacity"] < 1:
+            input_errors.append(
+                f"Machine {machine_name} has capacity {machine['capacity']} which is not a positive integer!"
+            )
+        for pool_machine_name in machine["pool_machines"]:
+            if pool_machine_name in machines.keys():
+                input_errors.append(
+                    f"Machine {pool_machine_name} of pool {machine_name} has the same name as another machine!"
+                )
+
+    # Keep track of the jobs whose machine is specified, as opposed to inferred from the machines it can run on
+    specified_machine_job_names = {
+        job_name for job_name, job in jobs.items() if job["machine"] is not None
+    }
+
+    # Ensure that a job can run on the machine specified
+    for job_name, job in jobs.items():
+        if job["machine"] is not None:
+            # If the machine is specified, make sure the machine exists
+            if job["machine"] not in machines.keys():
+                input_errors.append(
+                    f"Job {job_name} is specified to run on machine {job['machine']} but that machine is not specified!"
+                )
+
+            # If the machine is specified, key off the machine in the processing times
+            if job["machine"] not in job["processing_times"].keys():
+                input_errors.append(
+                    f"Job {job_name} is specified to run on machine {job['machine']} for which a processing time is not specified!"
+                )
+        # If the machine is not specified
+        else:
+            # If there is only one machine and if there is a processing time associated with it, then job must run on that machine
+            if len(machines) == 1:
+                machine_name = list(machines.keys())[0]
+                if machine_name in job["processing_times"].keys():
+                    job["machine"] = machine_name
+                else:
+                    input_errors.append(
+                        f"Job {job_name} is not specified to run on the sole machine {machine_name}!"
+                    )
+            # If there is only one machine/processing time pair specified, then job must run on that machine if machine exists
+            if len(job["processing_times"]) == 1:
+                processing_machine = list(job["processing_times"].keys())[0]
+                if processing_machine in machines.keys():
+                    job["machine"] = processing_machine
+                else:
+                    input_errors.append(
+                        f"Job {job_name} is specified to run on machine {processing_machine} but that machine is not specified!"
+                    )
+
+    # Ensure that same machine jobs, different machine jobs, and predecessors have been specified
+    for job_name, job in jobs.items():
+        for same_machine_job_name in job["same_machine_jobs"]:
+            if same_machine_job_name not in jobs.keys():
+                input_errors.append(
+                    f"Job {job_name} is specified to run on the same machine as job {same_machine_job_name} which does not exist!"
+                )
+        for different_machine_job_name in job["different_machine_jobs"]:
+            if different_machine_job_name not in jobs.keys():
+                input_errors.append(
+                    f"Job {job_name} is specified to run on a different machine from job {different_machine_job_name} which does not exist!"
+                )
+        for predecessor_job_name in job["predecessors"].keys():
+            if predecessor_job_name not in jobs.keys():
+                input_errors.append(
+                    f"Job {job_name} has predecessor, {predecessor_job_name}, that does not exist!"
+                )
+
+    # Ensure that at least one job has its period specified
+    if all([job["period"] is None for job in jobs.values()]):
+        input_errors.append(
+            f"At least one job must have its period specified! For non-periodic scheduling simply, treat the period as the max time for your schedule."
+        )
+
+    # Ensure that the min period of a job is positive and not longer than its period
+    for job_name, job in jobs.items():
+        if job.get("min_period") is None:
+            continue
+        if job["period"] is None:
+            input_errors.append(
+                f"Job {job_name} has a min period but no period to run with at most!"
+            )
+        elif job["min_period"] < 1 or job["min_period"] > job["period"]:
+            input_errors.append(
+                f"Job {job_name} has min period {job['min_period']} which is not within [1, {job['period']}]!"
+            )
+
+    # Choose the periods of jobs with a min period to minimize the hyper-period before building the model,
+    # which is reported along with how much smaller the hyper-period is
+    if period_harmonization != "none" and len(input_errors) == 0:
+        specified_hyper_period = math.lcm(
+            *[job["period"] for job in jobs.values() if job["period"] is not None]
+        )
+        harmonized_periods = harmonize_periods(
+            jobs, machines, period_harmonization == "harmonic"
+        )
+        if harmonized_periods is None:
+            input_errors.append(
+                f"No {'harmonic ' if period_harmonization == 'harmonic' else ''}periods within the min periods and periods of the jobs fit on the machines with a hyper-period of at most {specified_hyper_period}!"
+            )
+        else:
+            for job_name, period in harmonized_periods.items():
+                jobs[job_name]["period"] = period
+            harmonized_hyper_period = math.lcm(*harmonized_periods.values())
+            changed_periods = {
+                job_name: period
+                for job_name, period in harmonized_periods.items()
+                if jobs[job_name].get("min_period") is not None
+            }
+            print(
+                f"Period harmonization chose periods {changed_periods} and reduced the hyper-period from {specified_hyper_period} to {harmonized_hyper_period} by a factor of {specified_hyper_period / harmonized_hyper_period:.2f}.",
+                file=sys.stderr,
+            )
+            if stats is not None:
+                stats["period_harmonization"] = {
+                    "periods": changed_periods,
+                    "specified_hyper_period": specified_hyper_period,
+                    "hyper_period": harmonized_hyper_period,
+                    "reduction_factor": specified_hyper_period
+                    / harmonized_hyper_period,
+                }
+
+    # Compute the hyper-period of the schedule
+    periods = [job["period"] for job in jobs.values() if job["period"] is not None]
+    hyper_period = math.lcm(*periods)
+
+    # Assign the period of jobs that have none as the hyper-period
+    # and obtain the number of instances for each job in the hyper-period
+    for job in jobs.values():
+        if job["period"] is None:
+            job["period"] = hyper_period
+        job["instances"] = hyper_period // job["period"]
+
+    # Ensure that all jobs have the same period (aka max time) if periodic is false
+    first_job_period = list(jobs.values())[0]["period"]
+    if not is_schedule_periodic:
+        if not all([job["period"] == first_job_period for job in jobs.values()]):
+            input_errors.append(
+                f"For non-periodic schedules, the periods of each job, if specified, must be the same! At least one period must be specified, you can treat this as the max time for your schedule."
+            )
+
+    if len(input_errors) > 0:
+        raise ScheduleInputError(input_errors)
+
+    start = record_phase(stats, "validation", start)
+
+    # Recover hints from the previous schedule, fixing unchanged jobs if requested
+    hints = {}
+    if previous_schedule is not None:
+        hints, rejected_hints = previous_schedule_hints(
+            jobs, machines, previous_schedule, fix_unchanged_jobs
+        )
+        for rejected_hint in rejected_hints:
+            print(rejected_hint, file=sys.stderr)
+        fixed_jobs = [
+            job_name
+            for job_name, job in jobs.items()
+            if job.pop("fixed_from_previous_schedule", False)
+        ]
+        specified_machine_job_names |= set(fixed_jobs)
+        print(
+            f"Kept {len(hints)} hints and rejected {len(rejected_hints)} hints from the previous schedule, fixed {len(fixed_jobs)} unchanged jobs.",
+            file=sys.stderr,
+        )
+        if stats is not None:
+            stats["hints_kept"] = len(hints)
+            stats["hints_rejected"] = len(rejected_hints)
+            stats["jobs_fixed"] = len(fixed_jobs)
+        start = record_phase(stats, "hints", start)
+
+    # If start times or completion times and machines are specified for all jobs, then verify the schedule directly
+    # This avoids building and solving a model just to check the input schedule
+    if is_schedule_fully_specified(jobs) and model_state is None:
+        violations = verify_schedule(jobs, machines, is_schedule_periodic)
+        start = record_phase(stats, "verification", start)
+        for violation in violations:
+            print(violation, file=sys.stderr)
+        if stats is not None:
+            stats["status"] = "INFEASIBLE" if len(violations) > 0 else "FEASIBLE"
+            stats["objective"] = None
+        if len(violations) > 0:
+            print("Input is not feasible!", file=sys.stderr)
+            return None
+
+        print("Input schedule is feasible.", file=sys.stderr)
+        return remove_job_variables(jobs)
+
+    # Construct a schedule greedily around the specified and hinted jobs if requested, reporting every constraint it violates
+    # The schedule is either the output, with the solved fields of each job filled in by verifying it, or a complete hint for the solver
+    if greedy_schedule != "none" and not verify_only:
+        greedy_start_time = time.perf_counter()
+        greedy_placements = construct_greedy_schedule(
+            jobs, machines, is_schedule_periodic, hints
+        )
+        greedy_wall_time = time.perf_counter() - greedy_start_time
+        greedy_jobs = jobs if greedy_schedule == "only" else copy.deepcopy(jobs)
+        for job_name, (start_time, machine_name) in greedy_placements.items():
+            greedy_jobs[job_name]["start_time"] = start_time
+            greedy_jobs[job_name]["machine"] = machine_name
+        violations = verify_schedule(greedy_jobs, machines, is_schedule_periodic)
+        start = record_phase(stats, "greedy_schedule", start)
+        for violation in violations:
+            print(violation, file=sys.stderr)
+        print(
+            f"Greedy schedule of {len(greedy_placements)} jobs constructed in {greedy_wall_time:.3f} seconds violates {len(violations)} constraints.",
+            file=sys.stderr,
+        )
+        if stats is not None:
+            stats["greedy_schedule"] = {
+                "wall_time": greedy_wall_time,
+                "violations": violations,
+            }
+        if greedy_schedule == "only":
+            # A greedy schedule that violates constraints does not prove that the input is infeasible
+            if stats is not None:
+                stats["status"] = "FEASIBLE" if len(violations) == 0 else "UNKNOWN"
+                stats["objective"] = None
+            return remove_job_variables(jobs)
+        hints = hints | {
+            job_name: placement
+            for job_name, placement in greedy_placements.items()
+            if job_name not in hints.keys()
+        }
+
+    # If only verification is requested, then every job must be fully specified
+    if verify_only:
+        raise ScheduleInputError(
+            [
+                f"Job {job_name} does not have its start time or completion time and its machine specified!"
+                for job_name, job in jobs.items()
+                if (job["start_time"] is None and job["completion_time"] is None)
+                or job["machine"] is None
+            ]
+        )
+
+    # Reject inputs that fail a necessary condition for feasibility before paying for building and solving the model
+    # e.g. jobs that need more than a machine's capacity or release times and deadlines that leave no room for the processing time
+    # Not when only building the model, as the constraints screened for can still be changed
+    if screening and model_state is None:
+        infeasibilities, warnings = screen_schedule(
+            jobs, machines, is_schedule_periodic
+        )
+        start = record_phase(stats, "screening", start)
+        for warning in warnings:
+            print(warning, file=sys.stderr)
+        for infeasibility in infeasibilities:
+            print(infeasibility, file=sys.stderr)
+        if stats is not None:
+            stats["screening"] = {
+                "infeasibilities": infeasibilities,
+                "warnings": warnings,
+            }
+        if len(infeasibilities) > 0:
+            if stats is not None:
+                stats["status"] = "INFEASIBLE"
+                stats["objective"] = None
+            print("Input is not feasible!", file=sys.stderr)
+            return None
+
+    # Look up the result of a previous solve of the same input
+    # Only deterministic solves are cached unless requested otherwise, i.e. with a single worker
+    # The diagnosis of an infeasible input is not cached as the cache only keeps the status, and neither is a Pareto front
+    cache_key = None
+    if (
+        not diagnose
+        and model_state is None
+        and objective_mode != "pareto"
+        and cache_dir is not None
+        and (cache_nondeterministic or solver_parameters.get("num_workers") == 1)
+    ):
+        cache_key = schedule_cache_key(
+            schedule_input, previous_schedule, fix_unchanged_jobs
+        )
+        cache_entry = (
+            None if refresh_cache else read_schedule_cache(cache_dir, cache_key)
+        )
+        if cache_entry is not None:
+            print("Using cached result of the same input.", file=sys.stderr)
+            if stats is not None:
+                stats["status"] = cache_entry["status"]
+                stats["objective"] = cache_entry["objective"]
+                stats["cached"] = True
+            if cache_entry["jobs"] is None:
+                print("Input is not feasible!", file=sys.stderr)
+                return None
+            print("Feasible schedule found.", file=sys.stderr)
+            return {job["job"]: job for job in cache_entry["jobs"]}
+        start = record_phase(stats, "cache", start)
+
+    # Tighten the domains of the start time and completion time of each job by propagating bounds from its release time, deadline,
+    # specified start time or completion time, processing times, and precedence relations
+    # Not when diagnosing infeasibility or only building the model, as the tightened domains would enforce constraints that are guarded by literals
+    time_windows = None
+    if domain_tightening and not (
+        diagnose or minimize_diagnosis or model_state is not None
+    ):
+        time_windows = tighten_time_domains(jobs, machines, is_schedule_periodic)
+        start = record_phase(stats, "domain_tightening", start)
+        unschedulable_job_names = [
+            job_name
+            for job_name, windows in time_windows.items()
+            if all(len(machine_windows) == 0 for machine_windows in windows.values())
+        ]
+        if len(unschedulable_job_names) > 0:
+            print(
+                f"Jobs {unschedulable_job_names} have no start time satisfying their release times, deadlines, and precedence relations!",
+                file=sys.stderr,
+            )
+            if stats is not None:
+                stats["status"] = "INFEASIBLE"
+                stats["objective"] = None
+            print("Input is not feasible!", file=sys.stderr)
+            return None
+
+        # Report how many start times of jobs were ruled out
+        start_time_values_before = sum(
+            job["period"] for job in jobs.values() if job["start_time"] is None
+        )
+        start_time_values = sum(
+            interval_union_size(
+                time_domain_intervals(job, time_windows[job_name])["start_time"]
+            )
+            for job_name, job in jobs.items()
+            if job["start_time"] is None
+        )
+        print(
+            f"Domain tightening reduced the start times of jobs from {start_time_values_before} to {start_time_values} values.",
+            file=sys.stderr,
+        )
+        if stats is not None:
+            stats["domain_tightening"] = {
+                "start_time_values_before": start_time_values_before,
+                "start_time_values": start_time_values,
+            }
+
+    # For periodic schedules ensure we check with intervals before the 1st period
+    # This allows us to check for interval overlaps with jobs starting in the previous period, but wrapping around to the current period
+    interval_instance_start_idx = -1 if is_schedule_periodic else 0
+
+    # For periodic schedules ensure we check with predecessors before the 1st period
+    # This allows us to check for precedence relations with the previous period
+    predecessor_instance_start_idx = -1 if is_schedule_periodic else 0
+
+    # Import OR-Tools only once a model is built, so that verifying a fully specified schedule does not pay for it
+    from ortools.sat.python import cp_model
+
+    build_start_time = time.perf_counter()
+
+    model = cp_model.CpModel()
+    start = phase_start(model)
+
+    # When diagnosing infeasibility, every group of constraints from the input is guarded by an assumption literal keyed by its name
+    # Groups that are always satisfiable on their own, e.g. assigning a job to exactly one machine, are not guarded
+    diagnosis_literals = (
+        {} if diagnose or minimize_diagnosis or model_state is not None else None
+    )
+
+    # Bounds on the start time and completion time of each job within its period, used to prune predecessor instance pairs
+    time_bounds = {}
+
+    for job_name, job in jobs.items():
+        # Intervals of the variables of the job, which are tightened to its start time windows if requested
+        if time_windows is None:
+            intervals = {
+                "start_time": [[0, job["period"] - 1]],
+                "completion_time": [[1, job["period"]]],
+                "start+processing_time": [[0, 2 * job["period"] - 1]],
+            }
+        else:
+            intervals = time_domain_intervals(job, time_windows[job_name])
+        time_bounds[job_name] = {
+            key: (
+                min(interval[0] for interval in intervals[key]),
+                max(interval[1] for interval in intervals[key]),
+            )
+            for key in ["start_time", "completion_time"]
+        }
+
+        # Ensure the job starts within its period
+        if job["start_time"] is None or diagnosis_literals is not None:
+            job["start_time_var"] = model.new_int_var_from_domain(
+                cp_model.Domain.from_intervals(intervals["start_time"]),
+                f"job_{job_name}_start_time",
+            )
+        # If the start time is specified then ensure the start time is respected
+        # Handle values outside of the first period via module with the job's period
+        else:
+            job["start_time_var"] = model.new_constant(
+                job["start_time"] % job["period"]
+            )
+        # When diagnosing infeasibility, the specified start time is a constraint that can be part of a conflict
+        if job["start_time"] is not None and diagnosis_literals is not None:
+            model.add(
+                job["start_time_var"] == job["start_time"] % job["period"]
+            ).only_enforce_if(
+                diagnosis_literals_for(
+                    model, diagnosis_literals, f"jobs.{job_name}.start_time"
+                )
+            )
+
+        # Define the completion time variable that handles a job wrapping around its period with a modulo equality
+        if job["completion_time"] is None or diagnosis_literals is not None:
+            job["completion_time_var"] = model.new_int_var_from_domain(
+                cp_model.Domain.from_intervals(intervals["completion_time"]),
+                f"job_{job_name}_completion_time",
+            )
+        # If the completion time is specified then ensure the completion time is respected
+        # Handle values outside of the first period via module with the job's period
+        # Since completion time is defined as [1, job's period] modify the modulo output
+        # to give job's period when the result would be 0 (outside of the range)
+        else:
+            job["completion_time_var"] = model.new_constant(
+                job["completion_time"] % job["period"]
+                if job["completion_time"] % job["period"] != 0
+                else job["period"]
+            )
+        if job["completion_time"] is not None and diagnosis_literals is not None:
+            model.add(
+                job["completion_time_var"]
+                == (
+                    job["completion_time"] % job["period"]
+                    if job["completion_time"] % job["period"] != 0
+                    else job["period"]
+                )
+            ).only_enforce_if(
+                diagnosis_literals_for(
+                    model, diagnosis_literals, f"jobs.{job_name}.completion_time"
+                )
+            )
+
+        # Ensure the release time and deadline are respected
+        # Release time and deadline are defined as a time within the job's period
+        # Handle values outside of the first period via module with the job's period
+        if job["release_time"] is not None:
+            model.add(
+                job["start_time_var"] >= job["release_time"] % job["period"]
+            ).only_enforce_if(
+                diagnosis_literals_for(
+                    model, diagnosis_literals, f"jobs.{job_name}.release_time"
+                )
+            )
+
+        if job["deadline"] is not None:
+            # Note that we use job["completion_time_var"] and not job["start+processing_time_var"]
+            # since the deadline is defined within the period
+            # Since completion time is defined as [1, job's period] modify the modulo output
+            # to give job's period when the result would be 0 (outside of the range)
+            model.add(
+                job["completion_time_var"]
+                <= (
+                    job["deadline"] % job["period"]
+                    if job["deadline"] % job["period"] != 0
+                    else job["period"]
+                )
+            ).only_enforce_if(
+                diagnosis_literals_for(
+                    model, diagnosis_literals, f"jobs.{job_name}.deadline"
+                )
+            )
+
+        # Constraints on assigning the job to a machine
+        # Boolean variable to determine if job is assigned on that machine
+        for machine_name in machines.keys():
+            job["machine_vars"][machine_name] = model.new_bool_var(
+                f"job_{job_name}_assigned_on_machine_{machine_name}"
+            )
+
+        # Ensure the job runs only on one machine
+        model.add_exactly_one(list(job["machine_vars"].values()))
+
+        # If the machine is specified then ensure the job runs on that machine
+        # A machine inferred from the processing times already follows from them and is not guarded when diagnosing
+        if job["machine"] is not None:
+            model.add(job["machine_vars"][job["machine"]] == True).only_enforce_if(
+                diagnosis_literals_for(
+                    model, diagnosis_literals, f"jobs.{job_name}.machine"
+                )
+                if job_name in specified_machine_job_names
+                else []
+            )
+
+        # If job has no processing time for a machine, ensure the job cannot be assigned to that machine
+        # The same goes for machines on which the job has no start time window left after tightening
+        for machine_name in machines.keys():
+            if not machine_name in job["processing_times"] or (
+                time_windows is not None
+                and len(time_windows[job_name].get(machine_name, [])) == 0
+            ):
+                model.add(job["machine_vars"][machine_name] == False)
+
+        # Create a domain variable for processing time with possible processing times for the job
+        processing_time_domain = cp_model.Domain.from_values(
+            list(job["processing_times"].values())
+        )
+        job["processing_time_var"] = model.new_int_var_from_domain(
+            processing_time_domain, f"job_{job_name}_processing_time"
+        )
+
+        # Determine the processing time of a job based on the machine it is run on
+        for machine_name, processing_time in job["processing_times"].items():
+            model.add(job["processing_time_var"] == processing_time).only_enforce_if(
+                job["machine_vars"][machine_name]
+            )
+
+        # Create a variable to represent the sum of start time and processing time to use in future constraints
+        # Note: It is important to understand when to use job["start_time_var"] + job["processing_time_var"] vs job["completion_time_var"]
+        # as both represent the completion time, but the first represents the completion time of the job that has started in the current period,
+        # while the second one represents the completion time of the job that started in the previous period
+        # The upper bound is 2 times the job's period minus 1 as remember this variable can overrun the current period.
+        # However if it overruns 2 periods, then the job will overlap with another instance of itself.
+        job["start+processing_time_var"] = model.new_int_var_from_domain(
+            cp_model.Domain.from_intervals(intervals["start+processing_time"]),
+            f"job_{job_name}_start+processing_time",
+        )
+        model.add(
+            job["start+processing_time_var"]
+            == job["start_time_var"] + job["processing_time_var"]
+        )
+
+        # Ensure the completion time is equal to start time plus processing time, while accounting for wrapping around the start of its period
+        model.add_modulo_equality(
+            job["completion_time_var"],
+            job["start+processing_time_var"],
+            job["period"],
+        )
+
+    start = record_phase(stats, "variables", start, model)
+
+    # Guard the no overlap of each machine when diagnosing infeasibility
+    machine_enforcement_literals = {
+        machine_name: diagnosis_literals_for(
+            model, diagnosis_literals, f"machines.{machine_name}"
+        )
+        for machine_name in machines.keys()
+    }
+
+    # Create a job interval for every job instance on every potential machine accounting for setup time and teardown time
+    # The gcd no overlap encoding constrains jobs pairwise instead, see add_gcd_no_overlap(), except on machine pools
+    # A machine pool has a single interval for every job instance no matter its capacity
+    for job_name, job in jobs.items():
+        for machine_name, processing_time in job["processing_times"].items():
+            # Recover the machine for machine setup time and teardown time
+            machine = machines[machine_name]
+            if no_overlap_encoding == "gcd" and machine["capacity"] == 1:
+                continue
+
+            # No overlap constraints cannot be enforced by literals,
+            # so when diagnosing infeasibility the intervals are only present if the job is on the machine and its no overlap is assumed
+            is_present_var = job["machine_vars"][machine_name]
+            if len(machine_enforcement_literals[machine_name]) > 0:
+                is_present_var = model.new_bool_var(
+                    f"machine_{machine_name}_job_{job_name}_interval_present"
+                )
+                model.add_bool_and(
+                    [job["machine_vars"][machine_name]]
+                    + machine_enforcement_literals[machine_name]
+                ).only_enforce_if(is_present_var)
+                model.add_bool_or(
+                    [~job["machine_vars"][machine_name]]
+                    + [
+                        ~literal
+                        for literal in machine_enforcement_literals[machine_name]
+                    ]
+                    + [is_present_var]
+                )
+
+            # The capacity of a pool lets the instances of a job overlap with each other, but they run on the same machine of the pool,
+            # so a job cannot run on a pool that it occupies for more than its period
+            if (
+                machine["capacity"] > 1
+                and machine["setup_time"] + processing_time + machine["teardown_time"]
+                > job["period"]
+            ):
+                model.add(job["machine_vars"][machine_name] == False).only_enforce_if(
+                    machine_enforcement_literals[machine_name]
+                )
+
+            # Make job intervals optional on what machine they are scheduled on
+            for instance_idx in range(interval_instance_start_idx, job["instances"]):
+                machine_job_instance_interval_var = model.new_optional_interval_var(
+                    job["start_time_var"]
+                    + instance_idx * job["period"]
+                    - machine["setup_time"],
+                    machine["setup_time"] + processing_time + machine["teardown_time"],
+                    job["start_time_var"]
+                    + processing_time
+                    + instance_idx * job["period"]
+                    + machine["teardown_time"],
+                    is_present_var,
+                    f"machine_{machine_name}_job_{job_name}_instance_{instance_idx}_interval",
+                )
+
+                # Add job instance interval var to the machine's interval vars
+                machine["interval_vars"].append(machine_job_instance_interval_var)
+                if machine["capacity"] > 1:
+                    machine["job_interval_vars"].setdefault(job_name, []).append(
+                        machine_job_instance_interval_var
+                    )
+
+    start = record_phase(stats, "intervals", start, model)
+
+    # Hint the start time and machine of each job from the previous schedule
+    for job_name, (start_time, machine_name) in hints.items():
+        job = jobs[job_name]
+        if job["start_time"] is None:
+            model.add_hint(job["start_time_var"], start_time)
+        for hint_machine_name, machine_var in job["machine_vars"].items():
+            model.add_hint(machine_var, hint_machine_name == machine_name)
+
+    start = record_phase(stats, "solution_hints", start, model)
+
+    # Add no overlap for intervals on the same machine
+    # At most as many intervals on a machine pool overlap as the number of its machines that are utilized,
+    # which is only a variable if the number of machines is minimized and otherwise the capacity of the pool
+    # The jobs on a pool are assigned to its machines once solved, see assign_pool_machines()
+    for machine_name, machine in machines.items():
+        if machine["capacity"] > 1:
+            machine["utilized_machines_var"] = (
+                model.new_int_var(
+                    0,
+                    machine["capacity"],
+                    f"pool_{machine_name}_utilized_machines",
+                )
+                if num_machines_weight != 0 or machine["machine_weight"] != 0
+                else model.new_constant(machine["capacity"])
+            )
+            model.add_cumulative(
+                machine["interval_vars"],
+                [1] * len(machine["interval_vars"]),
+                machine["utilized_machines_var"],
+            )
+        elif no_overlap_encoding == "intervals":
+            model.add_no_overlap(machine["interval_vars"])
+    if no_overlap_encoding == "gcd":
+        add_gcd_no_overlap(model, jobs, machines, machine_enforcement_literals)
+
+        # Report the number of interval variables that the interval encoding would have created
+        intervals_avoided = sum(
+            len(
+                [
+                    machine_name
+                    for machine_name in job["processing_times"].keys()
+                    if machines[machine_name]["capacity"] == 1
+                ]
+            )
+            * (job["instances"] - interval_instance_start_idx)
+            for job in jobs.values()
+        )
+        print(
+            f"Gcd no overlap encoding avoided {intervals_avoided} interval variables.",
+            file=sys.stderr,
+        )
+        if stats is not None:
+            stats["intervals_avoided"] = intervals_avoided
+
+    start = record_phase(stats, "no_overlap", start, model)
+
+    # Determine if a machine is utilized
+    # Used for number of machine minimization
+    for machine_name, machine in machines.items():
+        machine["is_utilized_var"] = model.new_bool_var(
+            f"is_machine_{machine_name}_utilized"
+        )
+        # If the number of jobs on a machine is greater than 0, then the machine is utilized
+        model.add(
+            sum(job["machine_vars"][machine_name] for job in jobs.values()) > 0
+        ).only_enforce_if(machine["is_utilized_var"])
+        # If the number of jobs on a machine is equal than 0, then the machine is not utilized
+        model.add(
+            sum(job["machine_vars"][machine_name] for job in jobs.values()) == 0
+        ).only_enforce_if(~machine["is_utilized_var"])
+        # A machine that is not a pool is a single machine that is utilized or not
+        if machine["capacity"] == 1:
+            machine["utilized_machines_var"] = machine["is_utilized_var"]
+
+    start = record_phase(stats, "machine_utilization", start, model)
+
+    # Break symmetries between identical machines and identical jobs
+    # Not when diagnosing infeasibility or only building the model, as dropping or changing the constraints of one of the identical jobs breaks their symmetry
+    if symmetry_breaking and diagnosis_literals is None:
+        machine_classes = identical_machine_classes(jobs, machines)
+        job_classes = identical_job_classes(jobs)
+        add_symmetry_breaking(model, jobs, machines, machine_classes, job_classes)
+        if len(machine_classes) > 0 or len(job_classes) > 0:
+            print(
+                f"Breaking symmetries of {len(machine_classes)} classes of identical machines {machine_classes} and {len(job_classes)} classes of identical jobs {job_classes}.",
+                file=sys.stderr,
+            )
+        if stats is not None:
+            stats["symmetry_classes"] = {
+                "machines": machine_classes,
+                "jobs": job_classes,
+            }
+
+    start = record_phase(stats, "symmetry_breaking", start, model)
+
+    # Ensure the same/different machine job constraints are respected
+    for job_name, job in jobs.items():
+        for same_machine_job_name in job["same_machine_jobs"]:
+            # Recover same machine job
+            same_machine_job = jobs[same_machine_job_name]
+            # Ensure that the machine vars for coincident machines align for both jobs
+            # If the job is not specified to run on any of the same machines as the same machine job then exit
+            at_least_one_common_machine = False
+            same_machine_enforcement_literals = diagnosis_literals_for(
+                model,
+                diagnosis_literals,
+                f"jobs.{job_name}.same_machine_jobs.{same_machine_job_name}",
+            )
+            for machine_name, machine_var in job["machine_vars"].items():
+                if machine_name in same_machine_job["processing_times"]:
+                    model.add(
+                        machine_var == same_machine_job["machine_vars"][machine_name]
+                    ).only_enforce_if(same_machine_enforcement_literals)
+                    at_least_one_common_machine = True
+            if at_least_one_common_machine == False:
+                raise ScheduleInputError(
+                    [
+                        f"Job {job_name} is not specified to run on any of the same machines that job {same_machine_job_name} is specified for!"
+                    ]
+                )
+
+        for different_machine_job_name in job["different_machine_jobs"]:
+            # Recover different machine job
+            different_machine_job = jobs[different_machine_job_name]
+            different_machine_enforcement_literals = diagnosis_literals_for(
+                model,
+                diagnosis_literals,
+                f"jobs.{job_name}.different_machine_jobs.{different_machine_job_name}",
+            )
+            # Ensure that the machine vars for coincident machines do not align for both jobs
+            # Both jobs can run on a pool as long as they are assigned to different machines of it, see assign_pool_machines()
+            for machine_name, machine_var in job["machine_vars"].items():
+                if (
+                    machine_name in different_machine_job["processing_times"]
+                    and machines[machine_name]["capacity"] == 1
+                ):
+                    model.add(
+                        machine_var
+                        != different_machine_job["machine_vars"][machine_name]
+                    ).only_enforce_if(
+                        [machine_var] + different_machine_enforcement_literals
+                    )
+
+    # Jobs that must run on the same machine of a pool must not overlap with each other either,
+    # so the instances of each group of same machine jobs on a pool do not overlap
+    # Not guarded when diagnosing infeasibility, as no overlap constraints cannot be enforced by literals
+    same_machine_groups = {job_name: job_name for job_name in jobs.keys()}
+
+    def find_same_machine_group(job_name):
+        while same_machine_groups[job_name] != job_name:
+            same_machine_groups[job_name] = same_machine_groups[
+                same_machine_groups[job_name]
+            ]
+            job_name = same_machine_groups[job_name]
+        return job_name
+
+    for job_name, job in jobs.items():
+        for same_machine_job_name in job["same_machine_jobs"]:
+            same_machine_groups[find_same_machine_group(job_name)] = (
+                find_same_machine_group(same_machine_job_name)
+            )
+    same_machine_group_job_names = {}
+    for job_name in jobs.keys():
+        same_machine_group_job_names.setdefault(
+            find_same_machine_group(job_name), []
+        ).append(job_name)
+    for machine in machines.values():
+        if machine["capacity"] == 1:
+            continue
+        for job_names in same_machine_group_job_names.values():
+            group_interval_vars = [
+                machine["job_interval_vars"][job_name]
+                for job_name in job_names
+                if job_name in machine["job_interval_vars"].keys()
+            ]
+            if len(group_interval_vars) > 1:
+                model.add_no_overlap(
+                    [
+                        interval_var
+                        for interval_vars in group_interval_vars
+                        for interval_var in interval_vars
+                    ]
+                )
+
+    start = record_phase(stats, "same_different_machine", start, model)
+
+    # Precedence of jobs running at different periods can be hard to reason about.
+    # The following rationale for time lags and slack times is used here, where we do not discuss the different periods between the predecessor and successor, but rather focus on if for all successor job instances of any predecessor job instance satisfy the constraint. If so, then the precedence relationship is respected.
+    # Time Lag: The time lag precedence relationship means that a successor job can only start a certain time lag after the predecessor job has completed. In the periodic case, for all successor job instances, if any instance of the predecessor job has completed before the time lag but after a previous successor job instance, then the precedence relationship has been met. This logic can be simplified to only check the immediate predecessor. Note the additional clause to check only the immediate     predecessor job instance and not any before. This ensures that we are not checking the first predecessor job instance, which would trivially satisfy the constraint for all successor job instances thereafter. Also note the following, resulting from the logic above. A job with a smaller period cannot be a successor to a job with a higher period.
+    # Slack Time: While it may be harder to comprehend, the slack time constraint is simpler to implement. The slack time precedence relationship means that a successor job must start within the slack time after the predecessor job has finished. In the periodic case, for all successor job instances, if any predecessor job instance is within the slack time and occurs before the successor job instance, then the slack time precedence relationship has been met.
+
+    # Count the predecessor instance pairs of the pairs encoding and the ones that can satisfy their relation
+    predecessor_pairs = 0
+    candidate_predecessor_pairs = 0
+
+    # To add precedence constraints run a second pass through the jobs
+    # to ensure all the jobs' start time and processing time variables have been created
+    # These contraints need to look through all predecessor instances to ensure that at least one predecessor instance satisfies the constraint for each successor instance in the hyper-period
+    # If a job specifies a time lag and a slack time for the same predecessor job,
+    # an additional constraint is added that ensures the time lag and slack time constraints are both applied on the same predecessor instance
+    for successor_job_name, successor_job in jobs.items():
+        for predecessor_job_name, pred_characteristics in successor_job[
+            "predecessors"
+        ].items():
+            # Get the predecessor job and its characteristics
+            predecessor_job = jobs[predecessor_job_name]
+            start_time_wrt = pred_characteristics.get("start_time_wrt")
+            completion_time_wrt = pred_characteristics.get("completion_time_wrt")
+            time_lag = pred_characteristics.get("time_lag")
+            slack_time = pred_characteristics.get("slack_time")
+
+            # Keep track of the model additions of each precedence relation for profiling
+            relation_start = phase_start(model)
+
+            # Ensure the start time of the successor job with respect to the completion time of the predecessor is respected
+            if start_time_wrt is not None:
+                relation_enforcement_literals = diagnosis_literals_for(
+                    model,
+                    diagnosis_literals,
+                    f"jobs.{successor_job_name}.predecessors.{predecessor_job_name}.start_time_wrt",
+                )
+
+                # Define the start time with respect to variable as the specified start time with respect to
+                pred_characteristics["start_time_wrt_var"] = model.new_constant(
+                    start_time_wrt
+                )
+
+                if precedence_encoding == "index":
+                    add_indexed_precedence(
+                        model,
+                        successor_job_name,
+                        successor_job,
+                        successor_job["start_time_var"],
+                        predecessor_job_name,
+                        predecessor_job,
+                        predecessor_instance_start_idx,
+                        start_time_wrt,
+                        start_time_wrt,
+                        "start_time_wrt",
+                        relation_enforcement_literals,
+                    )
+                else:
+                    for successor_instance_idx in range(successor_job["instances"]):
+                        # Create list to hold whether a predecessor instance satisfies the start time with respect to a successor instance
+                        predecessor_start_time_wrt_satisifed = []
+
+                        # Only create literals for the predecessor instances that can satisfy the relation
+                        candidate_instances = candidate_predecessor_instances(
+                            predecessor_job,
+                            time_bounds[predecessor_job_name]["completion_time"],
+                            predecessor_instance_start_idx,
+                            successor_job,
+                            time_bounds[successor_job_name]["start_time"],
+                            successor_instance_idx,
+                            start_time_wrt,
+                            start_time_wrt,
+                        )
+                        predecessor_pairs += (
+                            predecessor_job["instances"]
+                            - predecessor_instance_start_idx
+                        )
+                        candidate_predecessor_pairs += len(candidate_instances)
+
+                        for predecessor_instance_idx in candidate_instances:
+                            # Boolean variable to keep track if a particular predecessor job instance satisfies the start time with respect to constraint for a successor job instance
+                            start_time_wrt_satisfied = model.new_bool_var(
+                                f"successor_{successor_job_name}_instance_{successor_instance_idx}_predecessor_{predecessor_job_name}_instance_{predecessor_instance_idx}_start_time_wrt"
+                            )
+                            predecessor_start_time_wrt_satisifed.append(
+                                start_time_wrt_satisfied
+                            )
+
+                            # Ensure the successor instance starts after the predecessor instance completes with an offset
+                            model.add(
+                                predecessor_job["completion_time_var"]
+                                + predecessor_instance_idx * predecessor_job["period"]
+                                + pred_characteristics["start_time_wrt"]
+                                == successor_job["start_time_var"]
+                                + successor_instance_idx * successor_job["period"]
+                            ).only_enforce_if(start_time_wrt_satisfied)
+
+                        # Ensure that at least one predecessor instance satisfies the start time with respect to constraint
+                        model.add_bool_or(
+                            predecessor_start_time_wrt_satisifed
+                        ).only_enforce_if(relation_enforcement_literals)
+
+            relation_start = record_predecessor_relation(
+                stats,
+                successor_job_name,
+                predecessor_job_name,
+                "start_time_wrt",
+                relation_start,
+                model,
+            )
+
+            # Ensure the completion time of the successor job with respect to the completion time of the predecessor is respected
+            if completion_time_wrt is not None:
+                relation_enforcement_literals = diagnosis_literals_for(
+                    model,
+                    diagnosis_literals,
+                    f"jobs.{successor_job_name}.predecessors.{predecessor_job_name}.completion_time_wrt",
+                )
+
+                # Define the completion time with respect to variable as the specified completion time with respect to
+                pred_characteristics["completion_time_wrt_var"] = model.new_constant(
+                    completion_time_wrt
+                )
+
+                if precedence_encoding == "index":
+                    add_indexed_precedence(
+                        model,
+                        successor_job_name,
+                        successor_job,
+                        successor_job["completion_time_var"],
+                        predecessor_job_name,
+                        predecessor_job,
+                        predecessor_instance_start_idx,
+                        completion_time_wrt,
+                        completion_time_wrt,
+                        "completion_time_wrt",
+                        relation_enforcement_literals,
+                    )
+                else:
+                    for successor_instance_idx in range(successor_job["instances"]):
+                        # Create list to hold whether a predecessor instance satisfies the completion time with respect to a successor instance
+                        predecessor_completion_time_wrt_satisifed = []
+
+                        # Only create literals for the predecessor instances that can satisfy the relation
+                        candidate_instances = candidate_predecessor_instances(
+                            predecessor_job,
+                            time_bounds[predecessor_job_name]["completion_time"],
+                            predecessor_instance_start_idx,
+                            successor_job,
+                            time_bounds[successor_job_name]["completion_time"],
+                            successor_instance_idx,
+                            completion_time_wrt,
+                            completion_time_wrt,
+                        )
+                        predecessor_pairs += (
+                            predecessor_job["instances"]
+                            - predecessor_instance_start_idx
+                        )
+                        candidate_predecessor_pairs += len(candidate_instances)
+
+                        for predecessor_instance_idx in candidate_instances:
+                            # Boolean variable to keep track if a particular predecessor job instance satisfies the completion time with respect to constraint for a successor job instance
+                            completion_time_wrt_satisfied = model.new_bool_var(
+                                f"successor_{successor_job_name}_instance_{successor_instance_idx}_predecessor_{predecessor_job_name}_instance_{predecessor_instance_idx}_completion_time_wrt"
+                            )
+                            predecessor_completion_time_wrt_satisifed.append(
+                                completion_time_wrt_satisfied
+                            )
+
+                            # Ensure the successor instance completes after the predecessor instance completes with an offset
+                            model.add(
+                                predecessor_job["completion_time_var"]
+                                + predecessor_instance_idx * predecessor_job["period"]
+                                + pred_characteristics["completion_time_wrt_var"]
+                                == successor_job["completion_time_var"]
+                                + successor_instance_idx * successor_job["period"]
+                            ).only_enforce_if(completion_time_wrt_satisfied)
+
+                        # Ensure that at least one predecessor instance satisfies the completion time with respect to constraint
+                        model.add_bool_or(
+                            predecessor_completion_time_wrt_satisifed
+                        ).only_enforce_if(relation_enforcement_literals)
+
+            relation_start = record_predecessor_relation(
+                stats,
+                successor_job_name,
+                predecessor_job_name,
+                "completion_time_wrt",
+                relation_start,
+                model,
+            )
+
+            # Ensure the time lag + slack time is respected with the same predecessor instance if both specified for the same predecessor
+            if time_lag is not None and slack_time is not None:
+                # Applying both on the same predecessor instance is part of the predecessor itself rather than its time lag or slack time
+                relation_enforcement_literals = diagnosis_literals_for(
+                    model,
+                    diagnosis_literals,
+                    f"jobs.{successor_job_name}.predecessors.{predecessor_job_name}",
+                )
+
+                if precedence_encoding == "index":
+                    add_indexed_precedence(
+                        model,
+                        successor_job_name,
+                        successor_job,
+                        successor_job["start_time_var"],
+                        predecessor_job_name,
+                        predecessor_job,
+                        predecessor_instance_start_idx,
+                        time_lag,
+                        slack_time,
+                        "time_lag_slack_time",
+                        relation_enforcement_literals,
+                    )
+                else:
+                    for successor_instance_idx in range(successor_job["instances"]):
+                        # Create list to hold whether a predecessor instance satisfies the time lag and slack time constraint for a successor instance
+                        predecessor_lag_slack_satisifed = []
+
+                        # Only create literals for the predecessor instances that can satisfy the relation
+                        candidate_instances = candidate_predecessor_instances(
+                            predecessor_job,
+                            time_bounds[predecessor_job_name]["completion_time"],
+                            predecessor_instance_start_idx,
+                            successor_job,
+                            time_bounds[successor_job_name]["start_time"],
+                            successor_instance_idx,
+                            time_lag,
+                            slack_time,
+                        )
+                        predecessor_pairs += (
+                            predecessor_job["instances"]
+                            - predecessor_instance_start_idx
+                        )
+                        candidate_predecessor_pairs += len(candidate_instances)
+
+                        for predecessor_instance_idx in candidate_instances:
+                            # Boolean variable to keep track if a particular predecessor job instance satisfies the time lag + slack time constraint for a successor job instance
+                            lag_slack_satisfied = model.new_bool_var(
+                                f"successor_{successor_job_name}_instance_{successor_instance_idx}_predecessor_{predecessor_job_name}_instance_{predecessor_instance_idx}_time_lag_slack_time"
+                            )
+                            predecessor_lag_slack_satisifed.append(lag_slack_satisfied)
+                            # Reify the time lag + slack time constraint
+                            # 1st condition: Ensure the predecessor instance occurs before the successor instance
+                            model.add(
+                                predecessor_job["completion_time_var"]
+                                + predecessor_instance_idx * predecessor_job["period"]
+                                + time_lag
+                                <= successor_job["start_time_var"]
+                                + successor_instance_idx * successor_job["period"]
+                            ).only_enforce_if(lag_slack_satisfied)
+                            # 2nd condition: Ensure the successor instance occurs within the slack of the predecessor instance
+                            model.add(
+                                predecessor_job["completion_time_var"]
+                                + predecessor_instance_idx * predecessor_job["period"]
+                                + slack_time
+                                >= successor_job["start_time_var"]
+                                + successor_instance_idx * successor_job["period"]
+                            ).only_enforce_if(lag_slack_satisfied)
+
+                        # Ensure that at least one predecessor instance satisfies the time lag + slack time constraint
+                        model.add_bool_or(
+                            predecessor_lag_slack_satisifed
+                        ).only_enforce_if(relation_enforcement_literals)
+
+            relation_start = record_predecessor_relation(
+                stats,
+                successor_job_name,
+                predecessor_job_name,
+                "time_lag_slack_time",
+                relation_start,
+                model,
+            )
+
+            # Ensure the time lags are respected
+            if time_lag is not None:
+                relation_enforcement_literals = diagnosis_literals_for(
+                    model,
+                    diagnosis_literals,
+                    f"jobs.{successor_job_name}.predecessors.{predecessor_job_name}.time_lag",
+                )
+
+                if precedence_encoding == "index":
+                    add_indexed_precedence(
+                        model,
+                        successor_job_name,
+                        successor_job,
+                        successor_job["start_time_var"],
+                        predecessor_job_name,
+                        predecessor_job,
+                        predecessor_instance_start_idx,
+                        max(time_lag, 0),
+                        None,
+                        "time_lag",
+                        relation_enforcement_literals,
+                    )
+                else:
+                    for successor_instance_idx in range(successor_job["instances"]):
+                        # Create list to hold whether a predecessor instance satisfies the time lag constraint for a successor instance
+                        predecessor_lag_satisfied = []
+
+                        # Only create literals for the predecessor instances that can satisfy the relation
+                        candidate_instances = candidate_predecessor_instances(
+                            predecessor_job,
+                            time_bounds[predecessor_job_name]["completion_time"],
+                            predecessor_instance_start_idx,
+                            successor_job,
+                            time_bounds[successor_job_name]["start_time"],
+                            successor_instance_idx,
+                            max(time_lag, 0),
+                            None,
+                        )
+                        predecessor_pairs += (
+                            predecessor_job["instances"]
+                            - predecessor_instance_start_idx
+                        )
+                        candidate_predecessor_pairs += len(candidate_instances)
+
+                        for predecessor_instance_idx in candidate_instances:
+                            # Boolean variable to keep track if a particular predecessor job instance satisfies the time lag constraint for a successor job instance
+                            lag_satisfied = model.new_bool_var(
+                                f"successor_{successor_job_name}_instance_{successor_instance_idx}_predecessor_{predecessor_job_name}_instance_{predecessor_instance_idx}_time_lag"
+                            )
+                            predecessor_lag_satisfied.append(lag_satisfied)
+
+                            # Reify the time lag constraint
+                            # 1st condition: Ensure the predecessor instance occurs before the successor instance
+                            model.add(
+                                predecessor_job["completion_time_var"]
+                                + predecessor_instance_idx * predecessor_job["period"]
+                                + time_lag
+                                <= successor_job["start_time_var"]
+                                + successor_instance_idx * successor_job["period"]
+                            ).only_enforce_if(lag_satisfied)
+                            # 2nd condition: Ensure the predecessor instance occurs within one successor period
+                            model.add(
+                                predecessor_job["completion_time_var"]
+                                + predecessor_instance_idx * predecessor_job["period"]
+                                + successor_job["period"]
+                                <= successor_job["start_time_var"]
+                                + (successor_instance_idx + 1) * successor_job["period"]
+                            ).only_enforce_if(lag_satisfied)
+
+                        # Ensure that at least one predecessor instance satisfies the time lag constraint
+                        # As this statement is in a successor instance for loop, We add this constraint for every successor instance
+                        model.add_bool_or(predecessor_lag_satisfied).only_enforce_if(
+                            relation_enforcement_literals
+                        )
+
+            relation_start = record_predecessor_relation(
+                stats,
+                successor_job_name,
+                predecessor_job_name,
+                "time_lag",
+                relation_start,
+                model,
+            )
+
+            # Ensure the slack times are respected
+            if slack_time is not None:
+                relation_enforcement_literals = diagnosis_literals_for(
+                    model,
+                    diagnosis_literals,
+                    f"jobs.{successor_job_name}.predecessors.{predecessor_job_name}.slack_time",
+                )
+
+                if precedence_encoding == "index":
+                    add_indexed_precedence(
+                        model,
+                        successor_job_name,
+                        successor_job,
+                        successor_job["start_time_var"],
+                        predecessor_job_name,
+                        predecessor_job,
+                        predecessor_instance_start_idx,
+                        0,
+                        slack_time,
+                        "slack_time",
+                        relation_enforcement_literals,
+                    )
+                else:
+                    for successor_instance_idx in range(successor_job["instances"]):
+                        # Create list to hold whether a predecessor instance satisfies the slack time constraint for a successor instance
+                        predecessor_slack_satisfied = []
+
+                        # Only create literals for the predecessor instances that can satisfy the relation
+                        candidate_instances = candidate_predecessor_instances(
+                            predecessor_job,
+                            time_bounds[predecessor_job_name]["completion_time"],
+                            predecessor_instance_start_idx,
+                            successor_job,
+                            time_bounds[successor_job_name]["start_time"],
+                            successor_instance_idx,
+                            0,
+                            slack_time,
+                        )
+                        predecessor_pairs += (
+                            predecessor_job["instances"]
+                            - predecessor_instance_start_idx
+                        )
+                        candidate_predecessor_pairs += len(candidate_instances)
+
+                        for predecessor_instance_idx in candidate_instances:
+                            # Boolean variable to keep track if a particular predecessor job instance satisfies the slack time constraint for a successor job instance
+                            slack_satisfied = model.new_bool_var(
+                                f"successor_{successor_job_name}_instance_{successor_instance_idx}_predecessor_{predecessor_job_name}_instance_{predecessor_instance_idx}_slack_time"
+                            )
+                            predecessor_slack_satisfied.append(slack_satisfied)
+
+                            # Find any previous predecessor instance for which the slack time constraint holds
+                            # Reify the slack time constraint
+                            # 1st condition: Ensure the successor instance occurs within the slack of the predecessor instance
+                            model.add(
+                                predecessor_job["completion_time_var"]
+                                + predecessor_instance_idx * predecessor_job["period"]
+                                + slack_time
+                                >= successor_job["start_time_var"]
+                                + successor_instance_idx * successor_job["period"]
+                            ).only_enforce_if(slack_satisfied)
+                            # 2nd condition: Ensure the predecessor instance occurs within one successor period
+                            model.add(
+                                predecessor_job["completion_time_var"]
+                                + predecessor_instance_idx * predecessor_job["period"]
+                                + successor_job["period"]
+                                <= successor_job["start_time_var"]
+                                + (successor_instance_idx + 1) * successor_job["period"]
+                            ).only_enforce_if(slack_satisfied)
+
+                        # Every successor instance needs to have at least one predecessor instance for which the slack time constraint is satisfied by
+                        model.add_bool_or(predecessor_slack_satisfied).only_enforce_if(
+                            relation_enforcement_literals
+                        )
+
+            relation_start = record_predecessor_relation(
+                stats,
+                successor_job_name,
+                predecessor_job_name,
+                "slack_time",
+                relation_start,
+                model,
+            )
+
+            # For the purposes of minimization, if the completion_time_wrt is not specified, then compute the value of completion_time_wrt
+            if completion_time_wrt is None:
+                relation_enforcement_literals = diagnosis_literals_for(
+                    model,
+                    diagnosis_literals,
+                    f"jobs.{successor_job_name}.predecessors.{predecessor_job_name}",
+                )
+
+                pred_characteristics["completion_time_wrt_var"] = model.new_int_var(
+                    0,
+                    hyper_period,
+                    f"successor_{successor_job_name}_predecessor_{predecessor_job_name}_completion_time_wrt",
+                )
+                # Ensure the completion_time_wrt can be at least the processing time of the job
+                # For successors with a different period, the completion_time_wrt is only reported, so the processing time only has to fit within the period of the predecessor
+                if predecessor_job["period"] == successor_job["period"]:
+                    model.add(
+                        pred_characteristics["completion_time_wrt_var"]
+                        >= successor_job["processing_time_var"]
+                    ).only_enforce_if(relation_enforcement_literals)
+                else:
+                    model.add(
+                        successor_job["processing_time_var"] < predecessor_job["period"]
+                    ).only_enforce_if(relation_enforcement_literals)
+
+                # Introduce an intermediate completion time wrt as a value to capture the one way difference between successor and predecessor
+                # By adding a modulo equality, we ensure completion time wrt is always positive
+                # This is to handle the case when the immediate predecessor for successor completes in the previous period
+                # In such a case the completion time of tthe successor minus the completion time of the predecessor is negative,
+                # Taking the modulo of the above difference with the period ensures that we have a positive value to minimize
+                pred_characteristics["dividend_completion_time_wrt_var"] = (
+                    model.new_int_var(
+                        0,
+                        hyper_period + predecessor_job["period"],
+                        f"successor_{successor_job_name}_predecessor_{predecessor_job_name}_dividend_completion_time_wrt",
+                    )
+                )
+                model.add_modulo_equality(
+                    pred_characteristics["completion_time_wrt_var"],
+                    pred_characteristics["dividend_completion_time_wrt_var"],
+                    predecessor_job["period"],
+                )
+
+                # If succ and pred have the same period, then just check the first period
+                if predecessor_job["period"] == successor_job["period"]:
+                    model.add(
+                        pred_characteristics["dividend_completion_time_wrt_var"]
+                        == successor_job["completion_time_var"]
+                        - predecessor_job["completion_time_var"]
+                    ).only_enforce_if(relation_enforcement_literals)
+                # Otherwise report the completion_time_wrt from the latest predecessor instance completing before the first successor instance, see completion_time_wrt_offset()
+                # The predecessor's period is added so the dividend stays positive when the predecessor completes later within its period
+                else:
+                    model.add(
+                        pred_characteristics["dividend_completion_time_wrt_var"]
+                        == successor_job["completion_time_var"]
+                        - predecessor_job["completion_time_var"]
+                        + predecessor_job["period"]
+                    ).only_enforce_if(relation_enforcement_literals)
+
+                # If succ and pred do not have the same period and we still want to minimize the completion time wrt,
+                # Then formulate the constraints for each instance of the successor in the hyper-period (similar to slack time),
+                # but instead of using the slack time use the completion_time_wrt variable,
+                # And when minimizing the completion_time_wrt, take the average of all completion_time_wrt
+                # This should ensure that the completion_time_wrt corresponds to value that is from the successor instance to the previously immediate predecessor instance
+                if (
+                    predecessor_job["period"] != successor_job["period"]
+                    and pred_characteristics["completion_time_wrt_weight"] != 0
+                ):
+                    raise ScheduleInputError(
+                        [
+                            "Multiperiod completion time wrt weight not supported",
+                            f"Offending jobs: {predecessor_job_name} and {successor_job_name}",
+                        ]
+                    )
+                    for successor_instance_idx in range(successor_job["instances"]):
+                        pass
+
+            relation_start = record_predecessor_relation(
+                stats,
+                successor_job_name,
+                predecessor_job_name,
+                "completion_time_wrt_objective",
+                relation_start,
+                model,
+            )
+
+    # Report how many predecessor instance pairs were pruned
+    if predecessor_pairs > 0:
+        print(
+            f"Pruned {predecessor_pairs - candidate_predecessor_pairs} of {predecessor_pairs} predecessor instance pairs ({1 - candidate_predecessor_pairs / predecessor_pairs:.0%}).",
+            file=sys.stderr,
+        )
+    if stats is not None:
+        stats["predecessor_pairs"] = predecessor_pairs
+        stats["predecessor_pairs_pruned"] = (
+            predecessor_pairs - candidate_predecessor_pairs
+        )
+
+    # Record the precedence relations as a phase for each kind of relation
+    if stats is not None:
+        for relation_name in [
+            "start_time_wrt",
+            "completion_time_wrt",
+            "time_lag_slack_time",
+            "time_lag",
+            "slack_time",
+            "completion_time_wrt_objective",
+        ]:
+            relations = [
+                relation
+                for relation in stats.get("predecessor_relations", [])
+                if relation["relation"] == relation_name
+            ]
+            stats.setdefault("phases", []).append(
+                {"phase": f"predecessors_{relation_name}"}
+                | {
+                    key: sum(relation[key] for relation in relations)
+                    for key in [
+                        "time",
+                        "int_vars",
+                        "bool_vars",
+                        "intervals",
+                        "constraints",
+                    ]
+                }
+            )
+    start = phase_start(model)
+
+    # Define intermediary variables for the objective function
+    for job in jobs.values():
+        job["flow_time_var"] = (
+            job["start+processing_time_var"] - job["release_time"]
+            if job["release_time"] is not None
+            else None
+        )
+        job["earliness_var"] = (
+            job["deadline"] - job["completion_time_var"]
+            if job["deadline"] is not None
+            else None
+        )
+
+    # Each objective is the weighted sum of its terms
+    objective_exprs = {
+        # Minimize the completion time
+        "completion_time": sum(
+            job["completion_time_weight"] * job["start+processing_time_var"]
+            for job in jobs.values()
+        ),
+        # Minimize the flow time
+        "flow_time": sum(
+            job["flow_time_weight"] * job["flow_time_var"]
+            for job in jobs.values()
+            if job["flow_time_var"] is not None
+        ),
+        # Minimize the earliness
+        "earliness": sum(
+            job["earliness_weight"] * job["earliness_var"]
+            for job in jobs.values()
+            if job["earliness_var"] is not None
+        ),
+        # Minimize the completion time with respect to predecessors
+        "completion_time_wrt": sum(
+            pred_characteristics["completion_time_wrt_weight"]
+            * pred_characteristics["completion_time_wrt_var"]
+            for job in jobs.values()
+            for pred_characteristics in job["predecessors"].values()
+            if pred_characteristics["completion_time_wrt_var"] is not None
+        ),
+        # Minimize the number of machines
+        "num_machines": num_machines_weight
+        * sum(machine["utilized_machines_var"] for machine in machines.values()),
+        # Minimize specific machines
+        "machine_weight": sum(
+            machine["machine_weight"] * machine["utilized_machines_var"]
+            for machine in machines.values()
+        ),
+    }
+
+    # The lexicographic and pareto objective modes set the objective of every solve themselves
+    if objective_mode == "weighted":
+        model.minimize(sum(objective_exprs.values()))
+
+    start = record_phase(stats, "objective", start, model)
+
+    # Solve the model unless it is only built to be solved again and again by a Scheduler
+    build_time = time.perf_counter() - build_start_time
+    state = {
+        "model": model,
+        "jobs": jobs,
+        "machines": machines,
+        "periodic": is_schedule_periodic,
+        "objective_mode": objective_mode,
+        "objectives": objectives,
+        "objective_exprs": objective_exprs,
+        "max_pareto_points": max_pareto_points,
+        "solver_parameters": solver_parameters,
+        "stop_gap": stop_gap,
+        "stop_stall_time": stop_stall_time,
+        "diagnosis_literals": diagnosis_literals,
+        "diagnose": diagnose or minimize_diagnosis,
+        "minimize_diagnosis": minimize_diagnosis,
+        "build_time": build_time,
+        "cache": (
+            {
+                "cache_dir": cache_dir,
+                "cache_key": cache_key,
+                "cache_max_size": cache_max_size,
+                "cache_nondeterministic": cache_nondeterministic,
+            }
+            if cache_key is not None
+            else None
+        ),
+    }
+    if model_state is not None:
+        model_state.update(state)
+        return None
+
+    scheduled_jobs = solve_model_state(
+        state, stats=stats, on_solution=on_solution, pareto_front=pareto_front
+    )
+    if len(state.get("unassigned_pools", [])) == 0:
+        return scheduled_jobs
+
+    # The number of jobs overlapping on a pool is limited by its capacity, which does not ensure that the jobs can be assigned to its machines
+    # as the instances of a job run on the same machine, so solve again with the machines of the pools that cannot be assigned modeled separately
+    print(
+        f"Jobs on machine pools {state['unassigned_pools']} cannot be assigned to their machines, solving again with their machines modeled separately.",
+        file=sys.stderr,
+    )
+    if pareto_front is not None:
+        pareto_front.clear()
+    return schedule(
+        expand_machine_pools(pool_input, state["unassigned_pools"]),
+        stats=stats,
+        previous_schedule=previous_schedule,
+        fix_unchanged_jobs=fix_unchanged_jobs,
+        cache_dir=cache_dir,
+        refresh_cache=refresh_cache,
+        cache_max_size=cache_max_size,
+        cache_nondeterministic=cache_nondeterministic,
+        diagnose=diagnose,
+        minimize_diagnosis=minimize_diagnosis,
+        pareto_front=pareto_front,
+        on_solution=on_solution,
+    )
+
+
+def solve_model_state(model_state, stats=None, on_solution=None, pareto_front=None):
+    # Solve a model built by schedule() and retrieve its schedule, which is returned as a copy so that the model can be solved again
+    # Returns None if no schedule is found
+    from ortools.sat.python import cp_model
+
+    model = model_state["model"]
+    jobs = model_state["jobs"]
+    objective_mode = model_state["objective_mode"]
+    objectives = model_state["objectives"]
+    objective_exprs = model_state["objective_exprs"]
+    diagnosis_literals = model_state["diagnosis_literals"]
+    stop_gap = model_state["stop_gap"]
+    stop_stall_time = model_state["stop_stall_time"]
+    cache = model_state["cache"]
+    machines = model_state["machines"]
+    is_schedule_periodic = model_state["periodic"]
+
+    start = phase_start(model)
+
+    solver = cp_model.CpSolver()
+
+    # Set solver parameters
+    for key, value in model_state["solver_parameters"].items():
+        setattr(solver.parameters, key, value)
+
+    # Assume every guarded group of constraints holds when diagnosing infeasibility
+    # Sufficient assumptions for infeasibility are only reported reliably by a single worker
+    if model_state["diagnose"]:
+        model.clear_assumptions()
+        model.add_assumptions(list(diagnosis_literals.values()))
+        solver.parameters.num_workers = 1
+
+    # Stop once the gap between the objective and its bound is below stop_gap percent
+    if stop_gap is not None:
+        solver.parameters.relative_gap_limit = stop_gap / 100
+
+    # Stream every solution found and stop once no better solution has been found for stop_stall_time seconds
+    # When profiling, record every solution found and capture the search log for the presolve time
+    solution_callback = None
+    solver_log = []
+    if stats is not None or on_solution is not None or stop_stall_time is not None:
+        solution_callback = solution_progress_callback(
+            cp_model,
+            stats,
+            jobs,
+            on_solution,
+            stop_stall_time,
+            machines,
+            is_schedule_periodic,
+        )
+    if stats is not None:
+        if not solver.parameters.log_search_progress:
+            solver.parameters.log_search_progress = True
+            solver.parameters.log_to_stdout = False
+        solver.log_callback = solver_log.append
+
+    # Solve once for the weighted objective, once for every objective in order of priority,
+    # or twice for every point of the Pareto front, keeping a copy of the schedule of each point
+    objective_stages = []
+    pareto_points = []
+    # Names of the machine pools whose jobs cannot be assigned to their machines in a schedule found
+    unassigned_pool_names = set()
+
+    def on_pareto_point(first_value, second_value):
+        point = {objectives[0]: first_value, objectives[1]: second_value}
+        pareto_points.append(point)
+        print(
+            f"Pareto point {len(pareto_points)}: {', '.join(f'{objective_name} = {value}' for objective_name, value in point.items())}.",
+            file=sys.stderr,
+        )
+        point_unassigned_pool_names = retrieve_solution(
+            solver, jobs, machines, is_schedule_periodic
+        )
+        unassigned_pool_names.update(point_unassigned_pool_names)
+        if pareto_front is not None and len(point_unassigned_pool_names) == 0:
+            pareto_front.append(point | {"jobs": solution_snapshot(jobs)})
+
+    if objective_mode == "weighted":
+        status_name = solve(model, solver, solution_callback)
+    elif objective_mode == "lexicographic":
+        status_name, _ = solve_lexicographic(
+            model,
+            solver,
+            objectives,
+            [objective_exprs[objective_name] for objective_name in objectives],
+            solution_callback,
+            objective_stages,
+        )
+    else:
+        status_name = solve_pareto_front(
+            model,
+            solver,
+            objectives,
+            [objective_exprs[objective_name] for objective_name in objectives],
+            model_state["max_pareto_points"],
+            solution_callback,
+            objective_stages,
+            on_pareto_point,
+        )
+
+    start = record_phase(stats, "solve", start, model)
+    model_state["status"] = status_name
+
+    # Record the size of the model and the effort to build and solve it
+    if stats is not None:
+        stats["status"] = status_name
+        # The objective of the lexicographic objective mode is the one of lowest priority
+        stats["objective"] = (
+            solver.objective_value
+            if objective_mode != "pareto"
+            and (status_name == "OPTIMAL" or status_name == "FEASIBLE")
+            else None
+        )
+        stats["variables"] = len(model.proto.variables)
+        stats["constraints"] = len(model.proto.constraints)
+        stats["build_time"] = model_state["build_time"]
+        stats["solve_time"] = (
+            sum(stage["wall_time"] for stage in objective_stages)
+            if len(objective_stages) > 0
+            else solver.wall_time
+        )
+        if len(objective_stages) > 0:
+            stats["objective_stages"] = objective_stages
+        if objective_mode == "pareto":
+            stats["pareto_front"] = pareto_points
+        stats["solver"] = {
+            "wall_time": solver.wall_time,
+            "user_time": solver.user_time,
+            "deterministic_time": solver.response_proto.deterministic_time,
+            "presolve_time": presolve_time(solver_log),
+            "num_booleans": solver.num_booleans,
+            "num_conflicts": solver.num_conflicts,
+            "num_branches": solver.num_branches,
+            "best_objective_bound": (
+                solver.best_objective_bound
+                if objective_mode != "pareto"
+                and (status_name == "OPTIMAL" or status_name == "FEASIBLE")
+                else None
+            ),
+        }
+
+    # Retrieve solution
+    # The schedule of a Pareto front is the one of its last point, which has the least first objective
+    if status_name == "OPTIMAL" or status_name == "FEASIBLE":
+        if objective_mode != "pareto":
+            unassigned_pool_names.update(
+                retrieve_solution(solver, jobs, machines, is_schedule_periodic)
+            )
+
+        # A schedule whose jobs on a pool cannot be assigned to its machines is left for schedule() to solve again,
+        # with the machines of these pools modeled separately
+        model_state["unassigned_pools"] = sorted(unassigned_pool_names)
+        if len(unassigned_pool_names) > 0:
+            return None
+
+        if objective_mode == "pareto":
+            print(
+                f"Pareto front of {len(pareto_points)} points found.", file=sys.stderr
+            )
+        print("Feasible schedule found.", file=sys.stderr)
+
+        scheduled_jobs = solution_snapshot(jobs)
+
+        # Only cache solves that ran to completion as a time limit makes the result depend on the machine
+        if cache is not None and (
+            cache["cache_nondeterministic"] or status_name == "OPTIMAL"
+        ):
+            write_schedule_cache(
+                cache["cache_dir"],
+                cache["cache_key"],
+                {
+                    "status": status_name,
+                    "objective": solver.objective_value,
+                    "jobs": list(scheduled_jobs.values()),
+                },
+                cache["cache_max_size"],
+            )
 
-    # Ensure that same machine jobs, different machine jobs, and predecessors have been specified
-    for job_name, job in jobs.items():
-        for same_machine_job_name in job["same_machine_jobs"]:
-            if same_machine_job_name not in jobs.keys():
-                print(
-                    f"Job {job_name} is specified to run on the same machine as job {same_machine_job_name} which does not exist!",
-                    file=sys.stderr,
-                )
-                input_error = True
-        for different_machine_job_name in job["different_machine_jobs"]:
-            if different_machine_job_name not in jobs.keys():
-                print(
-                    f"Job {job_name} is specified to run on a different machine from job {different_machine_job_name} which does not exist!",
-                    file=sys.stderr,
-                )
-                input_error = True
-        for predecessor_job_name in job["predecessors"].keys():
-            if predecessor_job_name not in jobs.keys():
+        return scheduled_jobs
+
+    elif status_name == "INFEASIBLE":
+        print("Input is not feasible!", file=sys.stderr)
+        # Report a set of groups of constraints that conflict with each other by their toml keys
+        if model_state["diagnose"]:
+            conflict = diagnose_infeasibility(
+                model, solver, diagnosis_literals, model_state["minimize_diagnosis"]
+            )
+            start = record_phase(stats, "diagnosis", start, model)
+            if len(conflict) > 0:
+                print("Conflicting constraints:", file=sys.stderr)
+                for name in conflict:
+                    print(f"  {name}", file=sys.stderr)
+            else:
                 print(
-                    f"Job {job_name} has predecessor, {predecessor_job_name}, that does not exist!",
+                    "No conflicting constraints found, the input is infeasible regardless of the constraints that can be diagnosed!",
                     file=sys.stderr,
                 )
-                input_error = True
+            if stats is not None:
+                stats["conflict"] = conflict
+        if cache is not None:
+            write_schedule_cache(
+                cache["cache_dir"],
+                cache["cache_key"],
+                {"status": status_name, "objective": None, "jobs": None},
+                cache["cache_max_size"],
+            )
+    else:
+        print(status_name, file=sys.stderr)
 
-    # Ensure that at least one job has its period specified
-    if all([job["period"] is None for job in jobs.values()]):
-        print(
-            f"At least one job must have its period specified! For non-periodic scheduling simply, treat the period as the max time for your schedule.",
-            file=sys.stderr,
-        )
-        input_error = True
+    return None
 
-    # Compute the hyper-period of the schedule
-    periods = [job["period"] for job in jobs.values() if job["period"] is not None]
-    hyper_period = math.lcm(*periods)
 
-    # Assign the period of jobs that have none as the hyper-period
-    # and obtain the number of instances for each job in the hyper-period
-    for job in jobs.values():
-        if job["period"] is None:
-            job["period"] = hyper_period
-        job["instances"] = hyper_period // job["period"]
+def expand_pool_job(job, pool_machines):
+    # Replace the machine pools that a job refers to by their machines, given the names of the machines of each pool by pool name
+    # A job that can run on a pool can run on any of its machines, and a job specified to run on a pool must run on one of its machines
+    processing_times = job.get("processing_times", 1)
+    if isinstance(processing_times, int):
+        processing_times = {
+            machine_name: processing_times
+            for machine_name in pool_machines.get(job.get("machine"), [])
+        }
+        if len(processing_times) > 0:
+            job["processing_times"] = processing_times
+            del job["machine"]
+        return job
 
-    # Ensure that all jobs have the same period (aka max time) if periodic is false
-    first_job_period = list(jobs.values())[0]["period"]
-    if not is_schedule_periodic:
-        if not all([job["period"] == first_job_period for job in jobs.values()]):
-            print(
-                f"For non-periodic schedules, the periods of each job, if specified, must be the same! At least one period must be specified, you can treat this as the max time for your schedule.",
-                file=sys.stderr,
-            )
-            input_error = True
+    job["processing_times"] = {
+        pool_machine_name: processing_time
+        for machine_name, processing_time in processing_times.items()
+        for pool_machine_name in pool_machines.get(machine_name, [machine_name])
+    }
+    if job.get("machine") in pool_machines.keys():
+        job["processing_times"] = {
+            machine_name: processing_time
+            for machine_name, processing_time in job["processing_times"].items()
+            if machine_name in pool_machines[job["machine"]]
+        }
+        del job["machine"]
+    return job
 
-    if input_error:
-        sys.exit()
 
-    # For periodic schedules ensure we check with intervals before the 1st period
-    # This allows us to check for interval overlaps with jobs starting in the previous period, but wrapping around to the current period
-    interval_instance_start_idx = -1 if is_schedule_periodic else 0
+def expand_machine_pools(schedule_input, pool_names=None):
+    # Replace the machine pools of a schedule input by their machines, each with the characteristics of its pool and modeled separately
+    # pool_names selects the pools to replace, which defaults to every pool
+    # Returns a copy of the schedule input with the pools replaced
+    schedule_input = copy.deepcopy(schedule_input)
+    machines = schedule_input.get("machines", {})
+    pool_machines = {
+        machine_name: pool_machine_names(machine_name, machine)
+        for machine_name, machine in machines.items()
+        if len(pool_machine_names(machine_name, machine)) > 0
+        and (pool_names is None or machine_name in pool_names)
+    }
+    if len(pool_machines) == 0:
+        return schedule_input
 
-    # For periodic schedules ensure we check with predecessors before the 1st period
-    # This allows us to check for precedence relations with the previous period
-    predecessor_instance_start_idx = -1 if is_schedule_periodic else 0
+    schedule_input["machines"] = {}
+    for machine_name, machine in machines.items():
+        if machine_name not in pool_machines.keys():
+            schedule_input["machines"][machine_name] = machine
+            continue
+        for pool_machine_name in pool_machines[machine_name]:
+            schedule_input["machines"][pool_machine_name] = {
+                key: value for key, value in machine.items() if key != "capacity"
+            }
+    for job in schedule_input.get("jobs", {}).values():
+        expand_pool_job(job, pool_machines)
+    return schedule_input
 
-    model = cp_model.CpModel()
+
+def independent_clusters(schedule_input):
+    # Partition the jobs and machines of a schedule input into clusters that can be scheduled independently
+    # Jobs are linked to the jobs they reference as predecessors, same machine jobs, or different machine jobs,
+    # and to the machines they can run on, so jobs in different clusters never interact
+    # Machines that no job can run on are left out, as they are never utilized
+    # Returns a list of (job names, machine names) in order of the jobs, or None if the input references unknown jobs
+    machines = schedule_input.get("machines", {"machine": {}})
+    jobs = schedule_input.get("jobs", {})
+
+    # Union-find over jobs and machines
+    parents = {}
+
+    def find(node):
+        parents.setdefault(node, node)
+        while parents[node] != node:
+            parents[node] = parents[parents[node]]
+            node = parents[node]
+        return node
+
+    def union(node, other_node):
+        parents[find(node)] = find(other_node)
 
     for job_name, job in jobs.items():
-        # Ensure the job starts within its period
-        if job["start_time"] is None:
-            job["start_time_var"] = model.new_int_var(
-                0,
-                job["period"] - 1,
-                f"job_{job_name}_start_time",
-            )
-        # If the start time is specified then ensure the start time is respected
-        # Handle values outside of the first period via module with the job's period
-        else:
-            job["start_time_var"] = model.new_constant(
-                job["start_time"] % job["period"]
-            )
+        find(("job", job_name))
 
-        # Define the completion time variable that handles a job wrapping around its period with a modulo equality
-        if job["completion_time"] is None:
-            job["completion_time_var"] = model.new_int_var(
-                1, job["period"], f"job_{job_name}_completion_time"
-            )
-        # If the completion time is specified then ensure the completion time is respected
-        # Handle values outside of the first period via module with the job's period
-        # Since completion time is defined as [1, job's period] modify the modulo output
-        # to give job's period when the result would be 0 (outside of the range)
+        # A job with a single processing time for every machine can run on any machine
+        processing_times = job.get("processing_times", 1)
+        if isinstance(processing_times, int):
+            job_machine_names = list(machines.keys())
+        elif job.get("machine") is not None:
+            job_machine_names = [job["machine"]]
         else:
-            job["completion_time_var"] = model.new_constant(
-                job["completion_time"] % job["period"]
-                if job["completion_time"] % job["period"] != 0
-                else job["period"]
+            job_machine_names = list(processing_times.keys())
+        for machine_name in job_machine_names:
+            union(("job", job_name), ("machine", machine_name))
+
+        linked_job_names = list(job.get("predecessors", {}).keys())
+        for key in ["same_machine_jobs", "different_machine_jobs"]:
+            key_job_names = job.get(key, [])
+            linked_job_names += (
+                [key_job_names] if isinstance(key_job_names, str) else key_job_names
             )
+        for linked_job_name in linked_job_names:
+            if linked_job_name not in jobs.keys():
+                return None
+            union(("job", job_name), ("job", linked_job_name))
 
-        # Ensure the release time and deadline are respected
-        # Release time and deadline are defined as a time within the job's period
-        # Handle values outside of the first period via module with the job's period
-        if job["release_time"] is not None:
-            model.add(job["start_time_var"] >= job["release_time"] % job["period"])
+    clusters = {}
+    for job_name in jobs.keys():
+        clusters.setdefault(find(("job", job_name)), ([], []))[0].append(job_name)
+    for machine_name in machines.keys():
+        root = find(("machine", machine_name))
+        if root in clusters.keys():
+            clusters[root][1].append(machine_name)
+    return list(clusters.values())
 
-        if job["deadline"] is not None:
-            # Note that we use job["completion_time_var"] and not job["start+processing_time_var"]
-            # since the deadline is defined within the period
-            # Since completion time is defined as [1, job's period] modify the modulo output
-            # to give job's period when the result would be 0 (outside of the range)
-            model.add(
-                job["completion_time_var"] <= job["deadline"] % job["period"]
-                if job["deadline"] % job["period"] != 0
-                else job["period"]
-            )
 
-        # Constraints on assigning the job to a machine
-        # Boolean variable to determine if job is assigned on that machine
-        for machine_name in machines.keys():
-            job["machine_vars"][machine_name] = model.new_bool_var(
-                f"job_{job_name}_assigned_on_machine_{machine_name}"
+def schedule_cluster(cluster_input, previous_schedule, schedule_kwargs):
+    # Schedule a cluster in a worker process, capturing its messages to report them with the cluster
+    # Returns the scheduled jobs, the stats of the cluster, its messages, and the errors in its input
+    stats = {}
+    log = io.StringIO()
+    with contextlib.redirect_stderr(log):
+        try:
+            jobs = schedule(
+                cluster_input,
+                stats=stats,
+                previous_schedule=previous_schedule,
+                **schedule_kwargs,
             )
+        except ScheduleInputError as error:
+            return None, stats, log.getvalue(), error.errors
+    return jobs, stats, log.getvalue(), []
 
-        # Ensure the job runs only on one machine
-        model.add_exactly_one(list(job["machine_vars"].values()))
 
-        # If the machine is specified then ensure the job runs on that machine
-        if job["machine"] is not None:
-            model.add(job["machine_vars"][job["machine"]] == True)
+def schedule_decomposed(
+    schedule_input,
+    processes=None,
+    stats=None,
+    previous_schedule=None,
+    **schedule_kwargs,
+):
+    # Schedule independent clusters of jobs as separate models in parallel and merge their schedules
+    # Each cluster has its own hyper-period, which is often much smaller than the hyper-period of all jobs
+    # Falls back to schedule() if the jobs form a single cluster
+    # The lexicographic optimum of independent clusters is the lexicographic optimum of each cluster, but a Pareto front is not,
+    # so a Pareto front is always enumerated with schedule(), as are streamed solutions, which are only complete schedules for all clusters
+    # Harmonized periods are chosen for all jobs together, as jobs without a period run once in the hyper-period of all jobs
+    check_input_tables(schedule_input)
+    # Every cluster outputs a min period for its jobs if any job specifies one, so that the merged schedule has the same columns for every job
+    if any(
+        "min_period" in job.keys() for job in schedule_input.get("jobs", {}).values()
+    ):
+        for job in schedule_input["jobs"].values():
+            job.setdefault("min_period", None)
+    clusters = independent_clusters(schedule_input)
+    if (
+        clusters is None
+        or len(clusters) <= 1
+        or schedule_input.get("objective_mode") == "pareto"
+        or schedule_kwargs.get("on_solution") is not None
+        or schedule_input.get("period_harmonization", "none") != "none"
+    ):
+        return schedule(
+            schedule_input,
+            stats=stats,
+            previous_schedule=previous_schedule,
+            **schedule_kwargs,
+        )
 
-        # If job has no processing time for a machine, ensure the job cannot be assigned to that machine
-        for machine_name in machines.keys():
-            if not machine_name in job["processing_times"]:
-                model.add(job["machine_vars"][machine_name] == False)
+    # Jobs without a period run once in the hyper-period of all jobs, which does not change with decomposition
+    jobs = schedule_input["jobs"]
+    periods = [job["period"] for job in jobs.values() if job.get("period") is not None]
+    if len(periods) == 0:
+        return schedule(
+            schedule_input,
+            stats=stats,
+            previous_schedule=previous_schedule,
+            **schedule_kwargs,
+        )
+    hyper_period = math.lcm(*periods)
 
-        # Create a domain variable for processing time with possible processing times for the job
-        processing_time_domain = cp_model.Domain.from_values(
-            list(job["processing_times"].values())
+    # Share the cores between the clusters solved in parallel unless the number of workers is specified
+    if processes is None:
+        processes = os.cpu_count()
+    processes = max(1, min(processes, len(clusters)))
+    solver_parameters = schedule_input.get("solver", {}).get("parameters", {})
+    num_workers = solver_parameters.get(
+        "num_workers", max(1, os.cpu_count() // processes)
+    )
+
+    cluster_inputs = []
+    cluster_hyper_periods = []
+    for job_names, machine_names in clusters:
+        cluster_input = copy.deepcopy(
+            {
+                key: value
+                for key, value in schedule_input.items()
+                if key not in ["machines", "jobs"]
+            }
         )
-        job["processing_time_var"] = model.new_int_var_from_domain(
-            processing_time_domain, f"job_{job_name}_processing_time"
+        if "machines" in schedule_input.keys():
+            cluster_input["machines"] = {
+                machine_name: copy.deepcopy(schedule_input["machines"][machine_name])
+                for machine_name in machine_names
+            }
+        cluster_input["jobs"] = {
+            job_name: copy.deepcopy(jobs[job_name]) for job_name in job_names
+        }
+        for job in cluster_input["jobs"].values():
+            if job.get("period") is None:
+                job["period"] = hyper_period
+        cluster_input.setdefault("solver", {}).setdefault("parameters", {})[
+            "num_workers"
+        ] = num_workers
+        cluster_inputs.append(cluster_input)
+        cluster_hyper_periods.append(
+            math.lcm(*[job["period"] for job in cluster_input["jobs"].values()])
         )
 
-        # Determine the processing time of a job based on the machine it is run on
-        for machine_name, processing_time in job["processing_times"].items():
-            model.add(job["processing_time_var"] == processing_time).only_enforce_if(
-                job["machine_vars"][machine_name]
+    print(
+        f"Decomposed {len(jobs)} jobs into {len(clusters)} independent clusters with hyper-periods {cluster_hyper_periods} instead of {hyper_period}.",
+        file=sys.stderr,
+    )
+
+    cluster_previous_schedules = [
+        (
+            None
+            if previous_schedule is None
+            else [
+                previous_job
+                for previous_job in previous_schedule
+                if previous_job.get("job") in job_names
+            ]
+        )
+        for job_names, _ in clusters
+    ]
+    if processes == 1:
+        cluster_results = [
+            schedule_cluster(cluster_input, cluster_previous_schedule, schedule_kwargs)
+            for cluster_input, cluster_previous_schedule in zip(
+                cluster_inputs, cluster_previous_schedules
+            )
+        ]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+            cluster_results = list(
+                executor.map(
+                    schedule_cluster,
+                    cluster_inputs,
+                    cluster_previous_schedules,
+                    [schedule_kwargs] * len(cluster_inputs),
+                )
             )
 
-        # Create a variable to represent the sum of start time and processing time to use in future constraints
-        # Note: It is important to understand when to use job["start_time_var"] + job["processing_time_var"] vs job["completion_time_var"]
-        # as both represent the completion time, but the first represents the completion time of the job that has started in the current period,
-        # while the second one represents the completion time of the job that started in the previous period
-        # The upper bound is 2 times the job's period minus 1 as remember this variable can overrun the current period.
-        # However if it overruns 2 periods, then the job will overlap with another instance of itself.
-        job["start+processing_time_var"] = model.new_int_var(
-            0, 2 * job["period"] - 1, f"job_{job_name}_start+processing_time"
+    # Report the messages of each cluster
+    for cluster_idx, (_, _, log, _) in enumerate(cluster_results):
+        for line in log.splitlines():
+            print(f"Cluster {cluster_idx + 1}: {line}", file=sys.stderr)
+    input_errors = [
+        f"Cluster {cluster_idx + 1}: {input_error}"
+        for cluster_idx, (_, _, _, cluster_input_errors) in enumerate(cluster_results)
+        for input_error in cluster_input_errors
+    ]
+    if len(input_errors) > 0:
+        raise ScheduleInputError(input_errors)
+
+    # The schedule is only as good as its worst cluster
+    cluster_stats = [
+        cluster_stat | {"jobs": len(job_names), "hyper_period": cluster_hyper_period}
+        for (_, cluster_stat, _, _), (job_names, _), cluster_hyper_period in zip(
+            cluster_results, clusters, cluster_hyper_periods
         )
-        model.add(
-            job["start+processing_time_var"]
-            == job["start_time_var"] + job["processing_time_var"]
+    ]
+    statuses = [cluster_stat.get("status") for cluster_stat in cluster_stats]
+    status_name = next(
+        (
+            status
+            for status in ["INFEASIBLE", "MODEL_INVALID", "UNKNOWN", "FEASIBLE"]
+            if status in statuses
+        ),
+        statuses[0],
+    )
+    if stats is not None:
+        stats["status"] = status_name
+        stats["objective"] = (
+            sum(cluster_stat["objective"] for cluster_stat in cluster_stats)
+            if all(
+                cluster_stat.get("objective") is not None
+                for cluster_stat in cluster_stats
+            )
+            else None
         )
+        stats["clusters"] = cluster_stats
 
-        # Ensure the completion time is equal to start time plus processing time, while accounting for wrapping around the start of its period
-        model.add_modulo_equality(
-            job["completion_time_var"],
-            job["start+processing_time_var"],
-            job["period"],
-        )
+    if any(cluster_jobs is None for cluster_jobs, _, _, _ in cluster_results):
+        if status_name == "INFEASIBLE":
+            print("Input is not feasible!", file=sys.stderr)
+        return None
 
-        # Create a job interval for every job instance on every potential machine accounting for setup time and teardown time
-        for machine_name, processing_time in job["processing_times"].items():
-            # Recover the machine for machine setup time and teardown time
-            machine = machines[machine_name]
+    # Merge the schedules of the clusters in the order of the input jobs
+    # with the number of instances of each job in the hyper-period of all jobs
+    scheduled_jobs = {}
+    for cluster_jobs, _, _, _ in cluster_results:
+        scheduled_jobs |= cluster_jobs
+    scheduled_jobs = {job_name: scheduled_jobs[job_name] for job_name in jobs.keys()}
+    for job in scheduled_jobs.values():
+        job["instances"] = hyper_period // job["period"]
+    print("Feasible schedule found.", file=sys.stderr)
+    return scheduled_jobs
 
-            # Make job intervals optional on what machine they are scheduled on
-            for instance_idx in range(interval_instance_start_idx, job["instances"]):
-                machine_job_instance_interval_var = model.new_optional_interval_var(
-                    job["start_time_var"]
-                    + instance_idx * job["period"]
-                    - machine["setup_time"],
-                    machine["setup_time"] + processing_time + machine["teardown_time"],
-                    job["start_time_var"]
-                    + processing_time
-                    + instance_idx * job["period"]
-                    + machine["teardown_time"],
-                    job["machine_vars"][machine_name],
-                    f"machine_{machine_name}_job_{job_name}_instance_{instance_idx}_interval",
-                )
 
-                # Add job instance interval var to the machine's interval vars
-                machine["interval_vars"].append(machine_job_instance_interval_var)
+class Scheduler:
+    # Schedule the same machines and jobs again and again with changes in between, keeping the model alive between solves
+    # The schedule input is copied once and never changed by solving, unlike with schedule()
+    # Every group of constraints from the input is guarded by a literal keyed by its toml key as when diagnosing, e.g. jobs.j3.deadline or machines.m1,
+    # which is fixed to hold or not before each solve, so specifying the start time, completion time, or machine of a job
+    # and enabling or disabling a group of constraints does not rebuild the model
+    # Adding or removing a job changes the hyper-period and the instances of every job related to it,
+    # so the model is rebuilt on the next solve instead, hinted with the last schedule found
+    # Raises ScheduleInputError if the input or a change to it is not valid
 
-    # Add no overlap for intervals on the same machine
-    for machine_name, machine in machines.items():
-        model.add_no_overlap(machine["interval_vars"])
+    def __init__(self, schedule_input, previous_schedule=None):
+        # Machine pools are replaced by their machines, so that a job can be specified to run on one of them between solves
+        check_input_tables(schedule_input)
+        self.pool_machines = {
+            machine_name: pool_machine_names(machine_name, machine)
+            for machine_name, machine in schedule_input.get("machines", {}).items()
+            if len(pool_machine_names(machine_name, machine)) > 0
+        }
+        self.schedule_input = expand_machine_pools(schedule_input)
+        self.previous_schedule = previous_schedule
+        # The last schedule found and the status of the last solve
+        self.jobs = None
+        self.status = None
+        # Names of the groups of constraints that do not hold
+        self.disabled_names = set()
+        self.model_state = None
+        self.build()
 
-    # Determine if a machine is utilized
-    # Used for number of machine minimization
-    for machine_name, machine in machines.items():
-        machine["is_utilized_var"] = model.new_bool_var(
-            f"is_machine_{machine_name}_utilized"
+    def build(self):
+        # Build the model from a copy of the input, hinted with the last schedule found if any
+        model_state = {}
+        schedule(
+            copy.deepcopy(self.schedule_input),
+            previous_schedule=(
+                list(self.jobs.values())
+                if self.jobs is not None
+                else self.previous_schedule
+            ),
+            model_state=model_state,
         )
-        # If the number of jobs on a machine is greater than 0, then the machine is utilized
-        model.add(
-            sum(job["machine_vars"][machine_name] for job in jobs.values()) > 0
-        ).only_enforce_if(machine["is_utilized_var"])
-        # If the number of jobs on a machine is equal than 0, then the machine is not utilized
-        model.add(
-            sum(job["machine_vars"][machine_name] for job in jobs.values()) == 0
-        ).only_enforce_if(~machine["is_utilized_var"])
+        self.model_state = model_state
+        # Literals of replaced constraints, which never hold again
+        self.replaced_literals = []
+        # Solves add objectives and bounds to the model, so keep a copy of the model to start every solve from
+        self.model_proto = type(model_state["model"].proto)()
+        self.model_proto.CopyFrom(model_state["model"].proto)
 
-    # Ensure the same/different machine job constraints are respected
-    for job_name, job in jobs.items():
-        for same_machine_job_name in job["same_machine_jobs"]:
-            # Recover same machine job
-            same_machine_job = jobs[same_machine_job_name]
-            # Ensure that the machine vars for coincident machines align for both jobs
-            # If the job is not specified to run on any of the same machines as the same machine job then exit
-            at_least_one_common_machine = False
-            for machine_name, machine_var in job["machine_vars"].items():
-                if machine_name in same_machine_job["processing_times"]:
-                    model.add(
-                        machine_var == same_machine_job["machine_vars"][machine_name]
-                    )
-                    at_least_one_common_machine = True
-            if at_least_one_common_machine == False:
-                print(
-                    f"Job {job_name} is not specified to run on any of the same machines that job {same_machine_job_name} is specified for!",
-                    file=sys.stderr,
-                )
-                sys.exit()
+    @property
+    def constraint_names(self):
+        # Names of the groups of constraints that can be enabled or disabled
+        if self.model_state is None:
+            self.build()
+        return list(self.model_state["diagnosis_literals"].keys())
 
-        for different_machine_job_name in job["different_machine_jobs"]:
-            # Recover different machine job
-            different_machine_job = jobs[different_machine_job_name]
-            # Ensure that the machine vars for coincident machines do not align for both jobs
-            for machine_name, machine_var in job["machine_vars"].items():
-                if machine_name in different_machine_job["processing_times"]:
-                    model.add(
-                        machine_var
-                        != different_machine_job["machine_vars"][machine_name]
-                    ).only_enforce_if(machine_var)
+    def check_job(self, job_name):
+        if job_name not in self.schedule_input.get("jobs", {}).keys():
+            raise ScheduleInputError([f"Job {job_name} does not exist!"])
 
-    # Precedence of jobs running at different periods can be hard to reason about.
-    # The following rationale for time lags and slack times is used here, where we do not discuss the different periods between the predecessor and successor, but rather focus on if for all successor job instances of any predecessor job instance satisfy the constraint. If so, then the precedence relationship is respected.
-    # Time Lag: The time lag precedence relationship means that a successor job can only start a certain time lag after the predecessor job has completed. In the periodic case, for all successor job instances, if any instance of the predecessor job has completed before the time lag but after a previous successor job instance, then the precedence relationship has been met. This logic can be simplified to only check the immediate predecessor. Note the additional clause to check only the immediate     predecessor job instance and not any before. This ensures that we are not checking the first predecessor job instance, which would trivially satisfy the constraint for all successor job instances thereafter. Also note the following, resulting from the logic above. A job with a smaller period cannot be a successor to a job with a higher period.
-    # Slack Time: While it may be harder to comprehend, the slack time constraint is simpler to implement. The slack time precedence relationship means that a successor job must start within the slack time after the predecessor job has finished. In the periodic case, for all successor job instances, if any predecessor job instance is within the slack time and occurs before the successor job instance, then the slack time precedence relationship has been met.
+    def add_job(self, job_name, job):
+        # Add a job, given as in the input, the model is rebuilt on the next solve
+        if job_name in self.schedule_input.setdefault("jobs", {}).keys():
+            raise ScheduleInputError([f"Job {job_name} already exists!"])
+        self.schedule_input["jobs"][job_name] = expand_pool_job(
+            copy.deepcopy(job), self.pool_machines
+        )
+        self.model_state = None
 
-    # To add precedence constraints run a second pass through the jobs
-    # to ensure all the jobs' start time and processing time variables have been created
-    # These contraints need to look through all predecessor instances to ensure that at least one predecessor instance satisfies the constraint for each successor instance in the hyper-period
-    # If a job specifies a time lag and a slack time for the same predecessor job,
-    # an additional constraint is added that ensures the time lag and slack time constraints are both applied on the same predecessor instance
-    for successor_job_name, successor_job in jobs.items():
-        for predecessor_job_name, pred_characteristics in successor_job[
-            "predecessors"
-        ].items():
-            # Get the predecessor job and its characteristics
-            predecessor_job = jobs[predecessor_job_name]
-            start_time_wrt = pred_characteristics.get("start_time_wrt")
-            completion_time_wrt = pred_characteristics.get("completion_time_wrt")
-            time_lag = pred_characteristics.get("time_lag")
-            slack_time = pred_characteristics.get("slack_time")
+    def remove_job(self, job_name):
+        # Remove a job along with every relation of other jobs to it, the model is rebuilt on the next solve
+        self.check_job(job_name)
+        del self.schedule_input["jobs"][job_name]
+        for job in self.schedule_input["jobs"].values():
+            job.get("predecessors", {}).pop(job_name, None)
+            for related_jobs_key in ["same_machine_jobs", "different_machine_jobs"]:
+                related_job_names = job.get(related_jobs_key, [])
+                if isinstance(related_job_names, str):
+                    related_job_names = [related_job_names]
+                job[related_jobs_key] = [
+                    related_job_name
+                    for related_job_name in related_job_names
+                    if related_job_name != job_name
+                ]
+        self.model_state = None
 
-            # Ensure the start time of the successor job with respect to the completion time of the predecessor is respected
-            if start_time_wrt is not None:
-                # Define the start time with respect to variable as the specified start time with respect to
-                pred_characteristics["start_time_wrt_var"] = model.new_constant(
-                    start_time_wrt
-                )
+    def guard(self, name, constraint):
+        # Add a constraint guarded by a new literal for the group of constraints of the given name, replacing the previous group
+        model = self.model_state["model"]
+        model.proto.CopyFrom(self.model_proto)
+        diagnosis_literals = self.model_state["diagnosis_literals"]
+        if name in diagnosis_literals.keys():
+            self.replaced_literals.append(diagnosis_literals[name])
+        literal = model.new_bool_var(f"assume_{name}")
+        model.add(constraint).only_enforce_if(literal)
+        diagnosis_literals[name] = literal
+        self.model_proto.CopyFrom(model.proto)
 
-                for successor_instance_idx in range(successor_job["instances"]):
-                    # Create list to hold whether a predecessor instance satisfies the start time with respect to a successor instance
-                    predecessor_start_time_wrt_satisifed = []
+    def fix_job(self, job_name, start_time=None, completion_time=None, machine=None):
+        # Specify the start time, completion time, and/or machine of a job, replacing what was specified before
+        self.check_job(job_name)
+        input_job = self.schedule_input["jobs"][job_name]
+        if machine is not None and machine not in self.schedule_input.get(
+            "machines", {"machine": {}}
+        ):
+            raise ScheduleInputError(
+                [
+                    f"Job {job_name} is specified to run on machine {machine} but that machine is not specified!"
+                ]
+            )
+        if start_time is not None:
+            input_job["start_time"] = start_time
+        if completion_time is not None:
+            input_job["completion_time"] = completion_time
+        if machine is not None:
+            input_job["machine"] = machine
+        for key, value in [
+            ("start_time", start_time),
+            ("completion_time", completion_time),
+            ("machine", machine),
+        ]:
+            if value is not None:
+                self.disabled_names.discard(f"jobs.{job_name}.{key}")
+        if self.model_state is None:
+            return
 
-                    for predecessor_instance_idx in range(
-                        predecessor_instance_start_idx, predecessor_job["instances"]
-                    ):
-                        # Boolean variable to keep track if a particular predecessor job instance satisfies the start time with respect to constraint for a successor job instance
-                        start_time_wrt_satisfied = model.new_bool_var(
-                            f"successor_{successor_job_name}_instance_{successor_instance_idx}_predecessor_{predecessor_job_name}_instance_{predecessor_instance_idx}_start_time_wrt"
-                        )
-                        predecessor_start_time_wrt_satisifed.append(
-                            start_time_wrt_satisfied
-                        )
+        job = self.model_state["jobs"][job_name]
+        if machine is not None and machine not in job["processing_times"].keys():
+            raise ScheduleInputError(
+                [
+                    f"Job {job_name} is specified to run on machine {machine} for which a processing time is not specified!"
+                ]
+            )
+        if start_time is not None:
+            self.guard(
+                f"jobs.{job_name}.start_time",
+                job["start_time_var"] == start_time % job["period"],
+            )
+        # Since completion time is defined as [1, job's period] modify the modulo output
+        # to give job's period when the result would be 0 (outside of the range)
+        if completion_time is not None:
+            self.guard(
+                f"jobs.{job_name}.completion_time",
+                job["completion_time_var"]
+                == (
+                    completion_time % job["period"]
+                    if completion_time % job["period"] != 0
+                    else job["period"]
+                ),
+            )
+        if machine is not None:
+            self.guard(f"jobs.{job_name}.machine", job["machine_vars"][machine] == True)
 
-                        # Ensure the successor instance starts after the predecessor instance completes with an offset
-                        model.add(
-                            predecessor_job["completion_time_var"]
-                            + predecessor_instance_idx * predecessor_job["period"]
-                            + pred_characteristics["start_time_wrt"]
-                            == successor_job["start_time_var"]
-                            + successor_instance_idx * successor_job["period"]
-                        ).only_enforce_if(start_time_wrt_satisfied)
+    def release_job(self, job_name):
+        # Leave the start time, completion time, and machine of a job to be solved for
+        self.check_job(job_name)
+        for key in ["start_time", "completion_time", "machine"]:
+            self.schedule_input["jobs"][job_name].pop(key, None)
+            self.disabled_names.add(f"jobs.{job_name}.{key}")
 
-                    # Ensure that at least one predecessor instance satisfies the start time with respect to constraint
-                    model.add_bool_or(predecessor_start_time_wrt_satisifed)
+    def disable(self, name):
+        # Drop the group of constraints of the given name, e.g. jobs.j3.deadline
+        if name not in self.constraint_names:
+            raise ScheduleInputError([f"Constraint {name} does not exist!"])
+        self.disabled_names.add(name)
 
-            # Ensure the completion time of the successor job with respect to the completion time of the predecessor is respected
-            if completion_time_wrt is not None:
-                # Define the completion time with respect to variable as the specified completion time with respect to
-                pred_characteristics["completion_time_wrt_var"] = model.new_constant(
-                    completion_time_wrt
-                )
+    def enable(self, name):
+        # Enforce the group of constraints of the given name again
+        if name not in self.constraint_names:
+            raise ScheduleInputError([f"Constraint {name} does not exist!"])
+        self.disabled_names.discard(name)
 
-                for successor_instance_idx in range(successor_job["instances"]):
-                    # Create list to hold whether a predecessor instance satisfies the completion time with respect to a successor instance
-                    predecessor_completion_time_wrt_satisifed = []
+    def fix_literals(self, model):
+        # Copy the model kept between solves into the given model
+        # and fix every literal to whether its group of constraints holds, so that presolve removes the groups that do not
+        model.proto.CopyFrom(self.model_proto)
+        for name, literal in self.model_state["diagnosis_literals"].items():
+            holds = int(name not in self.disabled_names)
+            model.proto.variables[literal.index].domain[:] = [holds, holds]
+        for literal in self.replaced_literals:
+            model.proto.variables[literal.index].domain[:] = [0, 0]
 
-                    for predecessor_instance_idx in range(
-                        predecessor_instance_start_idx, predecessor_job["instances"]
-                    ):
-                        # Boolean variable to keep track if a particular predecessor job instance satisfies the completion time with respect to constraint for a successor job instance
-                        completion_time_wrt_satisfied = model.new_bool_var(
-                            f"successor_{successor_job_name}_instance_{successor_instance_idx}_predecessor_{predecessor_job_name}_instance_{predecessor_instance_idx}_completion_time_wrt"
-                        )
-                        predecessor_completion_time_wrt_satisifed.append(
-                            completion_time_wrt_satisfied
-                        )
+    def solve(self, stats=None, on_solution=None, pareto_front=None):
+        # Solve for a schedule with the current changes, see schedule() for the arguments
+        # Returns the schedule, which is kept as the last schedule found, or None if no schedule is found
+        if self.model_state is None:
+            self.build()
+        model = self.model_state["model"]
+        self.fix_literals(model)
 
-                        # Ensure the successor instance completes after the predecessor instance completes with an offset
-                        model.add(
-                            predecessor_job["completion_time_var"]
-                            + predecessor_instance_idx * predecessor_job["period"]
-                            + pred_characteristics["completion_time_wrt_var"]
-                            == successor_job["completion_time_var"]
-                            + successor_instance_idx * successor_job["period"]
-                        ).only_enforce_if(completion_time_wrt_satisfied)
+        # Hint the start time and machine of each job from the last schedule found
+        if self.jobs is not None:
+            model.clear_hints()
+            for job_name, job in self.model_state["jobs"].items():
+                if job_name not in self.jobs.keys():
+                    continue
+                scheduled_job = self.jobs[job_name]
+                model.add_hint(
+                    job["start_time_var"], scheduled_job["start_time"] % job["period"]
+                )
+                for machine_name, machine_var in job["machine_vars"].items():
+                    model.add_hint(
+                        machine_var, machine_name == scheduled_job["machine"]
+                    )
 
-                    # Ensure that at least one predecessor instance satisfies the completion time with respect to constraint
-                    model.add_bool_or(predecessor_completion_time_wrt_satisifed)
+        jobs = solve_model_state(
+            self.model_state,
+            stats=stats,
+            on_solution=on_solution,
+            pareto_front=pareto_front,
+        )
+        self.status = self.model_state["status"]
+        if jobs is not None:
+            self.jobs = jobs
+        return jobs
 
-            # Ensure the time lag + slack time is respected with the same predecessor instance if both specified for the same predecessor
-            if time_lag is not None and slack_time is not None:
-                for successor_instance_idx in range(successor_job["instances"]):
-                    # Create list to hold whether a predecessor instance satisfies the time lag and slack time constraint for a successor instance
-                    predecessor_lag_slack_satisifed = []
 
-                    for predecessor_instance_idx in range(
-                        predecessor_instance_start_idx, predecessor_job["instances"]
-                    ):
-                        # Boolean variable to keep track if a particular predecessor job instance satisfies the time lag + slack time constraint for a successor job instance
-                        lag_slack_satisfied = model.new_bool_var(
-                            f"successor_{successor_job_name}_instance_{successor_instance_idx}_predecessor_{predecessor_job_name}_instance_{predecessor_instance_idx}_time_lag_slack_time"
-                        )
-                        predecessor_lag_slack_satisifed.append(lag_slack_satisfied)
-                        # Reify the time lag + slack time constraint
-                        # 1st condition: Ensure the predecessor instance occurs before the successor instance
-                        model.add(
-                            predecessor_job["completion_time_var"]
-                            + predecessor_instance_idx * predecessor_job["period"]
-                            + time_lag
-                            <= successor_job["start_time_var"]
-                            + successor_instance_idx * successor_job["period"]
-                        ).only_enforce_if(lag_slack_satisfied)
-                        # 2nd condition: Ensure the successor instance occurs within the slack of the predecessor instance
-                        model.add(
-                            predecessor_job["completion_time_var"]
-                            + predecessor_instance_idx * predecessor_job["period"]
-                            + slack_time
-                            >= successor_job["start_time_var"]
-                            + successor_instance_idx * successor_job["period"]
-                        ).only_enforce_if(lag_slack_satisfied)
-
-                    # Ensure that at least one predecessor instance satisfies the time lag + slack time constraint
-                    model.add_bool_or(predecessor_lag_slack_satisifed)
+def lns_neighborhood(
+    kind, rng, jobs, assignments, hyper_period, size, taken_job_names, successors
+):
+    # Pick the names of the jobs freed by a neighborhood of the given kind, leaving out the jobs freed by other neighborhoods solved alongside it
+    # A machine neighborhood frees jobs on a random machine and a window neighborhood frees jobs on any machine,
+    # in both cases the jobs with an instance starting soonest after a random time of the hyper-period
+    # A chain neighborhood frees a random job along with the jobs related to it by precedence relations, nearest first
+    # Returns an empty list if no job is left to free
+    candidate_job_names = [
+        job_name for job_name in jobs.keys() if job_name not in taken_job_names
+    ]
+    if len(candidate_job_names) == 0:
+        return []
 
-            # Ensure the time lags are respected
-            if time_lag is not None:
-                for successor_instance_idx in range(successor_job["instances"]):
-                    # Create list to hold whether a predecessor instance satisfies the time lag constraint for a successor instance
-                    predecessor_lag_satisfied = []
+    if kind == "chain":
+        first_job_name = rng.choice(candidate_job_names)
+        job_names = [first_job_name]
+        seen_job_names = {first_job_name}
+        job_idx = 0
+        while job_idx < len(job_names) and len(job_names) < size:
+            job_name = job_names[job_idx]
+            job_idx += 1
+            for related_job_name in (
+                list(jobs[job_name]["predecessors"].keys()) + successors[job_name]
+            ):
+                if (
+                    related_job_name not in seen_job_names
+                    and related_job_name not in taken_job_names
+                ):
+                    seen_job_names.add(related_job_name)
+                    job_names.append(related_job_name)
+        return job_names[:size]
 
-                    for predecessor_instance_idx in range(
-                        predecessor_instance_start_idx, predecessor_job["instances"]
-                    ):
-                        # Boolean variable to keep track if a particular predecessor job instance satisfies the time lag constraint for a successor job instance
-                        lag_satisfied = model.new_bool_var(
-                            f"successor_{successor_job_name}_instance_{successor_instance_idx}_predecessor_{predecessor_job_name}_instance_{predecessor_instance_idx}_time_lag"
-                        )
-                        predecessor_lag_satisfied.append(lag_satisfied)
-
-                        # Reify the time lag constraint
-                        # 1st condition: Ensure the predecessor instance occurs before the successor instance
-                        model.add(
-                            predecessor_job["completion_time_var"]
-                            + predecessor_instance_idx * predecessor_job["period"]
-                            + time_lag
-                            <= successor_job["start_time_var"]
-                            + successor_instance_idx * successor_job["period"]
-                        ).only_enforce_if(lag_satisfied)
-                        # 2nd condition: Ensure the predecessor instance occurs within one successor period
-                        model.add(
-                            predecessor_job["completion_time_var"]
-                            + predecessor_instance_idx * predecessor_job["period"]
-                            + successor_job["period"]
-                            <= successor_job["start_time_var"]
-                            + (successor_instance_idx + 1) * successor_job["period"]
-                        ).only_enforce_if(lag_satisfied)
-
-                    # Ensure that at least one predecessor instance satisfies the time lag constraint
-                    # As this statement is in a successor instance for loop, We add this constraint for every successor instance
-                    model.add_bool_or(predecessor_lag_satisfied)
+    if kind == "machine":
+        machine_name = rng.choice(
+            sorted({assignments[job_name][1] for job_name in candidate_job_names})
+        )
+        candidate_job_names = [
+            job_name
+            for job_name in candidate_job_names
+            if assignments[job_name][1] == machine_name
+        ]
+    # An instance of a job starts at its start time plus a multiple of its period, so the wait for its next instance is modulo its period
+    window_start_time = rng.randrange(hyper_period)
+    return sorted(
+        candidate_job_names,
+        key=lambda job_name: (
+            (assignments[job_name][0] - window_start_time) % jobs[job_name]["period"],
+            job_name,
+        ),
+    )[:size]
 
-            # Ensure the slack times are respected
-            if slack_time is not None:
-                for successor_instance_idx in range(successor_job["instances"]):
-                    # Create list to hold whether a predecessor instance satisfies the slack time constraint for a successor instance
-                    predecessor_slack_satisfied = []
 
-                    for predecessor_instance_idx in range(
-                        predecessor_instance_start_idx, predecessor_job["instances"]
-                    ):
-                        # Boolean variable to keep track if a particular predecessor job instance satisfies the slack time constraint for a successor job instance
-                        slack_satisfied = model.new_bool_var(
-                            f"successor_{successor_job_name}_instance_{successor_instance_idx}_predecessor_{predecessor_job_name}_instance_{predecessor_instance_idx}_slack_time"
-                        )
-                        predecessor_slack_satisfied.append(slack_satisfied)
-
-                        # Find any previous predecessor instance for which the slack time constraint holds
-                        # Reify the slack time constraint
-                        # 1st condition: Ensure the successor instance occurs within the slack of the predecessor instance
-                        model.add(
-                            predecessor_job["completion_time_var"]
-                            + predecessor_instance_idx * predecessor_job["period"]
-                            + slack_time
-                            >= successor_job["start_time_var"]
-                            + successor_instance_idx * successor_job["period"]
-                        ).only_enforce_if(slack_satisfied)
-                        # 2nd condition: Ensure the predecessor instance occurs within one successor period
-                        model.add(
-                            predecessor_job["completion_time_var"]
-                            + predecessor_instance_idx * predecessor_job["period"]
-                            + successor_job["period"]
-                            <= successor_job["start_time_var"]
-                            + (successor_instance_idx + 1) * successor_job["period"]
-                        ).only_enforce_if(slack_satisfied)
-
-                    # Every successor instance needs to have at least one predecessor instance for which the slack time constraint is satisfied by
-                    model.add_bool_or(predecessor_slack_satisfied)
+def lns_assignments(solver, jobs, job_names):
+    # Recover the start time and machine of each of the given jobs from the last solution of the solver
+    return {
+        job_name: (
+            solver.value(jobs[job_name]["start_time_var"]),
+            next(
+                machine_name
+                for machine_name, machine_var in jobs[job_name]["machine_vars"].items()
+                if solver.value(machine_var) == True
+            ),
+        )
+        for job_name in job_names
+    }
 
-            # For the purposes of minimization, if the completion_time_wrt is not specified, then compute the value of completion_time_wrt
-            if completion_time_wrt is None:
-                pred_characteristics["completion_time_wrt_var"] = model.new_int_var(
-                    0,
-                    hyper_period,
-                    f"successor_{successor_job_name}_predecessor_{predecessor_job_name}_completion_time_wrt",
-                )
-                # Ensure the completion_time_wrt is at least the processing time of the job
-                model.add(
-                    pred_characteristics["completion_time_wrt_var"]
-                    >= successor_job["processing_time_var"]
-                )
 
-                # Introduce an intermediate completion time wrt as a value to capture the one way difference between successor and predecessor
-                # By adding a modulo equality, we ensure completion time wrt is always positive
-                # This is to handle the case when the immediate predecessor for successor completes in the previous period
-                # In such a case the completion time of tthe successor minus the completion time of the predecessor is negative,
-                # Taking the modulo of the above difference with the period ensures that we have a positive value to minimize
-                pred_characteristics["dividend_completion_time_wrt_var"] = (
-                    model.new_int_var(
-                        0,
-                        hyper_period,
-                        f"successor_{successor_job_name}_predecessor_{predecessor_job_name}_dividend_completion_time_wrt",
-                    )
-                )
-                model.add_modulo_equality(
-                    pred_characteristics["completion_time_wrt_var"],
-                    pred_characteristics["dividend_completion_time_wrt_var"],
-                    predecessor_job["period"],
-                )
+def solve_lns_subproblem(
+    cp_model,
+    model_proto,
+    jobs,
+    assignments,
+    free_job_names,
+    solver_parameters,
+    time_limit,
+):
+    # Solve the model with the start time and machine of every job but the free ones fixed as in the assignments,
+    # by fixing the domains of their variables so that presolve removes them, and with the free ones hinted as in the assignments
+    # Each subproblem is solved on its own copy of the model, so that subproblems can be solved in parallel
+    # Returns the solver, whose last solution is the one of the subproblem
+    model = cp_model.CpModel()
+    model.proto.CopyFrom(model_proto)
+    free_job_names = set(free_job_names)
+    for job_name, job in jobs.items():
+        start_time, machine_name = assignments[job_name]
+        if job_name in free_job_names:
+            model.add_hint(job["start_time_var"], start_time)
+            for job_machine_name, machine_var in job["machine_vars"].items():
+                model.add_hint(machine_var, job_machine_name == machine_name)
+            continue
+        model.proto.variables[job["start_time_var"].index].domain[:] = [
+            start_time,
+            start_time,
+        ]
+        for job_machine_name, machine_var in job["machine_vars"].items():
+            value = int(job_machine_name == machine_name)
+            model.proto.variables[machine_var.index].domain[:] = [value, value]
 
-                # If succ and pred have the same period, then just check the first period
-                if predecessor_job["period"] == successor_job["period"]:
-                    model.add(
-                        pred_characteristics["dividend_completion_time_wrt_var"]
-                        == successor_job["completion_time_var"]
-                        - predecessor_job["completion_time_var"]
-                    )
+    solver = cp_model.CpSolver()
+    for key, value in solver_parameters.items():
+        setattr(solver.parameters, key, value)
+    solver.parameters.max_time_in_seconds = time_limit
+    solver.Solve(model)
+    return solver
 
-                # If succ and pred do not have the same period and we still want to minimize the completion time wrt,
-                # Then formulate the constraints for each instance of the successor in the hyper-period (similar to slack time),
-                # but instead of using the slack time use the completion_time_wrt variable,
-                # And when minimizing the completion_time_wrt, take the average of all completion_time_wrt
-                # This should ensure that the completion_time_wrt corresponds to value that is from the successor instance to the previously immediate predecessor instance
-                elif pred_characteristics["completion_time_wrt_weight"] != 0:
-                    print(
-                        "Multiperiod completion time wrt weight not supported",
-                        file=sys.stderr,
-                    )
-                    print(
-                        f"Offending jobs: {predecessor_job_name} and {successor_job_name}",
-                        file=sys.stderr,
-                    )
-                    sys.exit()
-                    for successor_instance_idx in range(successor_job["instances"]):
-                        pass
 
-    # Define intermediary variables for the objective function
-    for job in jobs.values():
-        job["flow_time_var"] = (
-            job["start+processing_time_var"] - job["release_time"]
-            if job["release_time"] is not None
-            else None
-        )
-        job["earliness_var"] = (
-            job["deadline"] - job["completion_time_var"]
-            if job["deadline"] is not None
-            else None
+def schedule_lns(
+    schedule_input,
+    neighborhoods=None,
+    neighborhood_size=100,
+    neighborhood_time_limit=2.0,
+    stats=None,
+    previous_schedule=None,
+    on_solution=None,
+    **schedule_kwargs,
+):
+    # Schedule with a large neighborhood search, which improves a first feasible schedule by solving small subproblems of the model,
+    # as the whole model of thousands of jobs rarely gets to a good schedule within the time limit
+    # Each subproblem frees a neighborhood of jobs, i.e. jobs of a machine, jobs of a window of the hyper-period, or a chain of precedence relations,
+    # fixes the start time and machine of every other job, and is solved hinted with the current schedule, see lns_neighborhood()
+    # Neighborhoods of disjoint jobs are solved in parallel and the schedules of the ones that improve are merged as long as the merged schedule is better
+    # Each kind of neighborhood is picked with its rate of improving the schedule, smoothed so that no kind is ever left out,
+    # and its size grows when its subproblems are solved to optimality without improving the schedule and shrinks when they run out of time
+    # The search runs for max_time_in_seconds of the solver parameters, 60 seconds if not specified, or until no better schedule is found for stop_stall_time seconds
+    # Machine pools are replaced by their machines as with a Scheduler
+    # Falls back to schedule() for other objective modes than the weighted one, for verifying and diagnosing, and for fixing unchanged jobs
+    check_input_tables(schedule_input)
+    if (
+        schedule_input.get("objective_mode", "weighted") != "weighted"
+        or schedule_kwargs.get("verify_only")
+        or schedule_kwargs.get("diagnose")
+        or schedule_kwargs.get("minimize_diagnosis")
+        or schedule_kwargs.get("fix_unchanged_jobs")
+        or schedule_kwargs.get("pareto_front") is not None
+    ):
+        return schedule(
+            schedule_input,
+            stats=stats,
+            previous_schedule=previous_schedule,
+            on_solution=on_solution,
+            **schedule_kwargs,
         )
 
-    model.minimize(
-        # Minimize the completion time
-        sum(
-            job["completion_time_weight"] * job["start+processing_time_var"]
-            for job in jobs.values()
-        )
-        # Minimize the flow time
-        + sum(
-            job["flow_time_weight"] * job["flow_time_var"]
-            for job in jobs.values()
-            if job["flow_time_var"] is not None
-        )
-        # Minimize the earliness
-        + sum(
-            job["earliness_weight"] * job["earliness_var"]
-            for job in jobs.values()
-            if job["earliness_var"] is not None
-        )
-        # Minimize the completion time with respect to predecessors
-        + sum(
-            pred_characteristics["completion_time_wrt_weight"]
-            * pred_characteristics["completion_time_wrt_var"]
-            for job in jobs.values()
-            for pred_characteristics in job["predecessors"].values()
-            if pred_characteristics["completion_time_wrt_var"] is not None
-        )
-        # Minimize the number of machines
-        + num_machines_weight
-        * sum(machine["is_utilized_var"] for machine in machines.values())
-        # Minimize specific machines
-        + sum(
-            machine["machine_weight"] * machine["is_utilized_var"]
-            for machine in machines.values()
+    from ortools.sat.python import cp_model
+
+    lns_start_time = time.perf_counter()
+    scheduler = Scheduler(schedule_input, previous_schedule)
+    model_state = scheduler.model_state
+    model_jobs = model_state["jobs"]
+    solver_parameters = dict(model_state["solver_parameters"])
+    time_limit = solver_parameters.pop("max_time_in_seconds", 60)
+    stop_stall_time = model_state["stop_stall_time"]
+
+    # Start from the first feasible schedule found by solving the whole model
+    model_state["solver_parameters"] = solver_parameters | {
+        "max_time_in_seconds": time_limit,
+        "stop_after_first_solution": True,
+    }
+    jobs = scheduler.solve(stats=stats)
+    first_status_name = scheduler.status
+    if jobs is None or first_status_name == "OPTIMAL":
+        if jobs is not None and on_solution is not None:
+            on_solution(
+                jobs,
+                {
+                    "solution": 1,
+                    "wall_time": time.perf_counter() - lns_start_time,
+                    "objective": stats.get("objective") if stats is not None else None,
+                    "best_objective_bound": None,
+                },
+            )
+        return jobs
+
+    # Share the cores between the neighborhoods solved in parallel unless the number of workers is specified
+    if neighborhoods is None:
+        neighborhoods = os.cpu_count()
+    neighborhoods = max(1, min(neighborhoods, len(model_jobs)))
+    subproblem_parameters = solver_parameters | {
+        "num_workers": solver_parameters.get(
+            "num_workers", max(1, os.cpu_count() // neighborhoods)
         )
+    }
+
+    # Every subproblem is solved from the model with the literals of its groups of constraints fixed, without the hints of the model
+    base_model = cp_model.CpModel()
+    scheduler.fix_literals(base_model)
+    base_model.clear_hints()
+    model_proto = base_model.proto
+
+    # The schedule is kept as the start time and machine of each job, which is all that a subproblem fixes
+    # Solving with every job fixed recovers the objective of a schedule
+    assignments = {
+        job_name: (job["start_time"] % model_jobs[job_name]["period"], job["machine"])
+        for job_name, job in jobs.items()
+    }
+    solver = solve_lns_subproblem(
+        cp_model,
+        model_proto,
+        model_jobs,
+        assignments,
+        [],
+        subproblem_parameters,
+        time_limit,
     )
+    # A schedule whose objective cannot be recovered, e.g. when the time limit runs out first, gives no objective to improve on
+    if solver.status_name() != "OPTIMAL":
+        print(
+            f"Recovering the objective of the first schedule ended with status {solver.status_name()}, so it is not improved by large neighborhood search.",
+            file=sys.stderr,
+        )
+        if on_solution is not None:
+            on_solution(
+                jobs,
+                {
+                    "solution": 1,
+                    "wall_time": time.perf_counter() - lns_start_time,
+                    "objective": stats.get("objective") if stats is not None else None,
+                    "best_objective_bound": None,
+                },
+            )
+        return jobs
+    objective = solver.objective_value
+    first_objective = objective
 
-    solver = cp_model.CpSolver()
+    num_solutions = 1
 
-    # Read solver parameters if they exist
-    if "solver" not in schedule_input.keys():
-        solver_parameters = {}
-    elif "parameters" not in schedule_input["solver"].keys():
-        solver_parameters = {}
-    else:
-        solver_parameters = schedule_input["solver"]["parameters"]
+    def stream_schedule():
+        if on_solution is not None:
+            on_solution(
+                jobs,
+                {
+                    "solution": num_solutions,
+                    "wall_time": time.perf_counter() - lns_start_time,
+                    "objective": objective,
+                    "best_objective_bound": None,
+                },
+            )
 
-    # Set solver parameters
-    for key, value in solver_parameters.items():
-        setattr(solver.parameters, key, value)
+    stream_schedule()
 
-    solver.Solve(model)
-    status_name = solver.status_name()
+    # Chains of precedence relations are only a kind of neighborhood if there are any
+    successors = {job_name: [] for job_name in model_jobs.keys()}
+    for job_name, job in model_jobs.items():
+        for pred_job_name in job["predecessors"].keys():
+            successors[pred_job_name].append(job_name)
+    kinds = ["machine", "window"]
+    if any(len(job_successors) > 0 for job_successors in successors.values()):
+        kinds.append("chain")
+    kind_stats = {
+        kind: {
+            "attempts": 0,
+            "improvements": 0,
+            "neighborhood_size": max(1, min(neighborhood_size, len(model_jobs))),
+        }
+        for kind in kinds
+    }
+    hyper_period = math.lcm(*[job["period"] for job in model_jobs.values()])
+    rng = random.Random(solver_parameters.get("random_seed", 0))
 
-    # Retrieve solution
-    if status_name == "OPTIMAL" or status_name == "FEASIBLE":
-        # If start times or completion times and machine names specified for all jobs, then the input was feasible
-        if all(
-            [
-                job["start_time"] is not None
-                or job["completion_time"] is not None
-                and job["machine"] is not None
-                for job in jobs.values()
-            ]
-        ):
-            print("Input schedule is feasible.", file=sys.stderr)
-        else:
-            print("Feasible schedule found.", file=sys.stderr)
+    rounds = 0
+    is_optimal = False
+    last_improvement_time = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=neighborhoods) as executor:
+        while not is_optimal:
+            remaining_time = time_limit - (time.perf_counter() - lns_start_time)
+            if remaining_time <= 0 or (
+                stop_stall_time is not None
+                and time.perf_counter() - last_improvement_time >= stop_stall_time
+            ):
+                break
 
-        for job_name, job in jobs.items():
-            job["start_time"] = solver.value(job["start_time_var"])
-            job["completion_time"] = solver.value(job["completion_time_var"])
-            # Recover the machine, the job is assigned on
-            for machine_name, machine_var in job["machine_vars"].items():
-                if solver.value(machine_var) == True:
-                    job["machine"] = machine_name
-            job["processing_time"] = solver.value(job["processing_time_var"])
-            job["flow_time"] = (
-                solver.value(job["flow_time_var"])
-                if job["flow_time_var"] is not None
-                else None
-            )
-            job["earliness"] = (
-                solver.value(job["earliness_var"])
-                if job["earliness_var"] is not None
-                else None
+            # Pick disjoint neighborhoods, each of a kind picked with its smoothed rate of improving the schedule
+            taken_job_names = set()
+            picked_neighborhoods = []
+            for _ in range(neighborhoods):
+                kind = rng.choices(
+                    kinds,
+                    weights=[
+                        (kind_stat["improvements"] + 1) / (kind_stat["attempts"] + 2)
+                        for kind_stat in kind_stats.values()
+                    ],
+                )[0]
+                free_job_names = lns_neighborhood(
+                    kind,
+                    rng,
+                    model_jobs,
+                    assignments,
+                    hyper_period,
+                    kind_stats[kind]["neighborhood_size"],
+                    taken_job_names,
+                    successors,
+                )
+                if len(free_job_names) == 0:
+                    break
+                taken_job_names.update(free_job_names)
+                picked_neighborhoods.append((kind, free_job_names))
+
+            subproblem_solvers = list(
+                executor.map(
+                    lambda free_job_names: solve_lns_subproblem(
+                        cp_model,
+                        model_proto,
+                        model_jobs,
+                        assignments,
+                        free_job_names,
+                        subproblem_parameters,
+                        min(neighborhood_time_limit, remaining_time),
+                    ),
+                    [free_job_names for _, free_job_names in picked_neighborhoods],
+                )
             )
-            for pred_characteristics in job["predecessors"].values():
-                pred_characteristics["completion_time_wrt"] = (
-                    solver.value(pred_characteristics["completion_time_wrt_var"])
-                    if pred_characteristics["completion_time_wrt_var"] is not None
-                    else None
-                )
-            # Get rid of variables in our job dictionary before output
-            job.pop("start_time_var", None)
-            job.pop("completion_time_var", None)
-            job.pop("machine_vars", None)
-            job.pop("processing_time_var", None)
-            job.pop("start+processing_time_var", None)
-            job.pop("flow_time_var", None)
-            job.pop("earliness_var", None)
-            for pred_characteristics in job["predecessors"].values():
-                pred_characteristics.pop("completion_time_wrt_var", None)
-                pred_characteristics.pop("dividend_completion_time_wrt_var", None)
-                pred_characteristics.pop("flow_time_wrt_var", None)
-                pred_characteristics.pop("earliness_wrt_var", None)
-
-            # Prepend the job name value under the job key for readability
-            jobs[job_name] = {"job": job_name} | jobs[job_name]
+            rounds += 1
 
-        return jobs
+            improving_neighborhoods = []
+            for (kind, free_job_names), solver in zip(
+                picked_neighborhoods, subproblem_solvers
+            ):
+                kind_stat = kind_stats[kind]
+                kind_stat["attempts"] += 1
+                status_name = solver.status_name()
+                if (
+                    status_name == "OPTIMAL" or status_name == "FEASIBLE"
+                ) and solver.objective_value < objective:
+                    kind_stat["improvements"] += 1
+                    improving_neighborhoods.append((free_job_names, solver))
+                elif status_name == "OPTIMAL":
+                    # A subproblem of every job that cannot improve the schedule proves that the schedule is optimal
+                    if len(free_job_names) == len(model_jobs):
+                        is_optimal = True
+                    kind_stat["neighborhood_size"] = min(
+                        len(model_jobs),
+                        max(
+                            kind_stat["neighborhood_size"] + 1,
+                            int(kind_stat["neighborhood_size"] * 1.2),
+                        ),
+                    )
+                if status_name != "OPTIMAL":
+                    kind_stat["neighborhood_size"] = max(
+                        1, int(kind_stat["neighborhood_size"] / 1.2)
+                    )
+            if len(improving_neighborhoods) == 0:
+                continue
 
-    elif status_name == "INFEASIBLE":
-        print("Input is not feasible!", file=sys.stderr)
-    else:
-        print(status_name, file=sys.stderr)
+            # Take the best schedule of a neighborhood and merge the schedules of the other neighborhoods into it one by one,
+            # keeping each merge that is feasible and better, as neighborhoods of disjoint jobs can still compete for the same machines and times
+            improving_neighborhoods.sort(
+                key=lambda neighborhood: neighborhood[1].objective_value
+            )
+            solver = improving_neighborhoods[0][1]
+            for free_job_names, other_solver in improving_neighborhoods[1:]:
+                merged_assignments = lns_assignments(
+                    solver, model_jobs, model_jobs.keys()
+                ) | lns_assignments(other_solver, model_jobs, free_job_names)
+                merged_solver = solve_lns_subproblem(
+                    cp_model,
+                    model_proto,
+                    model_jobs,
+                    merged_assignments,
+                    [],
+                    subproblem_parameters,
+                    max(0, time_limit - (time.perf_counter() - lns_start_time)),
+                )
+                if (
+                    merged_solver.status_name() == "OPTIMAL"
+                    and merged_solver.objective_value < solver.objective_value
+                ):
+                    solver = merged_solver
+            assignments = lns_assignments(solver, model_jobs, model_jobs.keys())
+            retrieve_solution(solver, model_jobs)
+            jobs = solution_snapshot(model_jobs)
+            objective = solver.objective_value
+            num_solutions += 1
+            last_improvement_time = time.perf_counter()
+            stream_schedule()
 
-    return None
+    # Report how often each kind of neighborhood improved the schedule
+    for kind, kind_stat in kind_stats.items():
+        kind_stat["success_rate"] = (
+            kind_stat["improvements"] / kind_stat["attempts"]
+            if kind_stat["attempts"] > 0
+            else None
+        )
+    print(
+        f"Large neighborhood search improved the objective from {first_objective} to {objective} in {rounds} rounds.",
+        file=sys.stderr,
+    )
+    for kind, kind_stat in kind_stats.items():
+        print(
+            f"  {kind} neighborhoods improved the schedule {kind_stat['improvements']} out of {kind_stat['attempts']} times.",
+            file=sys.stderr,
+        )
+    if stats is not None:
+        stats["status"] = "OPTIMAL" if is_optimal else "FEASIBLE"
+        stats["objective"] = objective
+        stats["lns"] = {
+            "first_objective": first_objective,
+            "rounds": rounds,
+            "solutions": num_solutions,
+            "wall_time": time.perf_counter() - lns_start_time,
+            "neighborhoods": kind_stats,
+        }
+    return jobs
 
 
 if __name__ == "__main__":
@@ -813,8 +5601,190 @@ if __name__ == "__main__":
         default="-",  # use "-" to denote stdin by convention
         help="toml of machines and jobs specifying their characteristics. If all start times and machines are specified, then the start times and machines are checked for.",
     )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="only verify the input schedule without solving, every job must have its start time or completion time and its machine specified.",
+    )
+    parser.add_argument(
+        "--hint",
+        type=str,
+        help="csv of a previous schedule output whose start times and machines are used as solution hints.",
+    )
+    parser.add_argument(
+        "--fix-unchanged",
+        action="store_true",
+        help="specify the start times and machines of jobs that are unchanged from the previous schedule given by --hint instead of hinting them.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="do not read or write cached results.",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="solve even if a cached result exists and cache the new result.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=default_cache_dir(),
+        help="directory of cached results.",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=100,
+        help="max size of the cache in MB, least recently used results are evicted first.",
+    )
+    parser.add_argument(
+        "--cache-nondeterministic",
+        action="store_true",
+        help="also cache results of solves that are not deterministic, i.e. with more than one worker or stopped by a time limit.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="output the wall time and model size of each phase as well as solver statistics as json via stderr.",
+    )
+    parser.add_argument(
+        "--profile-output",
+        type=str,
+        help="json file to write the profile to instead of stderr.",
+    )
+    parser.add_argument(
+        "--decompose",
+        action="store_true",
+        help="schedule independent clusters of jobs as separate models in parallel.",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=os.cpu_count(),
+        help="number of clusters scheduled in parallel with --decompose.",
+    )
+    parser.add_argument(
+        "--diagnose",
+        action="store_true",
+        help="if the input is not feasible, report a set of conflicting constraints by their toml keys.",
+    )
+    parser.add_argument(
+        "--minimize-diagnosis",
+        action="store_true",
+        help="minimize the set of conflicting constraints reported with --diagnose by re-solving without each of them, implies --diagnose.",
+    )
+    parser.add_argument(
+        "--objective-mode",
+        choices=["weighted", "lexicographic", "pareto"],
+        help="how the objectives are minimized, overrides objective_mode of the input.",
+    )
+    parser.add_argument(
+        "--objectives",
+        nargs="+",
+        choices=[
+            "completion_time",
+            "flow_time",
+            "earliness",
+            "completion_time_wrt",
+            "num_machines",
+            "machine_weight",
+        ],
+        help="objectives in order of priority for the lexicographic and pareto objective modes, overrides objectives of the input.",
+    )
+    parser.add_argument(
+        "--max-pareto-points",
+        type=int,
+        help="max number of points of the Pareto front, overrides max_pareto_points of the input.",
+    )
+    parser.add_argument(
+        "--pareto-dir",
+        type=str,
+        help="directory to write the schedule of each point of the Pareto front to as pareto_<point>.csv, along with pareto.csv of the objectives of each point.",
+    )
+    parser.add_argument(
+        "--stream-dir",
+        type=str,
+        help="directory to write the schedule of every solution found to as solution_<solution>.csv as soon as it is found.",
+    )
+    parser.add_argument(
+        "--stream-json",
+        action="store_true",
+        help="output every solution found as a line of json via stdout as soon as it is found, with its objective, bound, and wall time, instead of the csv of the last solution.",
+    )
+    parser.add_argument(
+        "--stop-gap",
+        type=float,
+        help="stop solving once the gap between the objective and its bound is below this percentage, overrides stop_gap of the input.",
+    )
+    parser.add_argument(
+        "--stop-stall-time",
+        type=float,
+        help="stop solving once no better solution has been found for this many seconds, overrides stop_stall_time of the input.",
+    )
+    parser.add_argument(
+        "--no-domain-tightening",
+        action="store_true",
+        help="do not tighten the domains of start times and completion times by propagating bounds, overrides domain_tightening of the input.",
+    )
+    parser.add_argument(
+        "--no-screening",
+        action="store_true",
+        help="do not check necessary conditions for feasibility before building the model, overrides screening of the input.",
+    )
+    parser.add_argument(
+        "--no-symmetry-breaking",
+        action="store_true",
+        help="do not break symmetries between identical machines and identical jobs, overrides symmetry_breaking of the input.",
+    )
+    parser.add_argument(
+        "--no-overlap-encoding",
+        choices=["intervals", "gcd"],
+        help="encoding of the no overlap of jobs on a machine, overrides no_overlap_encoding of the input.",
+    )
+    parser.add_argument(
+        "--precedence-encoding",
+        choices=["pairs", "index"],
+        help="encoding of the precedence relations, overrides precedence_encoding of the input.",
+    )
+    parser.add_argument(
+        "--period-harmonization",
+        choices=["none", "lcm", "harmonic"],
+        help="choose the periods of jobs with a min period to minimize the hyper-period, overrides period_harmonization of the input.",
+    )
+    parser.add_argument(
+        "--greedy-schedule",
+        choices=["none", "hint", "only"],
+        help="construct a schedule greedily to hint the solver with or to output without solving, overrides greedy_schedule of the input.",
+    )
+    parser.add_argument(
+        "--lns",
+        action="store_true",
+        help="schedule with a large neighborhood search, which improves a first feasible schedule by solving neighborhoods of jobs with every other job fixed.",
+    )
+    parser.add_argument(
+        "--lns-neighborhoods",
+        type=int,
+        default=os.cpu_count(),
+        help="number of disjoint neighborhoods solved in parallel with --lns.",
+    )
+    parser.add_argument(
+        "--lns-neighborhood-size",
+        type=int,
+        default=100,
+        help="number of jobs of each neighborhood to start from with --lns, which adapts to how well neighborhoods are solved.",
+    )
+    parser.add_argument(
+        "--lns-neighborhood-time-limit",
+        type=float,
+        default=2.0,
+        help="max time in seconds for solving each neighborhood with --lns.",
+    )
 
     args = parser.parse_args()
+    # A large neighborhood search solves a single model, so it cannot also schedule independent clusters as separate models
+    if args.lns and args.decompose:
+        parser.error("--lns cannot be combined with --decompose")
     schedule_input_file = (
         sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
     )
@@ -823,13 +5793,147 @@ if __name__ == "__main__":
             "To signal the end of manual input, make sure to enter `Ctrl-D` on Unix systems and `Ctrl-Z` on Windows.\nWaiting for user input...",
             file=sys.stderr,
         )
+    # Collect stats for profiling if requested, starting with parsing the input
+    stats = None
+    if args.profile or args.profile_output is not None:
+        stats = {}
+    start = phase_start()
     schedule_input = tomllib.load(schedule_input_file)
+    record_phase(stats, "parse", start)
+    if args.no_overlap_encoding is not None:
+        schedule_input["no_overlap_encoding"] = args.no_overlap_encoding
+    if args.precedence_encoding is not None:
+        schedule_input["precedence_encoding"] = args.precedence_encoding
+    if args.period_harmonization is not None:
+        schedule_input["period_harmonization"] = args.period_harmonization
+    if args.greedy_schedule is not None:
+        schedule_input["greedy_schedule"] = args.greedy_schedule
+    if args.no_symmetry_breaking:
+        schedule_input["symmetry_breaking"] = False
+    if args.no_screening:
+        schedule_input["screening"] = False
+    if args.no_domain_tightening:
+        schedule_input["domain_tightening"] = False
+    if args.objective_mode is not None:
+        schedule_input["objective_mode"] = args.objective_mode
+    if args.objectives is not None:
+        schedule_input["objectives"] = args.objectives
+    if args.max_pareto_points is not None:
+        schedule_input["max_pareto_points"] = args.max_pareto_points
+    if args.stop_gap is not None:
+        schedule_input["stop_gap"] = args.stop_gap
+    if args.stop_stall_time is not None:
+        schedule_input["stop_stall_time"] = args.stop_stall_time
+
+    previous_schedule = None
+    if args.hint is not None:
+        with open(args.hint, newline="") as previous_schedule_file:
+            previous_schedule = list(csv.DictReader(previous_schedule_file))
+
+    # Stream every solution found as a csv in a directory and/or as a line of json via stdout if requested
+    # Each csv is written to a temporary file first so that a reader never sees a partial schedule
+    streamed_solutions = []
 
-    jobs = schedule(schedule_input)
+    def stream_solution(jobs, progress):
+        streamed_solutions.append(progress)
+        if args.stream_dir is not None:
+            os.makedirs(args.stream_dir, exist_ok=True)
+            solution_path = os.path.join(
+                args.stream_dir, f"solution_{progress['solution']}.csv"
+            )
+            with open(
+                f"{solution_path}.tmp", "w", newline=""
+            ) as solution_schedule_file:
+                write_schedule(jobs, solution_schedule_file)
+            os.replace(f"{solution_path}.tmp", solution_path)
+        if args.stream_json:
+            print(
+                json.dumps(progress | {"jobs": list(jobs.values())}),
+                file=sys.stdout,
+                flush=True,
+            )
+
+    on_solution = (
+        stream_solution if args.stream_dir is not None or args.stream_json else None
+    )
+
+    # Collect the schedule of each point of the Pareto front if requested
+    pareto_front = [] if args.pareto_dir is not None else None
+
+    # Schedule with a large neighborhood search or independent clusters of jobs as separate models if requested
+    schedule_function = schedule
+    if args.lns:
+        schedule_function = functools.partial(
+            schedule_lns,
+            neighborhoods=args.lns_neighborhoods,
+            neighborhood_size=args.lns_neighborhood_size,
+            neighborhood_time_limit=args.lns_neighborhood_time_limit,
+        )
+    elif args.decompose:
+        schedule_function = functools.partial(
+            schedule_decomposed, processes=args.processes
+        )
+    # Report every error in the input before exiting
+    try:
+        jobs = schedule_function(
+            schedule_input,
+            verify_only=args.verify,
+            previous_schedule=previous_schedule,
+            fix_unchanged_jobs=args.fix_unchanged,
+            cache_dir=None if args.no_cache else args.cache_dir,
+            refresh_cache=args.refresh,
+            cache_max_size=args.cache_size * 1_000_000,
+            cache_nondeterministic=args.cache_nondeterministic,
+            diagnose=args.diagnose,
+            minimize_diagnosis=args.minimize_diagnosis,
+            pareto_front=pareto_front,
+            on_solution=on_solution,
+            stats=stats,
+        )
+    except ScheduleInputError as error:
+        for input_error in error.errors:
+            print(input_error, file=sys.stderr)
+        sys.exit()
+
+    # Write the schedule of each point of the Pareto front, ordered from the least second objective to the least first objective
+    if args.pareto_dir is not None and len(pareto_front) > 0:
+        os.makedirs(args.pareto_dir, exist_ok=True)
+        objective_names = [key for key in pareto_front[0].keys() if key != "jobs"]
+        with open(
+            os.path.join(args.pareto_dir, "pareto.csv"), "w", newline=""
+        ) as pareto_file:
+            writer = csv.writer(pareto_file)
+            writer.writerow(["point"] + objective_names)
+            for point_idx, point in enumerate(pareto_front):
+                writer.writerow(
+                    [point_idx]
+                    + [point[objective_name] for objective_name in objective_names]
+                )
+        for point_idx, point in enumerate(pareto_front):
+            with open(
+                os.path.join(args.pareto_dir, f"pareto_{point_idx}.csv"),
+                "w",
+                newline="",
+            ) as point_schedule_file:
+                write_schedule(point["jobs"], point_schedule_file)
+
+    if args.profile_output is not None:
+        with open(args.profile_output, "w") as profile_file:
+            json.dump(stats, profile_file, indent=2)
+    elif args.profile:
+        print(json.dumps(stats, indent=2), file=sys.stderr)
+
+    # A schedule that was not solved for, i.e. verified or cached, is streamed as the only solution
+    if not jobs is None and on_solution is not None and len(streamed_solutions) == 0:
+        stream_solution(
+            jobs,
+            {
+                "solution": 1,
+                "wall_time": None,
+                "objective": None,
+                "best_objective_bound": None,
+            },
+        )
 
-    if not jobs is None:
-        # Output solution formatted as csv
-        job_characteristics = list(jobs.values())[0].keys()
-        writer = csv.DictWriter(sys.stdout, fieldnames=job_characteristics)
-        writer.writeheader()
-        writer.writerows(jobs.values())
+    if not jobs is None and not args.stream_json:
+        write_schedule(jobs, sys.stdout)
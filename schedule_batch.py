@@ -0,0 +1,220 @@
+# /// script
+# dependencies = [
+#   "ortools",
+# ]
+# ///
+
+import argparse
+import concurrent.futures
+import contextlib
+import csv
+import glob
+import io
+import os
+import sys
+import time
+
+import tomllib
+
+from schedule import (
+    ScheduleInputError,
+    check_input_tables,
+    schedule,
+    write_schedule,
+)
+
+
+# Gather the scenarios to solve as (name, toml) pairs
+# An input can be a directory of toml files, a glob of toml files, or "-" for a stream of toml documents on stdin
+def read_scenarios(inputs, separator):
+    scenarios = []
+    for input in inputs:
+        if input == "-":
+            documents = [[]]
+            for line in sys.stdin:
+                if line.strip() == separator:
+                    documents.append([])
+                else:
+                    documents[-1].append(line)
+            documents = ["".join(document) for document in documents]
+            documents = [document for document in documents if document.strip()]
+            for document_idx, document in enumerate(documents):
+                scenarios.append((f"stdin_{document_idx + 1}", document))
+            continue
+
+        if os.path.isdir(input):
+            paths = sorted(glob.glob(os.path.join(input, "*.toml")))
+        else:
+            paths = sorted(glob.glob(input))
+        if len(paths) == 0:
+            print(f"Input {input} does not match any files!", file=sys.stderr)
+            sys.exit()
+        for path in paths:
+            with open(path, "rb") as scenario_file:
+                scenarios.append(
+                    (
+                        os.path.splitext(os.path.basename(path))[0],
+                        scenario_file.read().decode(),
+                    )
+                )
+
+    # Ensure scenario names are unique as they name the output files
+    scenario_names = [scenario_name for scenario_name, _ in scenarios]
+    if len(set(scenario_names)) != len(scenario_names):
+        print(f"Scenario names must be unique!", file=sys.stderr)
+        sys.exit()
+
+    return scenarios
+
+
+# Solve a single scenario in a worker process
+# The schedule is written to <output_dir>/<scenario>.csv and messages from schedule() to <output_dir>/<scenario>.log
+def solve_scenario(scenario_name, scenario, output_dir, time_limit, num_workers):
+    start_time = time.perf_counter()
+    stats = {}
+    jobs = None
+    log = io.StringIO()
+    with contextlib.redirect_stderr(log):
+        try:
+            schedule_input = tomllib.loads(scenario)
+            check_input_tables(schedule_input)
+
+            # Apply the per scenario time limit and share the cores between scenarios unless the scenario sets its own number of workers
+            schedule_input.setdefault("solver", {})
+            solver_parameters = schedule_input["solver"].setdefault("parameters", {})
+            if time_limit is not None:
+                solver_parameters["max_time_in_seconds"] = time_limit
+            if "num_workers" not in solver_parameters.keys():
+                solver_parameters["num_workers"] = num_workers
+
+            jobs = schedule(schedule_input, stats=stats)
+            status = stats.get("status", "UNKNOWN")
+        except tomllib.TOMLDecodeError as error:
+            print(error, file=sys.stderr)
+            status = "PARSE_ERROR"
+        except ScheduleInputError as error:
+            for input_error in error.errors:
+                print(input_error, file=sys.stderr)
+            status = "INPUT_ERROR"
+        except Exception as error:
+            print(repr(error), file=sys.stderr)
+            status = "ERROR"
+    wall_time = time.perf_counter() - start_time
+
+    schedule_path = None
+    if jobs is not None:
+        schedule_path = os.path.join(output_dir, f"{scenario_name}.csv")
+        with open(schedule_path, "w", newline="") as schedule_file:
+            write_schedule(jobs, schedule_file)
+    with open(os.path.join(output_dir, f"{scenario_name}.log"), "w") as log_file:
+        log_file.write(log.getvalue())
+
+    return {
+        "scenario": scenario_name,
+        "status": status,
+        "objective": stats.get("objective"),
+        "wall_time": f"{wall_time:.3f}",
+        "schedule": schedule_path,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Solve many schedule inputs in parallel. Each schedule is written as csv to the output directory and a summary csv is output."
+    )
+    parser.add_argument(
+        "inputs",
+        type=str,
+        nargs="*",
+        default=["-"],
+        help='directories of toml files, globs of toml files, or "-" for a stream of toml documents via stdin.',
+    )
+    parser.add_argument(
+        "--separator",
+        type=str,
+        default="+++",
+        help="line separating toml documents streamed via stdin.",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default="schedule_batch_output",
+        help="directory to write the schedule and log of each scenario to.",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=os.cpu_count(),
+        help="number of scenarios solved in parallel.",
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        help="max time in seconds for each scenario, overrides max_time_in_seconds of the scenario.",
+    )
+    parser.add_argument(
+        "--order",
+        choices=["input", "name", "completion"],
+        default="input",
+        help="order of the summary, completion outputs each scenario as soon as it is solved.",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="stop solving scenarios after the first scenario with an error.",
+    )
+    args = parser.parse_args()
+
+    scenarios = read_scenarios(args.inputs, args.separator)
+    if args.order == "name":
+        scenarios = sorted(scenarios)
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    # Share the cores between the scenarios solved in parallel
+    processes = max(1, min(args.processes, len(scenarios)))
+    num_workers = max(1, os.cpu_count() // processes)
+
+    writer = csv.DictWriter(
+        sys.stdout,
+        fieldnames=["scenario", "status", "objective", "wall_time", "schedule"],
+    )
+    writer.writeheader()
+
+    results = {}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = {
+            executor.submit(
+                solve_scenario,
+                scenario_name,
+                scenario,
+                args.output_dir,
+                args.time_limit,
+                num_workers,
+            ): scenario_name
+            for scenario_name, scenario in scenarios
+        }
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result()
+            results[result["scenario"]] = result
+            if args.order == "completion":
+                writer.writerow(result)
+                sys.stdout.flush()
+
+            if args.fail_fast and result["status"] in [
+                "PARSE_ERROR",
+                "INPUT_ERROR",
+                "ERROR",
+                "MODEL_INVALID",
+            ]:
+                print(
+                    f"Scenario {result['scenario']} failed with {result['status']}, stopping!",
+                    file=sys.stderr,
+                )
+                for pending_future in futures.keys():
+                    pending_future.cancel()
+                break
+
+    if args.order != "completion":
+        for scenario_name, _ in scenarios:
+            if scenario_name in results.keys():
+                writer.writerow(results[scenario_name])
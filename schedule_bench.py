@@ -0,0 +1,564 @@
+# /// script
+# dependencies = [
+#   "ortools",
+# ]
+# ///
+
+import argparse
+import concurrent.futures
+import copy
+import csv
+import datetime
+import importlib.metadata
+import itertools
+import json
+import math
+import os
+import random
+import resource
+import sys
+
+from harmonic_period_sequences import harmonic_period_supersequences
+from schedule import ScheduleInputError, schedule
+
+
+# Create a schedule input with a precedence relation across a wide period ratio
+# A job with a short period precedes a job with a long period, which in turn precedes another job with the short period
+# An unrelated job with a coprime period inflates the hyper-period and with it the number of instances of each job
+def wide_period_ratio_input(base_period, ratio, extra_period):
+    long_period = base_period * ratio
+    return {
+        "machines": {"m1": {}, "m2": {}, "m3": {}},
+        "jobs": {
+            "short": {
+                "period": base_period,
+                "processing_times": {"m1": 1},
+            },
+            "long": {
+                "period": long_period,
+                "processing_times": {"m2": 2},
+                "completion_time_weight": 1,
+                "predecessors": {
+                    "short": {"time_lag": 1, "slack_time": base_period},
+                },
+            },
+            "short_successor": {
+                "period": base_period,
+                "processing_times": {"m2": 1},
+                "predecessors": {
+                    "long": {"time_lag": 0},
+                },
+            },
+            "extra": {
+                "period": extra_period,
+                "processing_times": {"m3": 1},
+            },
+        },
+    }
+
+
+def benchmark_precedence_encodings(args):
+    writer = csv.DictWriter(
+        sys.stdout,
+        fieldnames=[
+            "ratio",
+            "hyper_period",
+            "precedence_encoding",
+            "status",
+            "objective",
+            "variables",
+            "constraints",
+            "build_time",
+            "solve_time",
+        ],
+    )
+    writer.writeheader()
+
+    for ratio in args.ratios:
+        schedule_input = wide_period_ratio_input(
+            args.base_period, ratio, args.extra_period
+        )
+        schedule_input["solver"] = {
+            "parameters": {
+                "max_time_in_seconds": args.time_limit,
+                "num_workers": 1,
+            }
+        }
+
+        for precedence_encoding in args.encodings:
+            encoding_input = copy.deepcopy(schedule_input)
+            encoding_input["precedence_encoding"] = precedence_encoding
+            stats = {}
+            schedule(encoding_input, stats=stats)
+            writer.writerow(
+                {
+                    "ratio": ratio,
+                    "hyper_period": math.lcm(
+                        args.base_period, args.base_period * ratio, args.extra_period
+                    ),
+                    "precedence_encoding": precedence_encoding,
+                    "status": stats["status"],
+                    "objective": stats["objective"],
+                    "variables": stats["variables"],
+                    "constraints": stats["constraints"],
+                    "build_time": f"{stats['build_time']:.3f}",
+                    "solve_time": f"{stats['solve_time']:.3f}",
+                }
+            )
+            sys.stdout.flush()
+
+
+# Choose the period of every job from a period set
+# Harmonic periods are the elements of a randomly chosen harmonic period supersequence of the harmonic base
+# Non-harmonic periods are chosen from the given non-harmonic periods and mixed periods are chosen from either
+def synthetic_periods(
+    rng, num_jobs, period_set, harmonic_base, non_harmonic_periods, min_period
+):
+    harmonic_periods = [
+        period
+        for period in rng.choice(list(harmonic_period_supersequences(harmonic_base)))
+        if period >= min_period
+    ]
+    periods = []
+    for _ in range(num_jobs):
+        if period_set == "harmonic" or (period_set == "mixed" and rng.random() < 0.5):
+            periods.append(rng.choice(harmonic_periods))
+        else:
+            periods.append(rng.choice(non_harmonic_periods))
+    return periods
+
+
+# Create a random schedule input
+# Processing times are chosen so that the machines are utilized at the given utilization level on average
+# Each pair of jobs is related by a predecessor with the predecessor density, where predecessors always come earlier in the job order to form a DAG,
+# and by a same machine or different machine rule with the machine constraint density
+# Each job has a release time and deadline window around its processing time with the window density
+def synthetic_input(
+    seed,
+    num_jobs,
+    num_machines,
+    period_set,
+    utilization,
+    predecessor_density,
+    machine_constraint_density,
+    window_density,
+    eligible_machines,
+    harmonic_base,
+    non_harmonic_periods,
+    min_period,
+    weights,
+):
+    rng = random.Random(seed)
+
+    machine_names = [f"m{machine_idx + 1}" for machine_idx in range(num_machines)]
+    job_names = [f"j{job_idx + 1}" for job_idx in range(num_jobs)]
+    periods = synthetic_periods(
+        rng, num_jobs, period_set, harmonic_base, non_harmonic_periods, min_period
+    )
+
+    jobs = {}
+    for job_name, period in zip(job_names, periods):
+        # Spread the total utilization of all machines over the jobs
+        # Two jobs on a machine can only be scheduled without overlap if their processing times fit in the gcd of their periods,
+        # so processing times are capped by the gcd of all periods
+        job_utilization = utilization * num_machines / num_jobs * rng.uniform(0.5, 1.5)
+        processing_time = min(
+            max(1, round(job_utilization * period)), max(1, math.gcd(*periods) // 2)
+        )
+        job_machine_names = rng.sample(
+            machine_names, rng.randint(1, min(eligible_machines, num_machines))
+        )
+        jobs[job_name] = {
+            "period": period,
+            "processing_times": {
+                machine_name: processing_time for machine_name in job_machine_names
+            },
+            "completion_time_weight": weights["completion_time_weight"],
+            "flow_time_weight": weights["flow_time_weight"],
+            "earliness_weight": weights["earliness_weight"],
+            "predecessors": {},
+            "same_machine_jobs": [],
+            "different_machine_jobs": [],
+        }
+
+    for predecessor_idx, successor_idx in itertools.combinations(range(num_jobs), 2):
+        predecessor_job_name = job_names[predecessor_idx]
+        successor_job_name = job_names[successor_idx]
+        predecessor_job = jobs[predecessor_job_name]
+        successor_job = jobs[successor_job_name]
+
+        if rng.random() < predecessor_density:
+            time_lag = rng.randint(0, predecessor_job["period"] // 2)
+            successor_job["predecessors"][predecessor_job_name] = {
+                "time_lag": time_lag,
+                "slack_time": time_lag + predecessor_job["period"],
+            }
+
+        if rng.random() < machine_constraint_density:
+            common_machine_names = set(predecessor_job["processing_times"]) & set(
+                successor_job["processing_times"]
+            )
+            all_machine_names = set(predecessor_job["processing_times"]) | set(
+                successor_job["processing_times"]
+            )
+            if len(common_machine_names) > 0 and rng.random() < 0.5:
+                successor_job["same_machine_jobs"].append(predecessor_job_name)
+            elif len(all_machine_names) > 1:
+                successor_job["different_machine_jobs"].append(predecessor_job_name)
+
+    # Windows are chosen last so that the rest of an input does not depend on the window density
+    for job in jobs.values():
+        if rng.random() < window_density:
+            processing_time = max(job["processing_times"].values())
+            job["release_time"] = rng.randint(0, job["period"] // 2)
+            job["deadline"] = min(
+                job["period"],
+                job["release_time"]
+                + processing_time
+                + rng.randint(0, job["period"] // 2),
+            )
+
+    return {
+        "periodic": True,
+        "num_machines_weight": weights["num_machines_weight"],
+        "machines": {machine_name: {} for machine_name in machine_names},
+        "jobs": jobs,
+    }
+
+
+# Solve a schedule input and record its stats along with the peak memory of the process
+# Every instance is solved in a fresh process so that the peak memory is that of the instance alone
+def solve_benchmark_instance(schedule_input):
+    stats = {}
+    try:
+        schedule(schedule_input, stats=stats)
+    except ScheduleInputError:
+        stats["status"] = "INPUT_ERROR"
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak_memory /= 1024
+    stats["peak_memory"] = peak_memory / 1024
+    return stats
+
+
+# Append benchmark results to a history file to compare results across runs
+# The history is kept as json lines if the file ends in .json or .jsonl and as csv otherwise
+def append_history(history_path, rows, fieldnames):
+    if os.path.splitext(history_path)[1] in [".json", ".jsonl"]:
+        with open(history_path, "a") as history_file:
+            for row in rows:
+                history_file.write(json.dumps(row) + "\n")
+        return
+
+    is_history_new = not os.path.exists(history_path)
+    with open(history_path, "a", newline="") as history_file:
+        writer = csv.DictWriter(history_file, fieldnames=fieldnames)
+        if is_history_new:
+            writer.writeheader()
+        writer.writerows(rows)
+
+
+def benchmark_suite(args):
+    fieldnames = [
+        "timestamp",
+        "ortools_version",
+        "jobs",
+        "machines",
+        "period_set",
+        "utilization",
+        "predecessor_density",
+        "machine_constraint_density",
+        "window_density",
+        "seed",
+        "hyper_period",
+        "precedence_encoding",
+        "no_overlap_encoding",
+        "domain_tightening",
+        "start_time_values",
+        "status",
+        "objective",
+        "variables",
+        "constraints",
+        "build_time",
+        "solve_time",
+        "peak_memory",
+    ]
+    writer = csv.DictWriter(sys.stdout, fieldnames=fieldnames)
+    writer.writeheader()
+
+    timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat(
+        timespec="seconds"
+    )
+    ortools_version = importlib.metadata.version("ortools")
+    weights = {
+        "num_machines_weight": args.num_machines_weight,
+        "completion_time_weight": args.completion_time_weight,
+        "flow_time_weight": args.flow_time_weight,
+        "earliness_weight": args.earliness_weight,
+    }
+
+    rows = []
+    for (
+        num_jobs,
+        num_machines,
+        period_set,
+        utilization,
+        seed,
+    ) in itertools.product(
+        args.jobs, args.machines, args.period_sets, args.utilizations, args.seeds
+    ):
+        schedule_input = synthetic_input(
+            seed,
+            num_jobs,
+            num_machines,
+            period_set,
+            utilization,
+            args.predecessor_density,
+            args.machine_constraint_density,
+            args.window_density,
+            args.eligible_machines,
+            args.harmonic_base,
+            args.non_harmonic_periods,
+            args.min_period,
+            weights,
+        )
+        schedule_input["solver"] = {
+            "parameters": {
+                "max_time_in_seconds": args.time_limit,
+                "num_workers": 1,
+                "random_seed": 0,
+            }
+        }
+        hyper_period = math.lcm(
+            *[job["period"] for job in schedule_input["jobs"].values()]
+        )
+
+        for (
+            precedence_encoding,
+            no_overlap_encoding,
+            domain_tightening,
+        ) in itertools.product(
+            args.precedence_encodings,
+            args.no_overlap_encodings,
+            args.domain_tightenings,
+        ):
+            encoding_input = copy.deepcopy(schedule_input)
+            encoding_input["precedence_encoding"] = precedence_encoding
+            encoding_input["no_overlap_encoding"] = no_overlap_encoding
+            encoding_input["domain_tightening"] = domain_tightening == "on"
+
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=1, max_tasks_per_child=1
+            ) as executor:
+                stats = executor.submit(
+                    solve_benchmark_instance, encoding_input
+                ).result()
+
+            row = {
+                "timestamp": timestamp,
+                "ortools_version": ortools_version,
+                "jobs": num_jobs,
+                "machines": num_machines,
+                "period_set": period_set,
+                "utilization": utilization,
+                "predecessor_density": args.predecessor_density,
+                "machine_constraint_density": args.machine_constraint_density,
+                "window_density": args.window_density,
+                "seed": seed,
+                "hyper_period": hyper_period,
+                "precedence_encoding": precedence_encoding,
+                "no_overlap_encoding": no_overlap_encoding,
+                "domain_tightening": domain_tightening,
+                "start_time_values": stats.get("domain_tightening", {}).get(
+                    "start_time_values"
+                ),
+                "status": stats["status"],
+                "objective": stats.get("objective"),
+                "variables": stats.get("variables"),
+                "constraints": stats.get("constraints"),
+                "build_time": (
+                    f"{stats['build_time']:.3f}" if "build_time" in stats else None
+                ),
+                "solve_time": (
+                    f"{stats['solve_time']:.3f}" if "solve_time" in stats else None
+                ),
+                "peak_memory": f"{stats['peak_memory']:.1f}",
+            }
+            writer.writerow(row)
+            sys.stdout.flush()
+            rows.append(row)
+
+    if args.history is not None:
+        append_history(args.history, rows, fieldnames)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark schedule.py on generated schedule inputs. Results are output as csv."
+    )
+    subparsers = parser.add_subparsers(required=True)
+
+    precedence_parser = subparsers.add_parser(
+        "precedence",
+        help="compare the model size and solve time of the precedence encodings on wide period ratios.",
+    )
+    precedence_parser.add_argument(
+        "--ratios",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000],
+        help="ratios between the long period and the short period.",
+    )
+    precedence_parser.add_argument(
+        "--base-period", type=int, default=10, help="the short period."
+    )
+    precedence_parser.add_argument(
+        "--extra-period",
+        type=int,
+        default=7,
+        help="period of an unrelated job that multiplies the hyper-period.",
+    )
+    precedence_parser.add_argument(
+        "--encodings",
+        nargs="+",
+        choices=["pairs", "index"],
+        default=["pairs", "index"],
+        help="precedence encodings to compare.",
+    )
+    precedence_parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=60,
+        help="max time in seconds for each solve.",
+    )
+    precedence_parser.set_defaults(benchmark=benchmark_precedence_encodings)
+
+    suite_parser = subparsers.add_parser(
+        "suite",
+        help="solve synthetic inputs for every combination of the given parameters and record the model size, time, and memory of each solve.",
+    )
+    suite_parser.add_argument(
+        "--jobs", type=int, nargs="+", default=[5, 10, 20], help="numbers of jobs."
+    )
+    suite_parser.add_argument(
+        "--machines", type=int, nargs="+", default=[2, 4], help="numbers of machines."
+    )
+    suite_parser.add_argument(
+        "--period-sets",
+        nargs="+",
+        choices=["harmonic", "non-harmonic", "mixed"],
+        default=["harmonic", "non-harmonic", "mixed"],
+        help="sets the periods of the jobs are chosen from.",
+    )
+    suite_parser.add_argument(
+        "--harmonic-base",
+        type=int,
+        default=240,
+        help="integer whose harmonic period supersequences harmonic periods are chosen from.",
+    )
+    suite_parser.add_argument(
+        "--non-harmonic-periods",
+        type=int,
+        nargs="+",
+        default=[20, 30, 40, 50, 60],
+        help="periods non-harmonic periods are chosen from.",
+    )
+    suite_parser.add_argument(
+        "--min-period",
+        type=int,
+        default=5,
+        help="smallest harmonic period chosen.",
+    )
+    suite_parser.add_argument(
+        "--utilizations",
+        type=float,
+        nargs="+",
+        default=[0.3, 0.6],
+        help="average utilization levels of the machines.",
+    )
+    suite_parser.add_argument(
+        "--eligible-machines",
+        type=int,
+        default=2,
+        help="max number of machines a job can be processed on.",
+    )
+    suite_parser.add_argument(
+        "--predecessor-density",
+        type=float,
+        default=0.1,
+        help="probability of a predecessor relation between each pair of jobs.",
+    )
+    suite_parser.add_argument(
+        "--machine-constraint-density",
+        type=float,
+        default=0.05,
+        help="probability of a same machine or different machine rule between each pair of jobs.",
+    )
+    suite_parser.add_argument(
+        "--window-density",
+        type=float,
+        default=0,
+        help="probability of a job having a release time and deadline window.",
+    )
+    suite_parser.add_argument(
+        "--num-machines-weight", type=int, default=1, help="weight of machine count."
+    )
+    suite_parser.add_argument(
+        "--completion-time-weight",
+        type=int,
+        default=1,
+        help="completion time weight of every job.",
+    )
+    suite_parser.add_argument(
+        "--flow-time-weight", type=int, default=0, help="flow time weight of every job."
+    )
+    suite_parser.add_argument(
+        "--earliness-weight",
+        type=int,
+        default=0,
+        help="earliness weight of every job.",
+    )
+    suite_parser.add_argument(
+        "--seeds",
+        type=int,
+        nargs="+",
+        default=[0],
+        help="seeds of the generated inputs.",
+    )
+    suite_parser.add_argument(
+        "--precedence-encodings",
+        nargs="+",
+        choices=["pairs", "index"],
+        default=["pairs"],
+        help="precedence encodings to solve each input with.",
+    )
+    suite_parser.add_argument(
+        "--no-overlap-encodings",
+        nargs="+",
+        choices=["intervals", "gcd"],
+        default=["intervals"],
+        help="no overlap encodings to solve each input with.",
+    )
+    suite_parser.add_argument(
+        "--domain-tightenings",
+        nargs="+",
+        choices=["on", "off"],
+        default=["on"],
+        help="whether to tighten the domains of start times and completion times for each input.",
+    )
+    suite_parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=10,
+        help="max time in seconds for each solve.",
+    )
+    suite_parser.add_argument(
+        "--history",
+        type=str,
+        help="csv file, or json lines file if ending in .json or .jsonl, to append the results to.",
+    )
+    suite_parser.set_defaults(benchmark=benchmark_suite)
+
+    args = parser.parse_args()
+    args.benchmark(args)
@@ -0,0 +1,535 @@
+# /// script
+# dependencies = [
+#   "ortools",
+# ]
+# ///
+
+import argparse
+import collections
+import contextlib
+import http.server
+import importlib
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import socket
+import sys
+import threading
+import time
+import urllib.parse
+
+import tomllib
+
+from schedule import (
+    ScheduleInputError,
+    check_input_tables,
+    schedule,
+    write_schedule,
+)
+
+# Statuses of requests that are done
+DONE_STATUSES = [
+    "OPTIMAL",
+    "FEASIBLE",
+    "INFEASIBLE",
+    "MODEL_INVALID",
+    "UNKNOWN",
+    "PARSE_ERROR",
+    "INPUT_ERROR",
+    "ERROR",
+    "CANCELLED",
+]
+
+
+# Solve a schedule input in a worker process, capturing the messages of schedule() to return them with the result
+def solve_request(schedule_input):
+    stats = {}
+    jobs = None
+    errors = []
+    log = io.StringIO()
+    with contextlib.redirect_stderr(log):
+        try:
+            jobs = schedule(schedule_input, stats=stats)
+            status = stats.get("status", "UNKNOWN")
+        except ScheduleInputError as error:
+            errors = error.errors
+            status = "INPUT_ERROR"
+        except Exception as error:
+            errors = [repr(error)]
+            status = "ERROR"
+    return {
+        "status": status,
+        "objective": stats.get("objective"),
+        "jobs": list(jobs.values()) if jobs is not None else None,
+        "errors": errors,
+        "log": log.getvalue(),
+    }
+
+
+# Serve schedule inputs sent over the connection until None is sent
+# OR-Tools is imported before the first input, so that requests do not pay for it
+def serve_worker(connection):
+    # Only imported to warm up the worker, schedule imports it again when it solves
+    importlib.import_module("ortools.sat.python.cp_model")
+
+    while True:
+        schedule_input = connection.recv()
+        if schedule_input is None:
+            break
+        connection.send(solve_request(schedule_input))
+
+
+# Keep a warm worker process for a dispatcher thread, replacing it when a request running on it is cancelled
+class Worker:
+    def __init__(self, context):
+        self.context = context
+        self.start()
+
+    def start(self):
+        self.connection, worker_connection = self.context.Pipe()
+        self.process = self.context.Process(
+            target=serve_worker, args=(worker_connection,), daemon=True
+        )
+        self.process.start()
+        worker_connection.close()
+
+    def restart(self):
+        # A running solve cannot be interrupted from outside its process, so the process is killed and replaced instead
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+        self.start()
+
+    def stop(self):
+        with contextlib.suppress(OSError):
+            self.connection.send(None)
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+
+
+class ScheduleServer:
+    # Solve schedule requests from a bounded queue on warm worker processes
+    # Each worker is driven by a dispatcher thread, which waits for the result of its worker and watches for cancellation
+    # Results of done requests are kept until max_results newer requests are done
+
+    def __init__(
+        self,
+        workers,
+        queue_size,
+        time_limit,
+        max_time_limit,
+        num_workers,
+        max_results,
+    ):
+        self.time_limit = time_limit
+        self.max_time_limit = max_time_limit
+        self.num_workers = num_workers
+        self.max_results = max_results
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.requests = {}
+        self.done_request_ids = collections.deque()
+        self.lock = threading.RLock()
+        self.request_ids = itertools.count(1)
+        self.is_stopping = False
+
+        # Spawn workers instead of forking the threads of the server
+        context = multiprocessing.get_context("spawn")
+        self.workers = [Worker(context) for _ in range(workers)]
+        self.dispatchers = [
+            threading.Thread(target=self.dispatch, args=(worker,), daemon=True)
+            for worker in self.workers
+        ]
+        for dispatcher in self.dispatchers:
+            dispatcher.start()
+
+    def request_time_limit(self, schedule_input, time_limit):
+        # The time limit of a request is the one requested, the one of its input, or the default of the server, in that order
+        # and is capped by the max time limit of the server
+        solver_parameters = schedule_input.get("solver", {}).get("parameters", {})
+        if time_limit is None:
+            time_limit = solver_parameters.get("max_time_in_seconds", self.time_limit)
+        if self.max_time_limit is not None:
+            time_limit = (
+                self.max_time_limit
+                if time_limit is None
+                else min(time_limit, self.max_time_limit)
+            )
+        return time_limit
+
+    def submit(self, schedule_input, time_limit=None):
+        # Queue a schedule input, returning its request or None if the queue is full
+        time_limit = self.request_time_limit(schedule_input, time_limit)
+        solver_parameters = schedule_input.setdefault("solver", {}).setdefault(
+            "parameters", {}
+        )
+        if time_limit is not None:
+            solver_parameters["max_time_in_seconds"] = time_limit
+        if "num_workers" not in solver_parameters.keys():
+            solver_parameters["num_workers"] = self.num_workers
+
+        request = {
+            "id": str(next(self.request_ids)),
+            "status": "QUEUED",
+            "time_limit": time_limit,
+            "submit_time": time.time(),
+            "start_time": None,
+            "wall_time": None,
+            "result": None,
+            "input": schedule_input,
+            "cancelled": threading.Event(),
+            "done": threading.Event(),
+        }
+        with self.lock:
+            try:
+                self.queue.put_nowait(request)
+            except queue.Full:
+                return None
+            self.requests[request["id"]] = request
+        return request
+
+    def finish(self, request, result):
+        with self.lock:
+            request["result"] = result
+            request["status"] = result["status"]
+            request["input"] = None
+            if request["start_time"] is not None:
+                request["wall_time"] = time.time() - request["start_time"]
+            request["done"].set()
+
+            # Forget the oldest done requests beyond the max number of results kept
+            self.done_request_ids.append(request["id"])
+            while len(self.done_request_ids) > self.max_results:
+                self.requests.pop(self.done_request_ids.popleft(), None)
+
+    def cancel(self, request_id):
+        # Cancel a queued or running request, returning the request or None if it does not exist
+        with self.lock:
+            request = self.requests.get(request_id)
+            if request is not None and not request["done"].is_set():
+                request["cancelled"].set()
+                # A queued request is done right away, a running one once its dispatcher kills its worker
+                if request["status"] == "QUEUED":
+                    self.finish(request, cancelled_result())
+        return request
+
+    def dispatch(self, worker):
+        while not self.is_stopping:
+            request = self.queue.get()
+            if request is None or self.is_stopping:
+                break
+
+            with self.lock:
+                if request["cancelled"].is_set():
+                    continue
+                request["status"] = "RUNNING"
+                request["start_time"] = time.time()
+            worker.connection.send(request["input"])
+
+            # Wait for the result, killing the worker once the request is cancelled
+            result = None
+            while result is None:
+                if self.is_stopping:
+                    return
+                if request["cancelled"].is_set():
+                    worker.restart()
+                    result = cancelled_result()
+                elif worker.connection.poll(0.1):
+                    try:
+                        result = worker.connection.recv()
+                    except EOFError:
+                        worker.restart()
+                        result = {
+                            "status": "ERROR",
+                            "objective": None,
+                            "jobs": None,
+                            "errors": ["Worker process exited while solving!"],
+                            "log": "",
+                        }
+            self.finish(request, result)
+
+    def summary(self):
+        with self.lock:
+            statuses = collections.Counter(
+                request["status"] for request in self.requests.values()
+            )
+        return {
+            "workers": len(self.workers),
+            "queued": statuses["QUEUED"],
+            "running": statuses["RUNNING"],
+            "done": sum(statuses[status] for status in DONE_STATUSES),
+        }
+
+    def stop(self):
+        # Wake up idle dispatchers, busy dispatchers stop once they see the server stopping
+        self.is_stopping = True
+        for _ in self.dispatchers:
+            with contextlib.suppress(queue.Full):
+                self.queue.put_nowait(None)
+        for dispatcher in self.dispatchers:
+            dispatcher.join()
+        for worker in self.workers:
+            worker.stop()
+
+
+def cancelled_result():
+    return {
+        "status": "CANCELLED",
+        "objective": None,
+        "jobs": None,
+        "errors": [],
+        "log": "",
+    }
+
+
+# Describe a request as json, along with its result once it is done
+def request_json(request):
+    description = {
+        "id": request["id"],
+        "status": request["status"],
+        "time_limit": request["time_limit"],
+        "wall_time": request["wall_time"],
+    }
+    if request["result"] is not None:
+        description |= {
+            key: request["result"][key] for key in ["objective", "errors", "log"]
+        }
+        description["jobs"] = request["result"]["jobs"]
+    return description
+
+
+class ScheduleRequestHandler(http.server.BaseHTTPRequestHandler):
+    # POST /schedules queues a toml or json schedule input, and waits for its result unless wait=false
+    # GET /schedules/<id> describes a request, and waits for its result if wait=true
+    # DELETE /schedules/<id> cancels a request
+    # GET / describes the workers and the number of queued, running, and done requests
+    # Results are json unless format=csv, which outputs the schedule as by schedule.py
+
+    def send_body(self, code, body, content_type):
+        body = body.encode()
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, code, value):
+        self.send_body(code, json.dumps(value) + "\n", "application/json")
+
+    def send_request(self, request, query):
+        if not request["done"].is_set():
+            self.send_json(202, request_json(request))
+        elif request["status"] in ["PARSE_ERROR", "INPUT_ERROR"]:
+            self.send_json(400, request_json(request))
+        # The solve itself failed, which is not a fault of the request
+        elif request["status"] == "ERROR":
+            self.send_json(500, request_json(request))
+        elif query.get("format") == "csv":
+            if request["result"]["jobs"] is None:
+                self.send_json(422, request_json(request))
+                return
+            schedule_csv = io.StringIO()
+            write_schedule(
+                {job["job"]: job for job in request["result"]["jobs"]}, schedule_csv
+            )
+            self.send_body(200, schedule_csv.getvalue(), "text/csv")
+        else:
+            self.send_json(200, request_json(request))
+
+    def parse_path(self):
+        url = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        return [part for part in url.path.split("/") if part != ""], query
+
+    def find_request(self, path_parts):
+        if len(path_parts) != 2 or path_parts[0] != "schedules":
+            self.send_json(404, {"errors": [f"Path {self.path} does not exist!"]})
+            return None
+        with self.server.schedule_server.lock:
+            request = self.server.schedule_server.requests.get(path_parts[1])
+        if request is None:
+            self.send_json(
+                404, {"errors": [f"Request {path_parts[1]} does not exist!"]}
+            )
+        return request
+
+    def do_GET(self):
+        path_parts, query = self.parse_path()
+        if len(path_parts) == 0:
+            self.send_json(200, self.server.schedule_server.summary())
+            return
+        request = self.find_request(path_parts)
+        if request is None:
+            return
+        if query.get("wait") == "true":
+            request["done"].wait()
+        self.send_request(request, query)
+
+    def do_DELETE(self):
+        path_parts, query = self.parse_path()
+        request = self.find_request(path_parts)
+        if request is None:
+            return
+        self.server.schedule_server.cancel(request["id"])
+        request["done"].wait()
+        self.send_request(request, query)
+
+    def do_POST(self):
+        path_parts, query = self.parse_path()
+        if path_parts != ["schedules"]:
+            self.send_json(404, {"errors": [f"Path {self.path} does not exist!"]})
+            return
+
+        # Parse the input as json if sent as json and as toml otherwise
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+        try:
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                schedule_input = json.loads(body)
+            else:
+                schedule_input = tomllib.loads(body)
+            time_limit = (
+                float(query["time_limit"]) if "time_limit" in query.keys() else None
+            )
+        except (ValueError, tomllib.TOMLDecodeError) as error:
+            self.send_json(400, {"status": "PARSE_ERROR", "errors": [str(error)]})
+            return
+        # A json body may parse to any value, but only a table is a schedule input
+        if not isinstance(schedule_input, dict):
+            self.send_json(
+                400,
+                {"status": "PARSE_ERROR", "errors": ["Schedule input is not a table!"]},
+            )
+            return
+        # The solver parameters are read before the input reaches a worker, so its tables are checked here
+        try:
+            check_input_tables(schedule_input)
+        except ScheduleInputError as error:
+            self.send_json(400, {"status": "INPUT_ERROR", "errors": error.errors})
+            return
+
+        request = self.server.schedule_server.submit(schedule_input, time_limit)
+        if request is None:
+            self.send_json(503, {"errors": ["The queue of requests is full!"]})
+            return
+        if query.get("wait") != "false":
+            request["done"].wait()
+        self.send_request(request, query)
+
+    def log_message(self, format, *args):
+        print(f"{self.address_string()} {format % args}", file=sys.stderr)
+
+
+class UnixHTTPServer(http.server.ThreadingHTTPServer):
+    # Serve http over a unix socket, which is only reachable by local users with access to the socket file
+    address_family = socket.AF_UNIX
+
+    def server_bind(self):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.server_address)
+        self.socket.bind(self.server_address)
+        self.server_name = "localhost"
+        self.server_port = 0
+
+    def server_close(self):
+        super().server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.server_address)
+
+
+class UnixScheduleRequestHandler(ScheduleRequestHandler):
+    def address_string(self):
+        return "unix"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Serve schedule requests over http from warm worker processes, so that each request does not pay for starting python and importing OR-Tools."
+    )
+    parser.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help="host to listen on.",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8642,
+        help="port to listen on.",
+    )
+    parser.add_argument(
+        "--socket",
+        type=str,
+        help="unix socket to listen on instead of a host and port.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes solving requests in parallel.",
+    )
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        help="number of solver workers for each request that does not specify its own num_workers, shares the cores between the worker processes by default.",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=100,
+        help="max number of queued requests, further requests are rejected until the queue has room.",
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=60,
+        help="max time in seconds for each request that does not specify its own time limit.",
+    )
+    parser.add_argument(
+        "--max-time-limit",
+        type=float,
+        help="max time in seconds for any request, caps the time limits of requests.",
+    )
+    parser.add_argument(
+        "--max-results",
+        type=int,
+        default=1000,
+        help="number of results of done requests to keep.",
+    )
+    args = parser.parse_args()
+
+    workers = max(1, args.workers)
+    schedule_server = ScheduleServer(
+        workers,
+        args.queue_size,
+        args.time_limit,
+        args.max_time_limit,
+        (
+            args.num_workers
+            if args.num_workers is not None
+            else max(1, os.cpu_count() // workers)
+        ),
+        args.max_results,
+    )
+    if args.socket is not None:
+        server = UnixHTTPServer(args.socket, UnixScheduleRequestHandler)
+        print(f"Serving on {args.socket}.", file=sys.stderr)
+    else:
+        server = http.server.ThreadingHTTPServer(
+            (args.host, args.port), ScheduleRequestHandler
+        )
+        print(f"Serving on http://{args.host}:{args.port}.", file=sys.stderr)
+    server.schedule_server = schedule_server
+    # Stop the workers on termination as on an interrupt
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        schedule_server.stop()
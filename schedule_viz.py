@@ -1,5 +1,6 @@
 # /// script
 # dependencies = [
+#   "numpy",
 #   "pandas",
 #   "plotly[express]",
 # ]
@@ -7,25 +8,20 @@
 
 import argparse
 import sys
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
-parser = argparse.ArgumentParser()
-parser.add_argument(
-    "schedule",
-    type=str,
-    nargs="?",
-    default="-",  # use "-" to denote stdin by convention
-    help="csv of jobs specifying their characteristics via stdin or specified as a file.",
-)
-args = parser.parse_args()
 
-schedule_file = sys.stdin if args.schedule == "-" else args.schedule
-jobs = pd.read_csv(schedule_file)
+# Read a schedule csv of jobs
+def read_schedule(schedule_file):
+    jobs = pd.read_csv(schedule_file)
 
-# Ensure the job value is a string
-jobs["job"] = jobs["job"].apply(lambda value: str(value))
+    # Ensure the job value is a string
+    jobs["job"] = jobs["job"].apply(lambda value: str(value))
+
+    return jobs
 
 
 # Populate a schedule with periodic job instances
@@ -57,207 +53,402 @@ def create_job_instances(record):
     return job_instances
 
 
-schedule_series = jobs.apply((create_job_instances), axis="columns")
-schedule_list = schedule_series.tolist()
-schedule = pd.concat(schedule_list, ignore_index=True)
+# Populate a schedule with periodic job instances record by record
+# Kept as a reference for expand_job_instances(), as it is quadratic in the number of instances of a job
+def expand_job_instances_by_record(jobs):
+    schedule_series = jobs.apply((create_job_instances), axis="columns")
+    schedule_list = schedule_series.tolist()
+    return pd.concat(schedule_list, ignore_index=True)
 
-# Manually set colors
-colors = px.colors.qualitative.Plotly
-color_idx = 0
 
-# Create traces for each job
-traces = []
-for job in schedule["job"].unique():
-    job_schedule = schedule[schedule["job"] == job]
+# Populate a schedule with periodic job instances
+# Every job is repeated by its number of instances and the times of each instance are offset by its instance index at once
+def expand_job_instances(jobs):
+    # If a job wraps around its period, add another job instance that captures the job instance in the previous period
+    wraps = (jobs["completion_time"] < jobs["start_time"]).to_numpy(dtype=int)
+    instance_counts = jobs["instances"].to_numpy(dtype=int) + wraps
 
-    traces.append(
-        go.Bar(
-            name=job,
-            text=job,
-            base=job_schedule["start_time"],
-            x=job_schedule["processing_time"],
-            y=job_schedule["machine"],
-            error_x=dict(
-                type="data",
-                symmetric=False,
-                array=None
-                if job_schedule["earliness"].isnull().all()
-                else job_schedule["earliness"],
-                arrayminus=None
-                if job_schedule["flow_time"].isnull().all()
-                else job_schedule["flow_time"],
-            ),
-            hovertemplate="instance=%{customdata[6]}<br>"
-            + "start_time=%{customdata[7]}<br>"
-            + "completion_time=%{customdata[8]}<br>"
-            + "release_time=%{customdata[9]}<br>"
-            + "deadline=%{customdata[10]}<br>"
-            + "<extra>"
-            + "job=%{customdata[0]}<br>"
-            + "period=%{customdata[1]}<br>"
-            + "processing_time=%{customdata[2]}<br>"
-            + "flow_time=%{customdata[3]}<br>"
-            + "earliness=%{customdata[4]}<br>"
-            + "machine=%{customdata[5]}"
-            + "</extra>",
-            customdata=job_schedule[
-                [
-                    "job",
-                    "period",
-                    "processing_time",
-                    "flow_time",
-                    "earliness",
-                    "machine",
-                    "instance",
-                    "start_time",
-                    "completion_time",
-                    "release_time",
-                    "deadline",
-                ]
-            ],
-            orientation="h",
-            opacity=0.5,  # have some opacity to show overlap
-            marker_color=colors[
-                color_idx
-            ],  # specify colors manually to match error colors
-        )
+    schedule = jobs.loc[jobs.index.repeat(instance_counts)].reset_index(drop=True)
+
+    # Count the instances of each job from -1 if the job wraps around its period and from 0 otherwise
+    first_row_idxs = np.cumsum(instance_counts) - instance_counts
+    instance_idxs = (
+        np.arange(len(schedule))
+        - np.repeat(first_row_idxs, instance_counts)
+        - np.repeat(wraps, instance_counts)
     )
-    color_idx = (color_idx + 1) % len(colors)
-
-# Create button for showing/hiding time constraints
-time_constraint_button = dict(
-    label="Toggle Time Constraints",
-    method="restyle",
-    args=[{"error_x.visible": True}],
-    args2=[{"error_x.visible": False}],
-)
-time_constraint_menu = dict(type="buttons", buttons=[time_constraint_button])
-
-# Create a dropdown for showing jobs grouped by machine
+    instance_offsets = instance_idxs * schedule["period"]
+
+    schedule["instance"] = instance_idxs + 1
+    schedule["start_time"] = instance_offsets + schedule["start_time"]
+    schedule["completion_time"] = schedule["start_time"] + schedule["processing_time"]
+    schedule["release_time"] = instance_offsets + schedule["release_time"]
+    schedule["deadline"] = instance_offsets + schedule["deadline"]
+    return schedule
+
+
+# Create a dropdown for showing traces grouped by machine or period
+# Each group maps to the indices of its traces among the given trace indices
 # For reference: https://stackoverflow.com/questions/65941253/plotly-how-to-toggle-traces-with-a-button-similar-to-clicking-them-in-legend
-machine_buttons = []
-for machine in schedule["machine"].unique():
-    machine_schedule = schedule[schedule["machine"] == machine]
-
-    # Create a button for showing jobs only with a particular machine/showing all jobs
-    machine_buttons.append(
-        dict(
-            label="Toggle All/Machine: " + machine,
-            method="restyle",
-            args=[
-                {
-                    "visible": [
-                        True
-                        if (trace.customdata[:, 5] == machine).all()
-                        else "legendonly"
-                        for trace in traces
-                    ]
-                }
-            ],
-            args2=[
-                {"visible": True},
-                [trace_idx for trace_idx, trace in enumerate(traces)],
-            ],
-        )
-    )
+def create_group_menu(group_name, group_trace_idxs, trace_idxs, y):
+    buttons = []
+    for group, group_idxs in group_trace_idxs.items():
+        group_idxs_set = set(group_idxs)
 
-    # Create a button for showing/hiding jobs grouped by machine
-    machine_buttons.append(
-        dict(
-            label="Toggle Machine: " + machine,
-            method="restyle",
-            args=[
-                {"visible": True},
-                [
-                    trace_idx
-                    for trace_idx, trace in enumerate(traces)
-                    if (trace.customdata[:, 5] == machine).all()
+        # Create a button for showing traces only within a particular group/showing all traces
+        buttons.append(
+            dict(
+                label=f"Toggle All/{group_name}: {group}",
+                method="restyle",
+                args=[
+                    {
+                        "visible": [
+                            True if trace_idx in group_idxs_set else "legendonly"
+                            for trace_idx in trace_idxs
+                        ]
+                    },
+                    trace_idxs,
                 ],
-            ],
-            args2=[
-                {"visible": "legendonly"},
-                [
-                    trace_idx
-                    for trace_idx, trace in enumerate(traces)
-                    if (trace.customdata[:, 5] == machine).all()
+                args2=[{"visible": True}, trace_idxs],
+            )
+        )
+
+        # Create a button for showing/hiding traces grouped by the group
+        buttons.append(
+            dict(
+                label=f"Toggle {group_name}: {group}",
+                method="restyle",
+                args=[{"visible": True}, group_idxs],
+                args2=[{"visible": "legendonly"}, group_idxs],
+            )
+        )
+
+    return dict(type="dropdown", buttons=buttons, y=y)
+
+
+# Create a figure of the job instances of a schedule
+def create_figure(schedule):
+    # Manually set colors
+    colors = px.colors.qualitative.Plotly
+    color_idx = 0
+
+    # Create traces for each job
+    # Keep track of the traces of each machine and each period for the menus
+    traces = []
+    machine_trace_idxs = {}
+    period_trace_idxs = {}
+    for job, job_schedule in schedule.groupby("job", sort=False):
+        machine_trace_idxs.setdefault(job_schedule["machine"].iloc[0], []).append(
+            len(traces)
+        )
+        period_trace_idxs.setdefault(job_schedule["period"].iloc[0], []).append(
+            len(traces)
+        )
+
+        traces.append(
+            go.Bar(
+                name=job,
+                text=job,
+                base=job_schedule["start_time"],
+                x=job_schedule["processing_time"],
+                y=job_schedule["machine"],
+                error_x=dict(
+                    type="data",
+                    symmetric=False,
+                    array=None
+                    if job_schedule["earliness"].isnull().all()
+                    else job_schedule["earliness"],
+                    arrayminus=None
+                    if job_schedule["flow_time"].isnull().all()
+                    else job_schedule["flow_time"],
+                ),
+                hovertemplate="instance=%{customdata[6]}<br>"
+                + "start_time=%{customdata[7]}<br>"
+                + "completion_time=%{customdata[8]}<br>"
+                + "release_time=%{customdata[9]}<br>"
+                + "deadline=%{customdata[10]}<br>"
+                + "<extra>"
+                + "job=%{customdata[0]}<br>"
+                + "period=%{customdata[1]}<br>"
+                + "processing_time=%{customdata[2]}<br>"
+                + "flow_time=%{customdata[3]}<br>"
+                + "earliness=%{customdata[4]}<br>"
+                + "machine=%{customdata[5]}"
+                + "</extra>",
+                customdata=job_schedule[
+                    [
+                        "job",
+                        "period",
+                        "processing_time",
+                        "flow_time",
+                        "earliness",
+                        "machine",
+                        "instance",
+                        "start_time",
+                        "completion_time",
+                        "release_time",
+                        "deadline",
+                    ]
                 ],
-            ],
+                orientation="h",
+                opacity=0.5,  # have some opacity to show overlap
+                marker_color=colors[
+                    color_idx
+                ],  # specify colors manually to match error colors
+            )
         )
+        color_idx = (color_idx + 1) % len(colors)
+
+    # Create button for showing/hiding time constraints
+    time_constraint_button = dict(
+        label="Toggle Time Constraints",
+        method="restyle",
+        args=[{"error_x.visible": True}],
+        args2=[{"error_x.visible": False}],
     )
+    time_constraint_menu = dict(type="buttons", buttons=[time_constraint_button])
+
+    trace_idxs = list(range(len(traces)))
+    machine_menu = create_group_menu("Machine", machine_trace_idxs, trace_idxs, 0.9)
+    period_menu = create_group_menu("Period", period_trace_idxs, trace_idxs, 0.8)
+
+    layout = go.Layout(
+        title_text="Schedule",
+        legend_title_text="Job",
+        xaxis_title_text="Time",
+        yaxis_title_text="Machines",
+        barmode="overlay",  # overlay each job to visualize conflicts if any
+        xaxis=dict(rangeslider=dict(visible=True), type="linear"),  # add range slider
+        # Add menus for time constraints, jobs grouped by machine, and jobs grouped by period
+        updatemenus=[time_constraint_menu, machine_menu, period_menu],
+    )
+
+    fig = go.Figure(data=traces, layout=layout)
+
+    # Match colors of each job's time constraints with the job's color if specified
+    fig.for_each_trace(
+        lambda trace: trace.update(error_x_color=trace["marker"]["color"])
+        if trace["marker"]["color"] is not None
+        else ()
+    )
+
+    return fig
+
 
-machine_menu = dict(type="dropdown", buttons=machine_buttons, y=0.9)
-
-# Create a dropdown for showing jobs grouped by period
-period_buttons = []
-for period in schedule["period"].unique():
-    period_schedule = schedule[schedule["period"] == period]
-
-    # Create a button for showing jobs only with a particular period/showing all jobs
-    period_buttons.append(
-        dict(
-            label="Toggle All/Period: " + str(period),
-            method="restyle",
-            args=[
-                {
-                    "visible": [
-                        True
-                        if (trace.customdata[:, 1] == period).all()
-                        else "legendonly"
-                        for trace in traces
+# Compute the utilization of each machine over time bins of a schedule
+# The busy time of a machine up to time t is the sum over its job instances starting before t of t - start time,
+# minus the sum over its job instances completing before t of t - completion time
+def machine_utilization(schedule, machine_idxs, bin_edges):
+    utilization = np.zeros((len(machine_idxs), len(bin_edges) - 1))
+    for machine, machine_schedule in schedule.groupby("machine", sort=False):
+        busy_time = np.zeros(len(bin_edges))
+        for times, sign in [
+            (machine_schedule["start_time"], 1),
+            (machine_schedule["completion_time"], -1),
+        ]:
+            times = np.sort(times.to_numpy(dtype=float))
+            cumulative_times = np.concatenate([[0], np.cumsum(times)])
+            time_counts = np.searchsorted(times, bin_edges)
+            busy_time += sign * (
+                time_counts * bin_edges - cumulative_times[time_counts]
+            )
+        utilization[machine_idxs[machine]] = np.diff(busy_time) / np.diff(bin_edges)
+    return utilization
+
+
+# Create a figure of the job instances of a schedule that scales to many job instances
+# Job instances are drawn as WebGL line segments with a trace for each machine and period,
+# and a heatmap of the utilization of each machine over time is shown instead when zoomed out
+# Returns the figure and the javascript that switches between both on zoom
+def create_scalable_figure(schedule, time_bins, max_detail_instances):
+    colors = px.colors.qualitative.Plotly
+
+    # Index the machines and periods once
+    # Machines are plotted by their index as numeric arrays are much cheaper to serialize than arrays of strings
+    machines = list(schedule["machine"].unique())
+    machine_idxs = {
+        machine: machine_idx for machine_idx, machine in enumerate(machines)
+    }
+    periods = list(schedule["period"].unique())
+    period_colors = {
+        period: colors[period_idx % len(colors)]
+        for period_idx, period in enumerate(periods)
+    }
+
+    # Create a segment trace for each machine and period
+    # Segments are separated by gaps in the line
+    traces = []
+    machine_trace_idxs = {}
+    period_trace_idxs = {}
+    for (machine, period), group_schedule in schedule.groupby(
+        ["machine", "period"], sort=False
+    ):
+        machine_trace_idxs.setdefault(machine, []).append(len(traces))
+        period_trace_idxs.setdefault(period, []).append(len(traces))
+
+        # Repeat the data of each job instance for both ends of its segment and the gap after it
+        # Only the job and instance are added as the time of either end is shown already
+        instance_count = len(group_schedule)
+        traces.append(
+            go.Scattergl(
+                name=f"Period: {period}",
+                legendgroup=str(period),
+                showlegend=len(period_trace_idxs[period]) == 1,
+                x=np.column_stack(
+                    [
+                        group_schedule["start_time"].to_numpy(dtype=float),
+                        group_schedule["completion_time"].to_numpy(dtype=float),
+                        np.full(instance_count, np.nan),
                     ]
-                }
-            ],
-            args2=[
-                {"visible": True},
-                [trace_idx for trace_idx, trace in enumerate(traces)],
-            ],
+                ).ravel(),
+                y=np.full(3 * instance_count, machine_idxs[machine]),
+                mode="lines",
+                line=dict(width=10, color=period_colors[period]),
+                opacity=0.5,  # have some opacity to show overlap
+                text=np.repeat(group_schedule["job"].to_numpy(), 3),
+                customdata=np.repeat(group_schedule["instance"].to_numpy(), 3),
+                hovertemplate="job=%{text}<br>"
+                + "instance=%{customdata}<br>"
+                + "time=%{x}<br>"
+                + f"period={period}<br>"
+                + f"machine={machine}"
+                + "<extra></extra>",
+            )
         )
-    )
+    segment_trace_idxs = list(range(len(traces)))
 
-    # Create a button for showing/hiding jobs grouped by period
-    period_buttons.append(
-        dict(
-            label="Toggle Period: " + str(period),
-            method="restyle",
-            args=[
-                {"visible": True},
-                [
-                    trace_idx
-                    for trace_idx, trace in enumerate(traces)
-                    if (trace.customdata[:, 1] == period).all()
-                ],
-            ],
-            args2=[
-                {"visible": "legendonly"},
-                [
-                    trace_idx
-                    for trace_idx, trace in enumerate(traces)
-                    if (trace.customdata[:, 1] == period).all()
-                ],
-            ],
+    # Aggregate the job instances into the utilization of each machine over time bins
+    start_time = schedule["start_time"].min()
+    completion_time = schedule["completion_time"].max()
+    bin_edges = np.linspace(start_time, completion_time, time_bins + 1)
+    traces.append(
+        go.Heatmap(
+            name="Utilization",
+            x=(bin_edges[:-1] + bin_edges[1:]) / 2,
+            y=list(range(len(machines))),
+            z=machine_utilization(schedule, machine_idxs, bin_edges),
+            zmin=0,
+            zmax=1,
+            colorscale="Blues",
+            colorbar=dict(title="Utilization", x=1.1),
+            customdata=np.repeat(
+                np.array(machines, dtype=object)[:, np.newaxis], time_bins, axis=1
+            ),
+            hovertemplate="machine=%{customdata}<br>time=%{x}<br>utilization=%{z:.0%}<extra></extra>",
         )
     )
+    heatmap_trace_idx = len(traces) - 1
+
+    # Show job instances when zoomed in enough for at most the max number of detailed job instances to be visible on average
+    detail_range = (completion_time - start_time) * min(
+        1, max_detail_instances / len(schedule)
+    )
+    is_zoomed_out = len(schedule) > max_detail_instances
+    for trace_idx in segment_trace_idxs:
+        traces[trace_idx].visible = not is_zoomed_out
+    traces[heatmap_trace_idx].visible = is_zoomed_out
+
+    machine_menu = create_group_menu(
+        "Machine", machine_trace_idxs, segment_trace_idxs, 0.9
+    )
+    period_menu = create_group_menu(
+        "Period", period_trace_idxs, segment_trace_idxs, 0.8
+    )
+
+    layout = go.Layout(
+        title_text="Schedule",
+        legend_title_text="Period",
+        xaxis_title_text="Time",
+        yaxis_title_text="Machines",
+        xaxis=dict(rangeslider=dict(visible=True), type="linear"),  # add range slider
+        yaxis=dict(tickvals=list(range(len(machines))), ticktext=machines),
+        # Add menus for jobs grouped by machine, and jobs grouped by period
+        updatemenus=[machine_menu, period_menu],
+    )
+
+    fig = go.Figure(data=traces, layout=layout)
+
+    # Switch between the job instances and the utilization heatmap when zooming past the detail range
+    # Job instances hidden via the legend or menus stay hidden
+    post_script = f"""
+var gd = document.getElementById("{{plot_id}}");
+var detailRange = {detail_range};
+var segmentTraceIdxs = {segment_trace_idxs};
+var heatmapTraceIdx = {heatmap_trace_idx};
+var isZoomedOut = {str(is_zoomed_out).lower()};
+gd.on("plotly_relayout", function () {{
+    var range = gd.layout.xaxis.range;
+    var isRangeZoomedOut = range[1] - range[0] > detailRange;
+    if (isRangeZoomedOut === isZoomedOut) {{
+        return;
+    }}
+    isZoomedOut = isRangeZoomedOut;
+    var visible = segmentTraceIdxs.map(function (traceIdx) {{
+        return gd.data[traceIdx].visible === "legendonly" ? "legendonly" : !isZoomedOut;
+    }});
+    Plotly.restyle(gd, {{visible: visible}}, segmentTraceIdxs);
+    Plotly.restyle(gd, {{visible: isZoomedOut}}, [heatmapTraceIdx]);
+}});
+"""
+
+    return fig, post_script
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "schedule",
+        type=str,
+        nargs="?",
+        default="-",  # use "-" to denote stdin by convention
+        help="csv of jobs specifying their characteristics via stdin or specified as a file.",
+    )
+    parser.add_argument(
+        "--render",
+        choices=["auto", "bars", "webgl"],
+        default="auto",
+        help="render job instances as bars, or as webgl segments with a utilization heatmap when zoomed out for large schedules. auto renders bars up to --max-bar-instances job instances.",
+    )
+    parser.add_argument(
+        "--max-bar-instances",
+        type=int,
+        default=10000,
+        help="max number of job instances rendered as bars with --render auto.",
+    )
+    parser.add_argument(
+        "--max-detail-instances",
+        type=int,
+        default=10000,
+        help="number of job instances visible on average at which webgl rendering switches to the utilization heatmap.",
+    )
+    parser.add_argument(
+        "--time-bins",
+        type=int,
+        default=1000,
+        help="number of time bins of the utilization heatmap.",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="html file to write the figure to instead of showing it.",
+    )
+    args = parser.parse_args()
+
+    schedule_file = sys.stdin if args.schedule == "-" else args.schedule
+    jobs = read_schedule(schedule_file)
+    schedule = expand_job_instances(jobs)
+
+    post_script = None
+    if args.render == "bars" or (
+        args.render == "auto" and len(schedule) <= args.max_bar_instances
+    ):
+        fig = create_figure(schedule)
+    else:
+        fig, post_script = create_scalable_figure(
+            schedule, args.time_bins, args.max_detail_instances
+        )
 
-period_menu = dict(type="dropdown", buttons=period_buttons, y=0.8)
-
-layout = go.Layout(
-    title_text="Schedule",
-    legend_title_text="Job",
-    xaxis_title_text="Time",
-    yaxis_title_text="Machines",
-    barmode="overlay",  # overlay each job to visualize conflicts if any
-    xaxis=dict(rangeslider=dict(visible=True), type="linear"),  # add range slider
-    # Add menus for time constraints, jobs grouped by machine, and jobs grouped by period
-    updatemenus=[time_constraint_menu, machine_menu, period_menu],
-)
-
-fig = go.Figure(data=traces, layout=layout)
-
-# Match colors of each job's time constraints with the job's color if specified
-fig.for_each_trace(
-    lambda trace: trace.update(error_x_color=trace["marker"]["color"])
-    if trace["marker"]["color"] is not None
-    else ()
-)
-
-fig.show()
+    if args.output is not None:
+        fig.write_html(args.output, post_script=post_script)
+    else:
+        fig.show(post_script=post_script)
@@ -0,0 +1,166 @@
+# /// script
+# dependencies = [
+#   "numpy",
+#   "pandas",
+#   "plotly[express]",
+# ]
+# ///
+
+import argparse
+import csv
+import io
+import random
+import sys
+import time
+
+import pandas as pd
+
+from schedule_viz import (
+    expand_job_instances,
+    expand_job_instances_by_record,
+    read_schedule,
+)
+
+
+# Create a schedule csv in the format output by schedule.py with the given number of jobs
+# Every job runs with a period from the given periods over the hyper-period and some jobs wrap around their period
+def synthetic_schedule(seed, num_jobs, num_machines, periods, hyper_period):
+    rng = random.Random(seed)
+    jobs = []
+    for job_idx in range(num_jobs):
+        period = rng.choice(periods)
+        processing_time = rng.randint(1, max(1, period // 4))
+        start_time = rng.randrange(period)
+        release_time = rng.choice([None, max(0, start_time - processing_time)])
+        deadline = rng.choice([None, start_time + 2 * processing_time])
+        jobs.append(
+            {
+                "job": f"j{job_idx + 1}",
+                "period": period,
+                "completion_time": (start_time + processing_time) % period,
+                "processing_times": {"m1": processing_time},
+                "start_time": start_time,
+                "machine": f"m{rng.randrange(num_machines) + 1}",
+                "same_machine_jobs": [],
+                "different_machine_jobs": [],
+                "release_time": release_time,
+                "deadline": deadline,
+                "completion_time_weight": 0,
+                "flow_time_weight": 0,
+                "earliness_weight": 0,
+                "predecessors": {},
+                "instances": hyper_period // period,
+                "processing_time": processing_time,
+                "flow_time": (
+                    None if release_time is None else start_time - release_time
+                ),
+                "earliness": (
+                    None
+                    if deadline is None
+                    else deadline - start_time - processing_time
+                ),
+            }
+        )
+
+    schedule_file = io.StringIO()
+    writer = csv.DictWriter(schedule_file, fieldnames=jobs[0].keys())
+    writer.writeheader()
+    writer.writerows(jobs)
+    schedule_file.seek(0)
+    return schedule_file
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the expansion of job instances in schedule_viz.py record by record against the vectorized expansion. Results are output as csv."
+    )
+    parser.add_argument(
+        "schedules",
+        type=str,
+        nargs="*",
+        help="schedule csvs to expand, synthetic schedules are generated if none are given.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000],
+        help="numbers of jobs of the synthetic schedules.",
+    )
+    parser.add_argument(
+        "--machines",
+        type=int,
+        default=10,
+        help="number of machines of the synthetic schedules.",
+    )
+    parser.add_argument(
+        "--periods",
+        type=int,
+        nargs="+",
+        default=[10, 20, 50, 100],
+        help="periods of the jobs of the synthetic schedules.",
+    )
+    parser.add_argument(
+        "--hyper-period",
+        type=int,
+        default=1000,
+        help="hyper-period of the synthetic schedules.",
+    )
+    parser.add_argument(
+        "--max-by-record-instances",
+        type=int,
+        default=20000,
+        help="skip the record by record expansion for schedules with more job instances.",
+    )
+    args = parser.parse_args()
+
+    if len(args.schedules) > 0:
+        schedules = [
+            (schedule_path, read_schedule(schedule_path))
+            for schedule_path in args.schedules
+        ]
+    else:
+        schedules = [
+            (
+                f"synthetic_{num_jobs}",
+                read_schedule(
+                    synthetic_schedule(
+                        0, num_jobs, args.machines, args.periods, args.hyper_period
+                    )
+                ),
+            )
+            for num_jobs in args.jobs
+        ]
+
+    writer = csv.DictWriter(
+        sys.stdout,
+        fieldnames=["schedule", "jobs", "instances", "expansion", "time"],
+    )
+    writer.writeheader()
+
+    for schedule_name, jobs in schedules:
+        start_time = time.perf_counter()
+        schedule = expand_job_instances(jobs)
+        expansion_times = {"vectorized": time.perf_counter() - start_time}
+
+        if len(schedule) <= args.max_by_record_instances:
+            start_time = time.perf_counter()
+            schedule_by_record = expand_job_instances_by_record(jobs)
+            expansion_times["by_record"] = time.perf_counter() - start_time
+
+            # The record by record expansion loses the column types, so only the values are compared
+            pd.testing.assert_frame_equal(
+                schedule_by_record.infer_objects(), schedule, check_dtype=False
+            )
+
+        for expansion, expansion_time in expansion_times.items():
+            writer.writerow(
+                {
+                    "schedule": schedule_name,
+                    "jobs": len(jobs),
+                    "instances": len(schedule),
+                    "expansion": expansion,
+                    "time": f"{expansion_time:.3f}",
+                }
+            )
+            sys.stdout.flush()
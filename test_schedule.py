@@ -0,0 +1,40 @@
+import contextlib
+import io
+import os
+
+import tomllib
+
+import schedule
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def read_toml(file_name):
+    with open(os.path.join(REPO_DIR, file_name), "rb") as toml_file:
+        return tomllib.load(toml_file)
+
+
+def test_presolve_time_with_repo_solver_parameters():
+    # solver_parameters.toml sets interleave_search, with which the search is logged as a deterministic search
+    schedule_input = read_toml("schedule_input.toml")
+    schedule_input["solver"] = read_toml("solver_parameters.toml")["solver"]
+    stats = {}
+    with contextlib.redirect_stderr(io.StringIO()):
+        schedule.schedule(schedule_input, stats=stats, cache_dir=None)
+    assert stats["solver"]["presolve_time"] is not None
+
+
+def test_presolve_time_log_lines():
+    assert (
+        schedule.presolve_time(
+            ["Starting presolve at 0.25s\n", "Starting search at 1.00s\n"]
+        )
+        == 0.75
+    )
+    assert (
+        schedule.presolve_time(
+            ["Starting presolve at 0.25s\nStarting deterministic search at 0.50s\n"]
+        )
+        == 0.25
+    )
+    assert schedule.presolve_time(["Starting presolve at 0.25s\n"]) is None
@@ -0,0 +1,79 @@
+import contextlib
+import http.client
+import http.server
+import json
+import os
+import threading
+
+import pytest
+import tomllib
+
+from schedule_server import ScheduleRequestHandler, ScheduleServer
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class QuietScheduleRequestHandler(ScheduleRequestHandler):
+    # Requests are logged to stderr by the handler, which is not of interest here
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server_address():
+    schedule_server = ScheduleServer(
+        workers=1,
+        queue_size=4,
+        time_limit=10,
+        max_time_limit=None,
+        num_workers=1,
+        max_results=4,
+    )
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), QuietScheduleRequestHandler
+    )
+    server.schedule_server = schedule_server
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.server_address
+    finally:
+        server.shutdown()
+        server.server_close()
+        schedule_server.stop()
+
+
+def read_schedule_input():
+    with open(os.path.join(REPO_DIR, "schedule_input.toml"), "rb") as toml_file:
+        return tomllib.load(toml_file)
+
+
+def post_schedule(server_address, schedule_input):
+    connection = http.client.HTTPConnection(*server_address)
+    with contextlib.closing(connection):
+        connection.request(
+            "POST",
+            "/schedules",
+            json.dumps(schedule_input),
+            {"Content-Type": "application/json"},
+        )
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+
+
+def test_period_of_wrong_type_is_input_error(server_address):
+    schedule_input = read_schedule_input()
+    schedule_input["jobs"]["j1"]["period"] = "20"
+    status, response = post_schedule(server_address, schedule_input)
+    assert status == 400
+    assert response["status"] == "INPUT_ERROR"
+    assert response["errors"] == ["jobs.j1.period is not an integer!"]
+
+
+def test_failed_solve_is_server_error(server_address):
+    # same_machine_jobs is not checked before the solve, which then fails on an integer
+    schedule_input = read_schedule_input()
+    schedule_input["jobs"]["j1"]["same_machine_jobs"] = 3
+    status, response = post_schedule(server_address, schedule_input)
+    assert status == 500
+    assert response["status"] == "ERROR"